@@ -24,6 +24,7 @@ from routers import (
     analytics,
     cards,
     demo,
+    sync,
 )
 from services.scheduler import scheduler_service
 
@@ -53,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
 
@@ -92,6 +94,7 @@ app.include_router(export.router, prefix="/api")
 app.include_router(analytics.router, prefix="/api")
 app.include_router(cards.router, prefix="/api")
 app.include_router(demo.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
 
 
 @app.get("/")
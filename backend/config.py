@@ -35,6 +35,13 @@ class Config:
     BACKUP_ENABLED = os.getenv("BACKUP_ENABLED", "true").lower() == "true"
     BACKUP_RETENTION_DAYS = int(os.getenv("BACKUP_RETENTION_DAYS", 90))
 
+    # Export settings
+    EXPORT_RETENTION_DAYS = int(os.getenv("EXPORT_RETENTION_DAYS", 30))
+    EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", 2))
+
+    # Sync settings (row changes kept for delta sync)
+    CHANGE_LOG_RETENTION = int(os.getenv("CHANGE_LOG_RETENTION", 10000))
+
     @classmethod
     def get_data_path(cls, filename: str) -> Path:
         """Get full path to a data file."""
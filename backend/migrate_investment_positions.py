@@ -0,0 +1,86 @@
+"""Migration script to turn stored investment positions into opening holdings.
+
+Investment positions used to be written back to investments.csv on every
+buy/sell. They are now derived from investment_transactions.csv, with the
+quantity/average_cost in investments.csv holding only the opening position.
+This script backs the recorded trades out of the stored positions so they are
+not counted twice. Run it once, before starting the upgraded backend.
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+
+def back_out_trades(quantity: float, average_cost: float, trades: list) -> tuple:
+    """Undo trades (in recording order) applied by the old moving-average logic."""
+    for trade in reversed(trades):
+        trade_quantity = float(trade.get("quantity") or 0)
+
+        if trade.get("type") == "buy":
+            total_cost = quantity * average_cost - float(trade.get("total_amount") or 0)
+            quantity -= trade_quantity
+            average_cost = total_cost / quantity if quantity > 0 else 0.0
+        else:
+            # Sells reduced quantity and kept the average cost
+            quantity += trade_quantity
+
+    return max(0.0, quantity), max(0.0, average_cost)
+
+
+def migrate_investment_positions(force: bool = False):
+    """Rewrite investments.csv quantity/average_cost as opening holdings."""
+    data_dir = Path(__file__).parent.parent / "data"
+    investments_file = data_dir / "investments.csv"
+    transactions_file = data_dir / "investment_transactions.csv"
+    positions_file = data_dir / "investment_positions.json"
+
+    if not investments_file.exists() or not transactions_file.exists():
+        print("No investment files found. Skipping migration.")
+        return
+
+    if positions_file.exists() and not force:
+        print(
+            "investment_positions.json already exists, positions are event-sourced. "
+            "No migration needed (use --force to migrate anyway)."
+        )
+        return
+
+    with open(investments_file, "r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        investments = list(reader)
+
+    with open(transactions_file, "r", encoding="utf-8") as f:
+        transactions = list(csv.DictReader(f))
+
+    trades_by_investment = {}
+    for txn in transactions:
+        trades_by_investment.setdefault(txn.get("investment_id"), []).append(txn)
+
+    migrated = 0
+    for inv in investments:
+        trades = trades_by_investment.get(inv.get("id"))
+        if not trades:
+            continue
+
+        quantity, average_cost = back_out_trades(
+            float(inv.get("quantity") or 0), float(inv.get("average_cost") or 0), trades
+        )
+        inv["quantity"] = str(quantity)
+        inv["average_cost"] = str(average_cost)
+        migrated += 1
+
+    with open(investments_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(investments)
+
+    # Stale snapshot must not survive the new opening holdings
+    positions_file.unlink(missing_ok=True)
+
+    print(f"✓ Successfully migrated {migrated} investments to opening holdings")
+
+
+if __name__ == "__main__":
+    migrate_investment_positions(force="--force" in sys.argv)
@@ -233,6 +233,9 @@ class CustomReport(BaseModel):
     top_expenses: List[Dict[str, Any]] = Field(
         default_factory=list, description="Top expenses"
     )
+    comparison: Optional[Dict[str, Any]] = Field(
+        None, description="Comparison with the preceding period of equal length"
+    )
 
 
 # Analytics Request Models
@@ -300,3 +303,36 @@ class DrillDownResult(BaseModel):
     total_value: float = Field(..., description="Total value across all items")
     item_count: int = Field(..., description="Number of items")
     top_item: Optional[Dict[str, Any]] = Field(None, description="Top item by value")
+    unconverted_count: int = Field(
+        0,
+        description="Transactions in the date range left out for lack of an exchange rate",
+    )
+
+
+# Anomaly Models
+
+
+class Anomaly(BaseModel):
+    """Expense far above its category or merchant history."""
+
+    transaction_id: str = Field(..., description="Transaction ID")
+    date: str = Field(..., description="Transaction date")
+    description: str = Field(..., description="Transaction description")
+    category_id: str = Field(..., description="Category ID")
+    category_name: str = Field(..., description="Category name")
+    account_id: str = Field(..., description="Account ID")
+    amount: float = Field(..., description="Expense amount in the base currency")
+    currency: str = Field(..., description="Base currency of the amounts")
+    expected_amount: float = Field(
+        ..., description="Average category expense before this transaction"
+    )
+    score: float = Field(..., description="Highest z-score of the flagged histories")
+    category_z_score: Optional[float] = Field(
+        None, description="Standard deviations above the category average"
+    )
+    merchant_z_score: Optional[float] = Field(
+        None, description="Standard deviations above the merchant average"
+    )
+    reasons: List[str] = Field(
+        ..., description="Histories the expense is anomalous for (category, merchant)"
+    )
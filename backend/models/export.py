@@ -1,12 +1,13 @@
 """Export models and configurations."""
 
 from datetime import date as date_type
-from typing import Optional, Literal
+from typing import Optional, Literal, Union, Dict, Any
 from pydantic import BaseModel, Field
 
 
 # Export Types
 ExportFormat = Literal["pdf", "excel", "csv"]
+ExportJobStatus = Literal["queued", "running", "completed", "failed"]
 ExportType = Literal[
     "transactions",
     "budget_report",
@@ -125,3 +126,38 @@ class ExportConfig(BaseModel):
     orientation: Literal["portrait", "landscape"] = Field(
         default="portrait", description="PDF orientation"
     )
+
+
+# Export requests, discriminated by export_type
+ExportJobRequest = Union[
+    TransactionExportRequest,
+    BudgetReportExportRequest,
+    DebtReportExportRequest,
+    InvestmentPortfolioExportRequest,
+    FinancialSummaryExportRequest,
+    IncomeStatementExportRequest,
+    BalanceSheetExportRequest,
+]
+
+
+class ExportJob(BaseModel):
+    """Background export job."""
+
+    job_id: str = Field(..., description="Job ID")
+    export_type: str = Field(..., description="Type of export")
+    format: str = Field(..., description="Export format")
+    params: Dict[str, Any] = Field(
+        default_factory=dict, description="Exporter parameters (filters)"
+    )
+    cache_key: str = Field(..., description="Hash of export inputs and data versions")
+    status: ExportJobStatus = Field(default="queued", description="Job status")
+    progress: float = Field(
+        default=0.0, ge=0, le=1, description="Fraction of the export completed"
+    )
+    cached: bool = Field(
+        default=False, description="Result was served from the export cache"
+    )
+    result: Optional[ExportResponse] = Field(None, description="Generated export")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    created_at: str = Field(..., description="Job creation timestamp")
+    completed_at: Optional[str] = Field(None, description="Job completion timestamp")
@@ -173,6 +173,8 @@ class PortfolioSummary(BaseModel):
     by_type: dict[str, dict]  # Asset allocation by type
     top_performers: list[dict]  # Top 5 performing investments
     worst_performers: list[dict]  # Bottom 5 performing investments
+    unconverted_investments: list[str] = []  # Symbols without an exchange rate
+    unconverted_totals: dict[str, dict] = {}  # Same-currency totals of those
 
 
 class InvestmentPerformance(BaseModel):
@@ -190,6 +192,34 @@ class InvestmentPerformance(BaseModel):
     profit_loss: float
     profit_loss_percentage: float
     currency: str
+    realized_profit_loss: float = 0.0
+    unrealized_profit_loss: float = 0.0
+
+
+class PositionLot(BaseModel):
+    """Open FIFO lot in an investment position."""
+
+    quantity: float
+    unit_cost: float
+    date: str
+    transaction_id: Optional[str] = None  # None for the opening holding
+
+
+class InvestmentPosition(BaseModel):
+    """Investment position derived from its transactions."""
+
+    investment_id: str
+    symbol: str
+    quantity: float
+    average_cost: float
+    cost_basis: float
+    current_price: float
+    current_value: float
+    realized_profit_loss: float
+    unrealized_profit_loss: float
+    fees: float
+    trade_count: int
+    lots: list[PositionLot]
 
 
 class PriceUpdate(BaseModel):
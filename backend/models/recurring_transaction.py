@@ -95,3 +95,33 @@ class RecurringTransactionUpdate(BaseModel):
     is_active: Optional[bool] = None
     tags: Optional[str] = None
     notes: Optional[str] = None
+
+
+class RecurringSuggestion(BaseModel):
+    """Recurring charge detected in the transaction history."""
+
+    merchant: str = Field(..., description="Normalized merchant key")
+    description: str = Field(..., description="Description of the latest charge")
+    amount: float = Field(..., description="Amount of the latest charge")
+    currency: str = Field(..., description="Currency of the charges")
+    type: Literal["income", "expense"] = Field(..., description="Transaction type")
+    frequency: Literal[
+        "daily", "weekly", "biweekly", "monthly", "quarterly", "yearly"
+    ] = Field(..., description="Detected frequency")
+    occurrences: int = Field(..., description="Number of matching transactions")
+    first_date: str = Field(..., description="Date of the first charge")
+    last_date: str = Field(..., description="Date of the latest charge")
+    average_interval_days: float = Field(
+        ..., description="Average number of days between charges"
+    )
+    regularity: float = Field(
+        ..., description="Share of intervals matching the frequency (0-1)"
+    )
+    confidence: float = Field(..., description="Suggestion confidence (0-1)")
+    is_active: bool = Field(
+        ..., description="Whether the latest charge is within two periods of today"
+    )
+    next_due: str = Field(..., description="Next expected charge date")
+    rule: RecurringTransactionCreate = Field(
+        ..., description="Recurring transaction to create for this charge"
+    )
@@ -0,0 +1,32 @@
+"""Delta sync models."""
+
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class Change(BaseModel):
+    """Latest change to a table row."""
+
+    seq: int = Field(..., description="Change sequence number")
+    table: str = Field(..., description="Table (CSV file name without extension)")
+    op: str = Field(..., description="insert, update or delete")
+    key: str = Field(..., description="Row ID (or currency code)")
+    row: Optional[Dict[str, str]] = Field(
+        None, description="Row values after the change (None for deletes)"
+    )
+    at: str = Field(..., description="Timestamp of the change")
+
+
+class ChangeSet(BaseModel):
+    """Changes since a sequence number."""
+
+    since: int = Field(..., description="Sequence number the changes follow")
+    seq: int = Field(..., description="Sequence number to request next changes since")
+    has_more: bool = Field(..., description="More changes follow seq")
+    reset: bool = Field(
+        ...,
+        description="Changes since the requested number are unavailable; reload the tables and continue from seq",
+    )
+    changes: List[Change] = Field(
+        ..., description="Changes in sequence order, latest per row"
+    )
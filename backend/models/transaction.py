@@ -1,7 +1,7 @@
 """Transaction models."""
 
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator
 
 from utils.validation import validate_transaction_type
@@ -88,6 +88,102 @@ class Transaction(TransactionBase):
         from_attributes = True
 
 
+class TransactionFilter(BaseModel):
+    """Filter spec for querying transactions."""
+
+    start_date: Optional[date] = Field(None, description="Earliest date (inclusive)")
+    end_date: Optional[date] = Field(None, description="Latest date (inclusive)")
+    account_id: Optional[str] = Field(None, description="Filter by account ID")
+    category_id: Optional[str] = Field(None, description="Filter by category ID")
+    transaction_type: Optional[str] = Field(
+        None, description="Filter by type (income/expense)"
+    )
+    tag: Optional[str] = Field(None, description="Filter by tag")
+
+
+class TagSummary(BaseModel):
+    """Tag with the number of transactions carrying it."""
+
+    tag: str = Field(..., description="Tag")
+    count: int = Field(..., description="Number of transactions with the tag")
+
+
+class TransactionSearchHit(BaseModel):
+    """Transaction matching a search query."""
+
+    id: str = Field(..., description="Transaction ID")
+    date: str = Field(..., description="Transaction date")
+    description: str = Field(..., description="Transaction description")
+    amount: float = Field(..., description="Transaction amount")
+    currency: str = Field(..., description="Currency code")
+    type: str = Field(..., description="Transaction type")
+    category_id: str = Field(..., description="Category ID")
+    category_name: str = Field(..., description="Category name")
+    account_id: str = Field(..., description="Account ID")
+    account_name: str = Field(..., description="Account name")
+    tags: str = Field("", description="Semicolon-separated tags")
+    score: float = Field(..., description="Relevance score")
+
+
+class TransactionSearchResults(BaseModel):
+    """Page of transaction search results."""
+
+    query: str = Field(..., description="Search query")
+    total: int = Field(..., description="Number of matching transactions")
+    limit: int = Field(..., description="Maximum results per page")
+    offset: int = Field(..., description="Number of results skipped")
+    results: List[TransactionSearchHit] = Field(
+        ..., description="Matches, most relevant first, then newest first"
+    )
+
+
+class TransactionBatchUpdate(TransactionUpdate):
+    """Update of one transaction in a batch."""
+
+    id: str = Field(..., description="ID of the transaction to update")
+
+
+class TransactionBatchPatch(BaseModel):
+    """Update of every transaction matching a filter (e.g. recategorize)."""
+
+    filter: TransactionFilter = Field(..., description="Transactions to update")
+    patch: TransactionUpdate = Field(..., description="Fields to set")
+
+
+class TransactionBatch(BaseModel):
+    """Creates, updates and deletes applied to transactions in one write."""
+
+    creates: List[TransactionCreate] = Field(default_factory=list)
+    updates: List[TransactionBatchUpdate] = Field(default_factory=list)
+    patches: List[TransactionBatchPatch] = Field(default_factory=list)
+    deletes: List[str] = Field(
+        default_factory=list, description="IDs of transactions to delete"
+    )
+
+
+class TransactionBatchItemResult(BaseModel):
+    """Outcome of one item of a batch."""
+
+    operation: str = Field(..., description="create, update, patch or delete")
+    index: int = Field(..., description="Position of the item in its list")
+    status: int = Field(..., description="HTTP status of the item (200, 201, 404...)")
+    ids: List[str] = Field(
+        default_factory=list, description="IDs of the transactions affected"
+    )
+    detail: Optional[str] = Field(None, description="Error detail")
+
+
+class TransactionBatchResult(BaseModel):
+    """Outcome of a batch."""
+
+    created: int = Field(..., description="Number of transactions created")
+    updated: int = Field(..., description="Number of transactions updated")
+    deleted: int = Field(..., description="Number of transactions deleted")
+    results: List[TransactionBatchItemResult] = Field(
+        ..., description="Per-item outcomes, in the order they were applied"
+    )
+
+
 # Field names for CSV
 TRANSACTION_FIELDNAMES = [
     "id",
@@ -2,7 +2,7 @@
 
 from datetime import date as date_type
 from typing import Optional, List
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 
 from models.analytics import (
     TrendAnalysis,
@@ -13,9 +13,13 @@ from models.analytics import (
     FinancialHealthScore,
     HealthMetricBreakdown,
     CustomReport,
+    CustomReportRequest,
+    DrillDownRequest,
     DrillDownResult,
+    Anomaly,
 )
 from services.analytics_service import analytics_service
+from services.anomaly_service import anomaly_service
 from services.health_service import health_service
 from services.prediction_service import prediction_service
 from services.csv_manager import csv_manager
@@ -181,6 +185,96 @@ def get_category_insights(
     )
 
 
+# Custom Reports
+
+
+@router.post("/custom-report", response_model=CustomReport)
+def get_custom_report(request: CustomReportRequest):
+    """
+    Build a report for a custom date range.
+
+    Request Body:
+    - **start_date** / **end_date**: Report date range (inclusive)
+    - **include_income** / **include_expenses**: Income and expense sections
+    - **include_categories**: Category breakdown (with expenses)
+    - **include_trends**: Trends at the group_by granularity
+    - **include_comparisons**: Comparison with the preceding period of equal length
+    - **group_by**: Trend period (day, week, month, quarter)
+
+    Returns:
+    - Custom report with the requested sections
+    """
+    base_currency = _get_base_currency()
+
+    try:
+        return analytics_service.generate_custom_report(
+            request, base_currency=base_currency
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Drill-down
+
+
+@router.post("/drill-down", response_model=DrillDownResult)
+def get_drill_down(request: DrillDownRequest):
+    """
+    Break spending down by a dimension.
+
+    Request Body:
+    - **dimension**: group, category, merchant, account or tag
+    - **start_date**: Start date filter (optional)
+    - **end_date**: End date filter (optional)
+    - **parent_id**: Group (for categories) or category ID (for merchants) to
+      drill into (optional)
+
+    Returns:
+    - Items with spending, income, transaction count and share of the total
+    """
+    base_currency = _get_base_currency()
+
+    try:
+        return analytics_service.get_drill_down(request, base_currency=base_currency)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Anomalies
+
+
+@router.get("/anomalies", response_model=List[Anomaly])
+def get_anomalies(
+    start_date: Optional[date_type] = Query(None, description="Start date filter"),
+    end_date: Optional[date_type] = Query(None, description="End date filter"),
+    category_id: Optional[str] = Query(None, description="Category ID filter"),
+    min_score: Optional[float] = Query(None, description="Minimum anomaly score"),
+    limit: int = Query(50, ge=1, le=1000, description="Maximum results"),
+):
+    """
+    List expenses flagged as anomalous when they were written.
+
+    An expense is flagged when it is at least 3 standard deviations above the
+    average of the earlier expenses in its category or at its merchant.
+
+    Query Parameters:
+    - **start_date** / **end_date**: Transaction date range (YYYY-MM-DD, optional)
+    - **category_id**: Category filter (optional)
+    - **min_score**: Minimum z-score (optional)
+    - **limit**: Maximum number of anomalies (default 50)
+
+    Returns:
+    - Anomalies, newest first, with amounts in the base currency
+    """
+    return anomaly_service.list_anomalies(
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        min_score=min_score,
+        limit=limit,
+    )
+
+
 # Predictions
 
 
@@ -339,31 +433,10 @@ def get_income_analysis(
 
     base_currency = _get_base_currency()
 
-    # Get income trend
-    income_trend = analytics_service.get_trend_analysis(
-        metric="income",
-        period_type="monthly",
-        start_date=start_date_obj,
-        end_date=end_date_obj,
-        base_currency=base_currency,
-    )
-
-    # Get income predictions
-    income_predictions = prediction_service.predict_metric(
-        metric="income",
-        periods_ahead=3,
-        method="linear_regression",
-        base_currency=base_currency,
+    return analytics_service.get_income_analysis(
+        start_date=start_date_obj, end_date=end_date_obj, base_currency=base_currency
     )
 
-    return {
-        "trend": income_trend,
-        "predictions": income_predictions,
-        "average_monthly": income_trend.average,
-        "total": income_trend.total,
-        "growth_rate": income_trend.trend_percentage,
-    }
-
 
 # Expense Analysis
 
@@ -394,32 +467,6 @@ def get_expense_analysis(
 
     base_currency = _get_base_currency()
 
-    # Get expense trend
-    expense_trend = analytics_service.get_trend_analysis(
-        metric="expenses",
-        period_type="monthly",
-        start_date=start_date_obj,
-        end_date=end_date_obj,
-        base_currency=base_currency,
-    )
-
-    # Get expense predictions
-    expense_predictions = prediction_service.predict_metric(
-        metric="expenses",
-        periods_ahead=3,
-        method="seasonal",
-        base_currency=base_currency,
-    )
-
-    # Get spending patterns
-    patterns = analytics_service.detect_spending_patterns(
+    return analytics_service.get_expense_analysis(
         start_date=start_date_obj, end_date=end_date_obj, base_currency=base_currency
     )
-
-    return {
-        "trend": expense_trend,
-        "predictions": expense_predictions,
-        "patterns": patterns,
-        "average_monthly": expense_trend.average,
-        "total": expense_trend.total,
-    }
@@ -30,6 +30,18 @@ class PayoffPlanRequest(BaseModel):
     )
 
 
+class PayoffSweepRequest(BaseModel):
+    """Model for extra-payment sensitivity sweep request."""
+
+    min_extra: float = Field(default=0, ge=0)
+    max_extra: float = Field(..., ge=0)
+    step: float = Field(..., gt=0)
+
+
+# Maximum number of extra-payment values evaluated by one sweep
+MAX_SWEEP_POINTS = 500
+
+
 @router.get("/debts", response_model=list[Debt])
 async def get_debts():
     """
@@ -242,6 +254,41 @@ async def get_payoff_plan(request: PayoffPlanRequest):
         )
 
 
+@router.post("/debts/payoff-sweep")
+async def get_payoff_sweep(request: PayoffSweepRequest):
+    """
+    Calculate months and interest saved across a range of extra payments.
+
+    Args:
+        request: Extra payment range (min_extra to max_extra in steps)
+
+    Returns:
+        Baseline totals and a curve of savings per strategy
+    """
+    if request.max_extra < request.min_extra:
+        raise HTTPException(
+            status_code=400, detail="max_extra must be greater than min_extra"
+        )
+
+    count = int((request.max_extra - request.min_extra) / request.step + 1e-9) + 1
+    if count > MAX_SWEEP_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sweep has {count} points; at most {MAX_SWEEP_POINTS} allowed",
+        )
+
+    try:
+        extra_payments = [
+            round(request.min_extra + i * request.step, 2) for i in range(count)
+        ]
+        return debt_service.calculate_extra_payment_sweep(extra_payments)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to calculate payoff sweep: {str(e)}"
+        )
+
+
 @router.get("/debts/summary/total")
 async def get_debt_summary():
     """
@@ -2,9 +2,9 @@
 
 import os
 from datetime import datetime, date as date_type
-from typing import Optional
-from fastapi import APIRouter, Query, HTTPException, status
-from fastapi.responses import FileResponse
+from typing import List, Optional
+from fastapi import APIRouter, Body, Query, HTTPException, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 
 from models.export import (
     ExportConfig,
@@ -14,14 +14,27 @@ from models.export import (
     DebtReportExportRequest,
     InvestmentPortfolioExportRequest,
     FinancialSummaryExportRequest,
+    ExportJob,
+    ExportJobRequest,
 )
-from services.pdf_export_service import pdf_export_service
 from services.excel_export_service import excel_export_service
+from services.export_job_service import export_job_service, EXPORT_PARAMS
+from services.export_manifest import export_manifest
 from services.csv_manager import csv_manager
-from utils.dates import now_iso
 
 router = APIRouter(prefix="/export", tags=["export"])
 
+# Media types by export file extension
+MEDIA_TYPES = {
+    ".pdf": "application/pdf",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".csv": "text/csv",
+}
+
+# Default and largest page size of the export list
+EXPORT_LIST_PAGE_SIZE = 100
+EXPORT_LIST_MAX_PAGE_SIZE = 1000
+
 
 def _get_export_config() -> ExportConfig:
     """Get export configuration from settings."""
@@ -41,16 +54,19 @@ def _create_export_response(
     filepath: str, export_type: str, format: str
 ) -> ExportResponse:
     """Create export response with file metadata."""
-    file_size = os.path.getsize(filepath)
-    filename = os.path.basename(filepath)
+    return export_job_service.describe(filepath, export_type, format)
 
-    return ExportResponse(
-        filename=filename,
-        file_path=filepath,
-        file_size=file_size,
-        export_type=export_type,
-        format=format,
-        created_at=now_iso(),
+
+def _streaming_response(chunks, filename: str) -> StreamingResponse:
+    """Stream generated export chunks as a file download."""
+    media_type = MEDIA_TYPES.get(
+        os.path.splitext(filename)[1], "application/octet-stream"
+    )
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
@@ -82,13 +98,17 @@ def export_transactions_pdf(
     """
     config = _get_export_config()
 
-    filepath = pdf_export_service.export_transactions_pdf(
-        start_date=start_date,
-        end_date=end_date,
-        account_id=account_id,
-        category_id=category_id,
-        transaction_type=transaction_type,
-        config=config,
+    filepath = export_job_service.export(
+        "transactions",
+        "pdf",
+        {
+            "start_date": start_date,
+            "end_date": end_date,
+            "account_id": account_id,
+            "category_id": category_id,
+            "transaction_type": transaction_type,
+        },
+        config,
     )
 
     return _create_export_response(filepath, "transactions", "pdf")
@@ -103,6 +123,9 @@ def export_transactions_excel(
     transaction_type: Optional[str] = Query(
         None, description="Filter by type (income/expense)"
     ),
+    stream: bool = Query(
+        False, description="Stream the file in the response instead of saving it"
+    ),
 ):
     """
     Export transactions to Excel.
@@ -113,19 +136,36 @@ def export_transactions_excel(
     - **account_id**: Filter by account ID (optional)
     - **category_id**: Filter by category ID (optional)
     - **transaction_type**: Filter by transaction type (optional)
+    - **stream**: Return the file itself as a download (default: false)
 
     Returns:
-    - Export metadata with file path for download
+    - Export metadata with file path for download, or the xlsx file when streaming
     """
     config = _get_export_config()
 
-    filepath = excel_export_service.export_transactions_excel(
-        start_date=start_date,
-        end_date=end_date,
-        account_id=account_id,
-        category_id=category_id,
-        transaction_type=transaction_type,
-        config=config,
+    if stream:
+        chunks = excel_export_service.stream_transactions_excel(
+            start_date=start_date,
+            end_date=end_date,
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=transaction_type,
+            config=config,
+        )
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return _streaming_response(chunks, f"transactions_{timestamp}.xlsx")
+
+    filepath = export_job_service.export(
+        "transactions",
+        "excel",
+        {
+            "start_date": start_date,
+            "end_date": end_date,
+            "account_id": account_id,
+            "category_id": category_id,
+            "transaction_type": transaction_type,
+        },
+        config,
     )
 
     return _create_export_response(filepath, "transactions", "excel")
@@ -140,6 +180,9 @@ def export_transactions_csv(
     transaction_type: Optional[str] = Query(
         None, description="Filter by type (income/expense)"
     ),
+    stream: bool = Query(
+        False, description="Stream the file in the response instead of saving it"
+    ),
 ):
     """
     Export transactions to CSV.
@@ -150,19 +193,36 @@ def export_transactions_csv(
     - **account_id**: Filter by account ID (optional)
     - **category_id**: Filter by category ID (optional)
     - **transaction_type**: Filter by transaction type (optional)
+    - **stream**: Return the file itself as a download (default: false)
 
     Returns:
-    - Export metadata with file path for download
+    - Export metadata with file path for download, or the csv file when streaming
     """
     config = _get_export_config()
 
-    filepath = excel_export_service.export_transactions_csv(
-        start_date=start_date,
-        end_date=end_date,
-        account_id=account_id,
-        category_id=category_id,
-        transaction_type=transaction_type,
-        config=config,
+    if stream:
+        chunks = excel_export_service.stream_transactions_csv(
+            start_date=start_date,
+            end_date=end_date,
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=transaction_type,
+            config=config,
+        )
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return _streaming_response(chunks, f"transactions_{timestamp}.csv")
+
+    filepath = export_job_service.export(
+        "transactions",
+        "csv",
+        {
+            "start_date": start_date,
+            "end_date": end_date,
+            "account_id": account_id,
+            "category_id": category_id,
+            "transaction_type": transaction_type,
+        },
+        config,
     )
 
     return _create_export_response(filepath, "transactions", "csv")
@@ -181,7 +241,7 @@ def export_financial_summary_pdf():
     """
     config = _get_export_config()
 
-    filepath = pdf_export_service.export_financial_summary_pdf(config=config)
+    filepath = export_job_service.export("financial_summary", "pdf", {}, config)
 
     return _create_export_response(filepath, "financial_summary", "pdf")
 
@@ -208,10 +268,14 @@ def export_investment_portfolio_pdf(
     """
     config = _get_export_config()
 
-    filepath = pdf_export_service.export_investment_portfolio_pdf(
-        include_transactions=include_transactions,
-        investment_type=investment_type,
-        config=config,
+    filepath = export_job_service.export(
+        "investment_portfolio",
+        "pdf",
+        {
+            "include_transactions": include_transactions,
+            "investment_type": investment_type,
+        },
+        config,
     )
 
     return _create_export_response(filepath, "investment_portfolio", "pdf")
@@ -236,10 +300,14 @@ def export_investment_portfolio_excel(
     """
     config = _get_export_config()
 
-    filepath = excel_export_service.export_investment_portfolio_excel(
-        include_transactions=include_transactions,
-        investment_type=investment_type,
-        config=config,
+    filepath = export_job_service.export(
+        "investment_portfolio",
+        "excel",
+        {
+            "include_transactions": include_transactions,
+            "investment_type": investment_type,
+        },
+        config,
     )
 
     return _create_export_response(filepath, "investment_portfolio", "excel")
@@ -263,13 +331,94 @@ def export_debt_report_pdf(
     """
     config = _get_export_config()
 
-    filepath = pdf_export_service.export_debt_report_pdf(
-        include_paid_off=include_paid_off, config=config
+    filepath = export_job_service.export(
+        "debt_report",
+        "pdf",
+        {"include_paid_off": include_paid_off},
+        config,
     )
 
     return _create_export_response(filepath, "debt_report", "pdf")
 
 
+# Export Jobs
+
+
+@router.post("/jobs", response_model=ExportJob, status_code=status.HTTP_202_ACCEPTED)
+def create_export_job(
+    request: ExportJobRequest = Body(..., discriminator="export_type")
+):
+    """
+    Queue an export to run in the background.
+
+    The request body is an export request with `export_type`, `format` and the
+    filters of that export type. Identical exports over unchanged data are
+    served from the export cache and complete immediately.
+
+    Returns:
+    - Export job; poll `/export/jobs/{job_id}` until it is completed or failed
+    """
+    config = _get_export_config()
+    params = {
+        name: getattr(request, name)
+        for name in EXPORT_PARAMS.get(request.export_type, [])
+    }
+
+    try:
+        return export_job_service.submit(
+            request.export_type, request.format, params, config
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/jobs", response_model=List[ExportJob])
+def list_export_jobs():
+    """
+    List recent export jobs, newest first.
+
+    Returns:
+    - List of export jobs
+    """
+    return export_job_service.list_jobs()
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJob)
+def get_export_job(job_id: str):
+    """
+    Get the status of an export job.
+
+    Path Parameters:
+    - **job_id**: Export job ID
+
+    Returns:
+    - Export job with status, progress and the export metadata once completed
+    """
+    job = export_job_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Export job {job_id} not found")
+
+    return job
+
+
+@router.post("/cleanup")
+def cleanup_exports(
+    retention_days: Optional[int] = Query(
+        None, ge=0, description="Delete exports older than this many days"
+    )
+):
+    """
+    Delete exports older than the retention period.
+
+    Query Parameters:
+    - **retention_days**: Maximum age in days (default: EXPORT_RETENTION_DAYS)
+
+    Returns:
+    - Number of deleted files and bytes freed
+    """
+    return export_job_service.cleanup(retention_days)
+
+
 # File Download Endpoint
 
 
@@ -290,14 +439,9 @@ def download_export(filename: str):
         raise HTTPException(status_code=404, detail="File not found")
 
     # Determine media type based on extension
-    if filename.endswith(".pdf"):
-        media_type = "application/pdf"
-    elif filename.endswith(".xlsx"):
-        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    elif filename.endswith(".csv"):
-        media_type = "text/csv"
-    else:
-        media_type = "application/octet-stream"
+    media_type = MEDIA_TYPES.get(
+        os.path.splitext(filename)[1], "application/octet-stream"
+    )
 
     return FileResponse(path=filepath, media_type=media_type, filename=filename)
 
@@ -306,51 +450,50 @@ def download_export(filename: str):
 
 
 @router.get("/list")
-def list_exports():
+def list_exports(
+    response: Response,
+    export_type: Optional[str] = Query(None, description="Filter by export type"),
+    format: Optional[str] = Query(
+        None, description="Filter by format (pdf, excel, csv)"
+    ),
+    created_from: Optional[date_type] = Query(
+        None, description="Earliest creation date"
+    ),
+    created_to: Optional[date_type] = Query(None, description="Latest creation date"),
+    limit: int = Query(
+        EXPORT_LIST_PAGE_SIZE,
+        ge=1,
+        le=EXPORT_LIST_MAX_PAGE_SIZE,
+        description="Maximum number of exports",
+    ),
+    offset: int = Query(0, ge=0, description="Number of exports to skip"),
+):
     """
-    List all available export files.
+    List available export files, newest first.
+
+    Exports are read from the export manifest, so listing does not scan the
+    exports directory. The total number of matching exports is returned in
+    the `X-Total-Count` header.
+
+    Query Parameters:
+    - **export_type**: Filter by export type (optional)
+    - **format**: Filter by format (optional)
+    - **created_from**: Earliest creation date (optional)
+    - **created_to**: Latest creation date (optional)
+    - **limit**: Page size (default: 100, at most 1000)
+    - **offset**: Page offset (default: 0)
 
     Returns:
     - List of export files with metadata
     """
-    exports_dir = "exports"
-
-    if not os.path.exists(exports_dir):
-        return []
-
-    files = []
-    for filename in os.listdir(exports_dir):
-        filepath = os.path.join(exports_dir, filename)
-
-        if os.path.isfile(filepath):
-            file_size = os.path.getsize(filepath)
-            created_at = datetime.fromtimestamp(os.path.getctime(filepath)).isoformat()
-
-            # Determine export type and format from filename
-            export_type = "unknown"
-            format = filename.split(".")[-1]
-
-            if "transaction" in filename:
-                export_type = "transactions"
-            elif "financial_summary" in filename:
-                export_type = "financial_summary"
-            elif "investment" in filename:
-                export_type = "investment_portfolio"
-            elif "debt" in filename:
-                export_type = "debt_report"
-
-            files.append(
-                {
-                    "filename": filename,
-                    "file_path": filepath,
-                    "file_size": file_size,
-                    "export_type": export_type,
-                    "format": format,
-                    "created_at": created_at,
-                }
-            )
-
-    # Sort by creation date descending
-    files.sort(key=lambda x: x["created_at"], reverse=True)
+    files, total = export_manifest.list_exports(
+        export_type=export_type,
+        format=format,
+        created_from=created_from,
+        created_to=created_to,
+        limit=limit,
+        offset=offset,
+    )
+    response.headers["X-Total-Count"] = str(total)
 
     return files
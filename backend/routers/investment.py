@@ -10,6 +10,7 @@ from models.investment import (
     InvestmentTransaction,
     InvestmentTransactionCreate,
     InvestmentPerformance,
+    InvestmentPosition,
     PortfolioSummary,
     PriceUpdate,
 )
@@ -160,7 +161,7 @@ def create_transaction(transaction_data: InvestmentTransactionCreate):
 def delete_transaction(transaction_id: str):
     """
     Delete an investment transaction.
-    Note: This does NOT reverse the quantity/cost changes.
+    The investment's quantity and average cost are re-derived without it.
 
     Path Parameters:
     - **transaction_id**: Transaction ID
@@ -185,15 +186,42 @@ def get_investment_performance(investment_id: str):
     return investment_service.get_investment_performance(investment_id)
 
 
+@router.get("/{investment_id}/position", response_model=InvestmentPosition)
+def get_investment_position(investment_id: str):
+    """
+    Get the position for a specific investment with its open FIFO lots.
+
+    Path Parameters:
+    - **investment_id**: Investment ID
+
+    Returns:
+    - Quantity, cost basis, realized/unrealized profit/loss and open lots
+    """
+    return investment_service.get_position(investment_id)
+
+
+@router.post("/positions/rebuild")
+def rebuild_positions():
+    """
+    Rebuild all investment positions from the transaction log.
+
+    Returns:
+    - Number of positions and trades folded
+    """
+    return investment_service.rebuild_positions()
+
+
 @router.get("/portfolio/summary", response_model=PortfolioSummary)
 def get_portfolio_summary(
-    base_currency: str = Query("USD", description="Base currency for reporting")
+    base_currency: Optional[str] = Query(
+        None, description="Base currency for reporting (default: settings)"
+    )
 ):
     """
     Get comprehensive portfolio summary with performance metrics.
 
     Query Parameters:
-    - **base_currency**: Base currency for reporting (default: USD)
+    - **base_currency**: Base currency for reporting (default: settings base currency)
 
     Returns:
     - Total investments, value, cost, profit/loss
@@ -216,32 +244,37 @@ def get_asset_allocation():
 
 @router.get("/portfolio/value")
 def get_portfolio_value(
-    base_currency: str = Query("USD", description="Base currency for reporting")
+    base_currency: Optional[str] = Query(
+        None, description="Base currency for reporting (default: settings)"
+    )
 ):
     """
     Get total portfolio value.
 
     Query Parameters:
-    - **base_currency**: Base currency for reporting (default: USD)
+    - **base_currency**: Base currency for reporting (default: settings base currency)
 
     Returns:
     - Total portfolio value in specified currency
     """
+    summary = portfolio_service.get_portfolio_summary(base_currency)
     return {
-        "total_value": portfolio_service.get_total_portfolio_value(base_currency),
-        "currency": base_currency,
+        "total_value": summary.total_value,
+        "currency": summary.currency,
     }
 
 
 @router.get("/portfolio/profit-loss")
 def get_portfolio_profit_loss(
-    base_currency: str = Query("USD", description="Base currency for reporting")
+    base_currency: Optional[str] = Query(
+        None, description="Base currency for reporting (default: settings)"
+    )
 ):
     """
     Get portfolio profit/loss metrics.
 
     Query Parameters:
-    - **base_currency**: Base currency for reporting (default: USD)
+    - **base_currency**: Base currency for reporting (default: settings base currency)
 
     Returns:
     - Total cost, value, profit/loss amount and percentage
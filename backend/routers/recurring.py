@@ -1,14 +1,17 @@
 """Recurring transactions API router."""
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from typing import List
 
 from models.recurring_transaction import (
     RecurringTransaction,
     RecurringTransactionCreate,
     RecurringTransactionUpdate,
+    RecurringSuggestion,
 )
 from services.recurring_service import recurring_service
+from services.subscription_detector import subscription_detector
 
 router = APIRouter(tags=["recurring"])
 
@@ -25,6 +28,45 @@ def get_recurring_transactions(active_only: bool = False):
     return recurring_service.get_all()
 
 
+@router.get("/recurring/suggestions", response_model=List[RecurringSuggestion])
+def get_recurring_suggestions(
+    min_occurrences: int = Query(3, ge=2, description="Minimum number of charges"),
+    include_inactive: bool = Query(
+        False, description="Include charges that stopped more than two periods ago"
+    ),
+    stream: bool = Query(False, description="Stream suggestions as NDJSON"),
+):
+    """
+    Suggest recurring transactions detected in the transaction history.
+
+    Transactions with the same normalized description, type, currency and
+    rounded amount that repeat at a daily, weekly, biweekly, monthly,
+    quarterly or yearly interval are suggested, unless a recurring
+    transaction already covers them. Each suggestion includes a rule that
+    can be posted to /recurring as is.
+
+    - **min_occurrences**: Minimum number of charges (default 3)
+    - **include_inactive**: Include charges that have stopped
+    - **stream**: Stream suggestions as newline-delimited JSON as they are found
+      (otherwise sorted by confidence)
+    """
+    suggestions = subscription_detector.detect(
+        min_occurrences=min_occurrences, include_inactive=include_inactive
+    )
+
+    if stream:
+        return StreamingResponse(
+            (suggestion.model_dump_json() + "\n" for suggestion in suggestions),
+            media_type="application/x-ndjson",
+        )
+
+    return sorted(
+        suggestions,
+        key=lambda suggestion: (suggestion.confidence, suggestion.occurrences),
+        reverse=True,
+    )
+
+
 @router.get("/recurring/{recurring_id}", response_model=RecurringTransaction)
 def get_recurring_transaction(recurring_id: str):
     """Get a specific recurring transaction by ID."""
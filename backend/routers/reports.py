@@ -1,8 +1,13 @@
 """Monthly reports router."""
 
+import json
+from typing import Optional, Tuple
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-from services.report_service import report_service
+from services.report_service import MAX_BATCH_MONTHS, month_range, report_service
+from services.report_cube import report_cube_service
 
 
 router = APIRouter(tags=["reports"])
@@ -70,37 +75,117 @@ async def get_ytd_summary(year: int = None):
         )
 
 
-@router.get("/reports/available-months")
-async def get_available_months():
+def _parse_period(value: str, name: str) -> Tuple[int, int]:
+    """Parse a YYYY-MM query parameter into (year, month)."""
+    try:
+        period = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be in YYYY-MM format")
+    return period.year, period.month
+
+
+def _batch_range(
+    year: Optional[int], start: Optional[str], end: Optional[str]
+) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Resolve and validate the (year, month) bounds of a batch request."""
+    if year is not None:
+        if start or end:
+            raise HTTPException(
+                status_code=400, detail="Use either year or start/end, not both"
+            )
+        first, last = (year, 1), (year, 12)
+    elif start:
+        first = _parse_period(start, "start")
+        last = _parse_period(end, "end") if end else first
+    else:
+        raise HTTPException(status_code=400, detail="Either year or start is required")
+
+    # Validate range
+    current_year = datetime.now().year
+    for period_year, _ in (first, last):
+        if period_year < 2000 or period_year > current_year + 1:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Year must be between 2000 and {current_year + 1}",
+            )
+    if last < first:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if len(month_range(first, last)) > MAX_BATCH_MONTHS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can span at most {MAX_BATCH_MONTHS} months",
+        )
+
+    return first, last
+
+
+@router.get("/reports/batch")
+async def get_batch_reports(
+    year: Optional[int] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    stream: bool = False,
+):
     """
-    Get list of months with transaction data.
+    Generate monthly reports for a year or month range, plus YTD summaries.
+
+    Args:
+        year: Report year (all 12 months), instead of start/end
+        start: First month of the range (YYYY-MM)
+        end: Last month of the range (YYYY-MM, defaults to start)
+        stream: Stream one JSON object per line (monthly reports, each
+            year's YTD summary after its last month) instead of one payload
 
     Returns:
-        List of available months
+        Monthly reports and YTD summaries for the range
     """
+    first, last = _batch_range(year, start, end)
+
+    reports = report_service.generate_batch_reports(first, last)
+
+    if stream:
+        return StreamingResponse(
+            (json.dumps(report) + "\n" for report in reports),
+            media_type="application/x-ndjson",
+        )
+
     try:
-        from services.csv_manager import csv_manager
+        monthly_reports = []
+        ytd_summaries = []
+        for report in reports:
+            kind = report.pop("type")
+            (monthly_reports if kind == "monthly" else ytd_summaries).append(report)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to generate reports: {str(e)}"
+        )
+
+    return {
+        "start": f"{first[0]}-{first[1]:02d}",
+        "end": f"{last[0]}-{last[1]:02d}",
+        "monthly_reports": monthly_reports,
+        "ytd_summaries": ytd_summaries,
+    }
 
-        transactions = csv_manager.read_csv("transactions.csv")
 
-        # Extract unique year-month combinations
-        months = set()
-        for tx in transactions:
-            try:
-                date = datetime.fromisoformat(tx["date"].replace("Z", "+00:00"))
-                months.add((date.year, date.month))
-            except:
-                continue
+@router.get("/reports/available-months")
+async def get_available_months():
+    """
+    Get list of months with transaction data.
 
-        # Sort and format
+    Returns:
+        List of available months, newest first, with their transaction counts
+    """
+    try:
         available = [
             {
                 "year": year,
                 "month": month,
                 "period": f"{year}-{month:02d}",
                 "label": datetime(year, month, 1).strftime("%B %Y"),
+                "transaction_count": count,
             }
-            for year, month in sorted(months, reverse=True)
+            for year, month, count in report_cube_service.get_cube().months()
         ]
 
         return available
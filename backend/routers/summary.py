@@ -82,8 +82,8 @@ def get_summary():
 
     # Get portfolio summary
     try:
-        portfolio_value = portfolio_service.get_total_portfolio_value(base_currency)
         portfolio_pl = portfolio_service.get_portfolio_profit_loss(base_currency)
+        portfolio_value = portfolio_pl["total_value"]
     except Exception:
         # If no investments or error, set to 0
         portfolio_value = 0.0
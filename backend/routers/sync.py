@@ -0,0 +1,32 @@
+"""Delta sync API endpoints."""
+
+from typing import List, Optional
+from fastapi import APIRouter, Query
+
+from models.sync import ChangeSet
+from services.change_log import change_log
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("/changes", response_model=ChangeSet)
+def get_changes(
+    since: int = Query(0, ge=0, description="Last sequence number seen"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum changes"),
+    table: Optional[List[str]] = Query(None, description="Only these tables"),
+):
+    """
+    Get the rows inserted, updated and deleted since a sequence number.
+
+    Query Parameters:
+    - **since**: Last sequence number seen (0 for a client without data)
+    - **limit**: Maximum number of changes to return
+    - **table**: Only return changes to these tables (repeatable)
+
+    Apply inserts and updates as upserts of ``row`` by ``key``, then pass
+    ``seq`` as the next ``since``; repeat while ``has_more``. When
+    ``reset`` is set, the changes are no longer available (or the client
+    has none): reload the tables and continue from ``seq``.
+    """
+    result = change_log.changes_since(since, limit, tables=table)
+    return ChangeSet(since=since, **result)
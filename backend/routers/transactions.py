@@ -8,9 +8,19 @@ from models.transaction import (
     Transaction,
     TransactionCreate,
     TransactionUpdate,
+    TransactionFilter,
+    TransactionSearchHit,
+    TransactionSearchResults,
+    TagSummary,
+    TransactionBatch,
+    TransactionBatchResult,
     TRANSACTION_FIELDNAMES,
 )
+from services.anomaly_service import anomaly_service
 from services.csv_manager import csv_manager
+from services.search_index import search_index_service
+from services.transaction_batch_service import transaction_batch_service
+from services.transaction_query_service import transaction_query_service
 from utils.ids import generate_transaction_id
 from utils.dates import now_iso
 
@@ -23,33 +33,89 @@ def list_transactions(
     to_date: Optional[date] = Query(None, alias="to"),
     category_id: Optional[str] = None,
     account_id: Optional[str] = None,
+    tag: Optional[str] = None,
 ):
     """List transactions with optional filters."""
-    transactions = csv_manager.read_csv("transactions.csv")
+    filters = TransactionFilter(
+        start_date=from_date,
+        end_date=to_date,
+        account_id=account_id,
+        category_id=category_id,
+        tag=tag,
+    )
 
-    # Apply filters
-    filtered = []
-    for tx_data in transactions:
-        # Date filter
-        if from_date and tx_data.get("date", "") < str(from_date):
-            continue
-        if to_date and tx_data.get("date", "") > str(to_date):
-            continue
+    # Sorted by date descending
+    return [
+        Transaction.from_csv(tx_data)
+        for tx_data in transaction_query_service.query(filters, join=False)
+    ]
 
-        # Category filter
-        if category_id and tx_data.get("category_id") != category_id:
-            continue
 
-        # Account filter
-        if account_id and tx_data.get("account_id") != account_id:
-            continue
+@router.get("/search", response_model=TransactionSearchResults)
+def search_transactions(
+    q: str = Query(
+        ..., min_length=1, description="Words to find in description or tags"
+    ),
+    prefix: bool = Query(True, description="Match words by prefix"),
+    fuzzy: bool = Query(True, description="Match misspelled words"),
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    min_amount: Optional[float] = Query(None, description="Minimum absolute amount"),
+    max_amount: Optional[float] = Query(None, description="Maximum absolute amount"),
+    category_id: Optional[str] = None,
+    account_id: Optional[str] = None,
+    type: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    """Search transactions by description and tags, most relevant first."""
+    matches, total = search_index_service.search(
+        q,
+        prefix=prefix,
+        fuzzy=fuzzy,
+        filters={
+            "start_date": from_date,
+            "end_date": to_date,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+            "category_id": category_id,
+            "account_id": account_id,
+            "type": type,
+        },
+        limit=limit,
+        offset=offset,
+    )
 
-        filtered.append(Transaction.from_csv(tx_data))
+    account_names = transaction_query_service.get_names("accounts.csv")
+    category_names = transaction_query_service.get_names("categories.csv")
+
+    return TransactionSearchResults(
+        query=q,
+        total=total,
+        limit=limit,
+        offset=offset,
+        results=[
+            TransactionSearchHit(
+                **doc,
+                account_name=account_names.get(doc["account_id"], "Unknown"),
+                category_name=category_names.get(doc["category_id"], "Unknown"),
+                score=score,
+            )
+            for score, doc in matches
+        ],
+    )
 
-    # Sort by date descending
-    filtered.sort(key=lambda x: x.date, reverse=True)
 
-    return filtered
+@router.get("/tags", response_model=List[TagSummary])
+def list_tags():
+    """List tags in use, most used first."""
+    tag_counts = transaction_query_service.get_tag_counts()
+    return [
+        TagSummary(tag=tag, count=count)
+        for tag, count in sorted(
+            tag_counts.items(), key=lambda item: (-item[1], item[0])
+        )
+    ]
 
 
 @router.get("/{transaction_id}", response_model=Transaction)
@@ -82,40 +148,50 @@ def create_transaction(transaction: TransactionCreate):
 
     # Append to CSV
     csv_manager.append_csv("transactions.csv", tx_data, TRANSACTION_FIELDNAMES)
+    anomaly_service.observe()
 
     return Transaction(**tx_data)
 
 
+@router.post("/batch", response_model=TransactionBatchResult)
+def batch_transactions(batch: TransactionBatch):
+    """
+    Create, update and delete many transactions in one write.
+
+    - **creates**: New transactions
+    - **updates**: Changes to transactions by ID
+    - **patches**: Changes to every transaction matching a filter
+      (e.g. recategorize all transactions of a category and tag)
+    - **deletes**: IDs of transactions to delete
+
+    Updates are applied first, then patches, deletes and creates. Items
+    that fail (unknown IDs) are reported in the results without failing
+    the batch.
+    """
+    return transaction_batch_service.apply(batch)
+
+
 @router.put("/{transaction_id}", response_model=Transaction)
 def update_transaction(transaction_id: str, transaction: TransactionUpdate):
     """Update an existing transaction."""
-    transactions = csv_manager.read_csv("transactions.csv")
+    with csv_manager.edit_csv("transactions.csv", TRANSACTION_FIELDNAMES) as rows:
+        tx_data = next((row for row in rows if row.get("id") == transaction_id), None)
+        if tx_data is None:
+            raise HTTPException(status_code=404, detail="Transaction not found")
 
-    # Find transaction
-    found = False
-    for i, tx_data in enumerate(transactions):
-        if tx_data.get("id") == transaction_id:
-            # Update fields
-            update_data = transaction.model_dump(exclude_unset=True)
-
-            # Convert date to string if present
-            if "date" in update_data:
-                update_data["date"] = str(update_data["date"])
+        # Update fields
+        update_data = transaction.model_dump(exclude_unset=True)
 
-            tx_data.update(update_data)
-            tx_data["updated_at"] = now_iso()
+        # Convert date to string if present
+        if "date" in update_data:
+            update_data["date"] = str(update_data["date"])
 
-            transactions[i] = tx_data
-            found = True
-            break
+        tx_data.update(update_data)
+        tx_data["updated_at"] = now_iso()
 
-    if not found:
-        raise HTTPException(status_code=404, detail="Transaction not found")
+    anomaly_service.observe()
 
-    # Write back to CSV
-    csv_manager.write_csv("transactions.csv", transactions, TRANSACTION_FIELDNAMES)
-
-    return Transaction.from_csv(transactions[i])
+    return Transaction.from_csv(tx_data)
 
 
 @router.delete("/{transaction_id}", status_code=204)
@@ -128,4 +204,6 @@ def delete_transaction(transaction_id: str):
     if not success:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
+    anomaly_service.observe()
+
     return None
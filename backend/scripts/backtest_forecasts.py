@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark FIN-DASH forecast methods with rolling-origin backtesting.
+
+Every forecast method is evaluated on the income, expenses and net series and
+on every category, reporting MAPE/MAE and wall-clock per method.
+
+Usage:
+    python backend/scripts/backtest_forecasts.py [--data-dir DIR] [--methods M ...]
+                                                 [--min-train N] [--horizon N]
+                                                 [--workers N] [--json] [--verbose]
+
+Options:
+    --data-dir   Data directory to read (default: DATA_DIR from the environment)
+    --methods    Forecast methods to evaluate (default: all)
+    --min-train  Months of history before the first forecast origin (default: 6)
+    --horizon    Months forecast from each origin (default: 3)
+    --workers    Worker processes (default: CPU count)
+    --json       Print the full result as JSON
+    --verbose    Show per-series scores
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def print_table(rows, columns):
+    """Print rows as a fixed-width table."""
+    widths = {
+        col: max(len(col), *(len(str(row.get(col, ""))) for row in rows))
+        for col in columns
+    }
+    print("  ".join(col.ljust(widths[col]) for col in columns))
+    print("  ".join("-" * widths[col] for col in columns))
+    for row in rows:
+        print("  ".join(str(row.get(col, "")).ljust(widths[col]) for col in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest FIN-DASH forecast methods")
+    parser.add_argument("--data-dir", help="Data directory to read")
+    parser.add_argument("--methods", nargs="+", help="Forecast methods to evaluate")
+    parser.add_argument("--min-train", type=int, default=6)
+    parser.add_argument("--horizon", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    parser.add_argument("--verbose", action="store_true", help="Show per-series scores")
+    args = parser.parse_args()
+
+    # Config reads DATA_DIR at import time, so set it before importing services
+    if args.data_dir:
+        os.environ["DATA_DIR"] = str(Path(args.data_dir).resolve())
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from services.backtest_service import backtest_service
+    from services.csv_manager import csv_manager
+    from services.prediction_service import FORECAST_METHODS
+
+    methods = args.methods or FORECAST_METHODS
+    unknown = [m for m in methods if m not in FORECAST_METHODS]
+    if unknown:
+        parser.error(f"Unknown methods: {unknown}. Must be in {FORECAST_METHODS}")
+
+    settings = csv_manager.read_json("settings.json")
+    result = backtest_service.run(
+        methods=methods,
+        min_train=args.min_train,
+        horizon=args.horizon,
+        workers=args.workers,
+        base_currency=settings.get("base_currency", "ZAR"),
+    )
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(
+        f"Backtested {len(result['series'])} series "
+        f"({len(result['skipped_series'])} skipped, too short) "
+        f"in {result['wall_clock_seconds']}s\n"
+    )
+    print_table(
+        result["methods"],
+        ["method", "series", "folds", "mean_mape", "mean_mae", "wins", "seconds"],
+    )
+
+    if args.verbose:
+        print()
+        rows = [
+            {
+                "series": r["series"],
+                "points": r["points"],
+                "recommended": r["recommended_method"],
+                **{f"{m}_mape": r["methods"][m]["mape"] for m in methods},
+            }
+            for r in result["series"]
+        ]
+        print_table(
+            rows,
+            ["series", "points", "recommended"] + [f"{m}_mape" for m in methods],
+        )
+
+    print("\nPrediction endpoint timings:")
+    print_table(result["endpoint_timings"], ["metric", "method", "seconds"])
+
+
+if __name__ == "__main__":
+    main()
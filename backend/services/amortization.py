@@ -0,0 +1,133 @@
+"""Array-based debt amortization engine."""
+
+from typing import Dict, Any, Sequence
+
+import numpy as np
+
+# Safety cap on simulated months (50 years)
+MAX_MONTHS = 600
+
+
+def avalanche_order(interest_rates: Sequence[float]) -> list:
+    """Return debt indices ordered by interest rate (highest first, stable)."""
+    return sorted(
+        range(len(interest_rates)), key=lambda i: interest_rates[i], reverse=True
+    )
+
+
+def snowball_order(balances: Sequence[float]) -> list:
+    """Return debt indices ordered by balance (smallest first, stable)."""
+    return sorted(range(len(balances)), key=lambda i: balances[i])
+
+
+def simulate_payoff(
+    balances: Sequence[float],
+    interest_rates: Sequence[float],
+    minimum_payments: Sequence[float],
+    orders: Sequence[Sequence[int]],
+    extra_payments: Sequence[float],
+    snapshot_months: int = 12,
+) -> Dict[str, Any]:
+    """
+    Simulate debt payoff for many scenarios at once.
+
+    Each scenario is a priority order over the same debts plus an extra
+    monthly payment. Balances are held as a (scenarios x debts) matrix in
+    priority order, so one month is a handful of masked array updates for
+    every scenario together. Each month, interest accrues on every open
+    debt, non-priority debts pay their minimum and the highest-priority
+    open debt receives the sum of open minimums plus the extra payment.
+
+    Args:
+        balances: Current balance per debt
+        interest_rates: Annual interest rate (percent) per debt
+        minimum_payments: Minimum monthly payment per debt
+        orders: Priority order (list of debt indices) per scenario
+        extra_payments: Extra monthly payment per scenario (or a scalar)
+        snapshot_months: Number of leading months to keep snapshots for
+
+    Returns:
+        Dictionary of arrays:
+            total_months (S), total_interest (S), total_paid (S),
+            payoff_month (S x D, debt order, 0 if never paid off),
+            snapshot_payment/interest/remaining (S x N),
+            snapshot_balance/active (S x N x D, priority order)
+    """
+    orders = np.atleast_2d(np.asarray(orders, dtype=np.intp))
+    n_scenarios, n_debts = orders.shape
+    rows = np.arange(n_scenarios)
+
+    balance = np.asarray(balances, dtype=float)[orders]
+    monthly_rate = (np.asarray(interest_rates, dtype=float) / 100 / 12)[orders]
+    minimum = np.asarray(minimum_payments, dtype=float)[orders]
+    extra = np.broadcast_to(np.asarray(extra_payments, dtype=float), (n_scenarios,))
+
+    total_months = np.zeros(n_scenarios, dtype=int)
+    total_interest = np.zeros(n_scenarios)
+    total_paid = np.zeros(n_scenarios)
+    payoff_month = np.zeros((n_scenarios, n_debts), dtype=int)
+
+    snapshot_payment = np.zeros((n_scenarios, snapshot_months))
+    snapshot_interest = np.zeros((n_scenarios, snapshot_months))
+    snapshot_remaining = np.zeros((n_scenarios, snapshot_months))
+    snapshot_balance = np.zeros((n_scenarios, snapshot_months, n_debts))
+    snapshot_active = np.zeros((n_scenarios, snapshot_months, n_debts), dtype=bool)
+
+    active = balance > 0
+    running = active.any(axis=1)
+    month = 0
+
+    while running.any():
+        month += 1
+        total_months[running] = month
+        if month > MAX_MONTHS:
+            break
+
+        # Accrue interest on open debts
+        interest = np.where(active, balance * monthly_rate, 0.0)
+        balance = balance + interest
+
+        # Minimums on every open debt, the pooled amount on the priority debt
+        available = np.where(active, minimum, 0.0).sum(axis=1) + extra
+        payment = np.where(active, np.minimum(balance, minimum), 0.0)
+        priority = active.argmax(axis=1)
+        payment[rows, priority] = np.where(
+            running, np.minimum(balance[rows, priority], available), 0.0
+        )
+        balance = balance - payment
+
+        paid_off = active & (balance <= 0)
+        balance[paid_off] = 0.0
+        payoff_month[paid_off] = month
+
+        month_payment = payment.sum(axis=1)
+        month_interest = interest.sum(axis=1)
+        total_interest += month_interest
+        total_paid += month_payment
+
+        if month <= snapshot_months:
+            idx = month - 1
+            snapshot_payment[:, idx] = month_payment
+            snapshot_interest[:, idx] = month_interest
+            snapshot_remaining[:, idx] = balance.sum(axis=1)
+            snapshot_balance[:, idx] = balance
+            snapshot_active[:, idx] = active
+
+        active = balance > 0
+        running = active.any(axis=1)
+
+    # Map payoff months back from priority order to debt order
+    payoff_by_debt = np.zeros_like(payoff_month)
+    np.put_along_axis(payoff_by_debt, orders, payoff_month, axis=1)
+
+    return {
+        "total_months": total_months,
+        "total_interest": total_interest,
+        "total_paid": total_paid,
+        "payoff_month": payoff_by_debt,
+        "snapshot_payment": snapshot_payment,
+        "snapshot_interest": snapshot_interest,
+        "snapshot_remaining": snapshot_remaining,
+        "snapshot_balance": snapshot_balance,
+        "snapshot_active": snapshot_active,
+    }
@@ -0,0 +1,261 @@
+"""Columnar frame of transactions for vectorized analytics."""
+
+import threading
+from datetime import date as date_type
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from services.csv_manager import csv_manager
+from services.currency_service import currency_service
+from utils.tags import split_tags
+
+# Period types and the number of periods per year
+PERIODS_PER_YEAR = {"monthly": 12, "quarterly": 4, "yearly": 1}
+
+# Period types counted in days from date ordinals (ordinal 1 is a Monday)
+DAYS_PER_PERIOD = {"daily": 1, "weekly": 7}
+
+
+def _encode(values: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """Dictionary-encode strings into codes and a vocabulary (first-seen order)."""
+    vocabulary: Dict[str, int] = {}
+    codes = np.fromiter(
+        (vocabulary.setdefault(value, len(vocabulary)) for value in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return codes, list(vocabulary)
+
+
+def _parse_dates(dates: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get date ordinals, years and months (-1 for unparseable dates)."""
+    codes, vocabulary = _encode(dates)
+    parsed = np.full((len(vocabulary), 3), -1, dtype=np.int32)
+    for i, value in enumerate(vocabulary):
+        try:
+            day = date_type.fromisoformat(value[:10])
+        except ValueError:
+            continue
+        parsed[i] = (day.toordinal(), day.year, day.month)
+
+    parsed = parsed[codes] if len(codes) else parsed[:0]
+    return parsed[:, 0], parsed[:, 1], parsed[:, 2]
+
+
+class TransactionFrame:
+    """
+    Transactions as column arrays, in file order.
+
+    Dates are held as ordinals plus year and month, and string columns
+    (category, account, merchant, type, currency) as integer codes into a
+    vocabulary, so filters are boolean masks and group-bys are
+    ``np.bincount`` over codes. Sums accumulate in file order, like a loop
+    over the rows. Semicolon-separated tags are exploded into parallel
+    (row, tag code) arrays.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        """Build the frame from transactions.csv rows."""
+        self.size = len(rows)
+        self.dates = [row.get("date", "") for row in rows]
+        self.ordinals, self.years, self.months = _parse_dates(self.dates)
+
+        self.amounts = np.array(
+            [float(row.get("amount") or 0) for row in rows], dtype=np.float64
+        )
+        self.categories, self.category_ids = _encode(
+            [row.get("category_id", "") for row in rows]
+        )
+        self.accounts, self.account_ids = _encode(
+            [row.get("account_id", "") for row in rows]
+        )
+        self.merchants, self.merchant_names = _encode(
+            [(row.get("description") or "").strip() for row in rows]
+        )
+        self.types, self.type_names = _encode([row.get("type", "") for row in rows])
+        self.currencies, self.currency_codes = _encode(
+            [row.get("currency") or "ZAR" for row in rows]
+        )
+
+        tagged = [
+            (i, tag)
+            for i, row in enumerate(rows)
+            for tag in split_tags(row.get("tags"))
+        ]
+        self.tag_rows = np.array([i for i, _ in tagged], dtype=np.int64)
+        self.tags, self.tag_names = _encode([tag for _, tag in tagged])
+
+    def type_mask(self, txn_type: str) -> np.ndarray:
+        """Get a mask of rows of a transaction type."""
+        if txn_type not in self.type_names:
+            return np.zeros(self.size, dtype=bool)
+        return self.types == self.type_names.index(txn_type)
+
+    def category_code(self, category_id: str) -> int:
+        """Get the code of a category ID (-1 if no row has it)."""
+        try:
+            return self.category_ids.index(category_id)
+        except ValueError:
+            return -1
+
+    def mask(
+        self,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        category_id: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Get a mask of dated rows within a date range and category.
+
+        Args:
+            start_date: Earliest date (inclusive)
+            end_date: Latest date (inclusive)
+            category_id: Category ID
+
+        Returns:
+            Boolean mask over the rows
+        """
+        mask = self.ordinals >= 0
+        if start_date:
+            mask &= self.ordinals >= start_date.toordinal()
+        if end_date:
+            mask &= self.ordinals <= end_date.toordinal()
+        if category_id:
+            mask &= self.categories == self.category_code(category_id)
+        return mask
+
+    def periods(self, period_type: str) -> np.ndarray:
+        """
+        Get the period index of every row.
+
+        Args:
+            period_type: daily, weekly, monthly, quarterly or yearly (others
+                are monthly)
+
+        Returns:
+            Array of day or week numbers, or year * periods per year +
+            period within the year
+        """
+        if period_type in DAYS_PER_PERIOD:
+            return (self.ordinals.astype(np.int64) - 1) // DAYS_PER_PERIOD[period_type]
+
+        per_year = PERIODS_PER_YEAR.get(period_type, 12)
+        return self.years * per_year + (self.months - 1) * per_year // 12
+
+    def period_label(self, period: int, period_type: str) -> str:
+        """Format a period index as YYYY-MM-DD, YYYY-Www, YYYY-MM, YYYY-Qn or YYYY."""
+        if period_type in DAYS_PER_PERIOD:
+            first_day = date_type.fromordinal(
+                int(period) * DAYS_PER_PERIOD[period_type] + 1
+            )
+            if period_type == "daily":
+                return first_day.isoformat()
+            year, week, _ = first_day.isocalendar()
+            return f"{year}-W{week:02d}"
+
+        per_year = PERIODS_PER_YEAR.get(period_type, 12)
+        year, index = divmod(int(period), per_year)
+        if per_year == 4:
+            return f"{year}-Q{index + 1}"
+        if per_year == 1:
+            return str(year)
+        return f"{year}-{index + 1:02d}"
+
+    def base_amounts(self, base_currency: str, mask: np.ndarray) -> np.ndarray:
+        """
+        Get absolute amounts in the base currency for the masked rows.
+
+        Args:
+            base_currency: Currency to convert to
+            mask: Rows to convert
+
+        Returns:
+            Array of absolute converted amounts (zero outside the mask)
+
+        Raises:
+            HTTPException: If a rate is missing for a (currency, date) pair
+        """
+        amounts, missing = self.convert(base_currency, mask)
+        if missing.any():
+            i = int(np.flatnonzero(missing)[0])
+            raise HTTPException(
+                status_code=404,
+                detail=(
+                    f"No exchange rate found for {self.currency_codes[self.currencies[i]]} "
+                    f"to {base_currency} on {self.dates[i][:10]}"
+                ),
+            )
+
+        return amounts
+
+    def convert(
+        self, base_currency: str, mask: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert the masked rows to the base currency where a rate exists.
+
+        Rates are looked up once per (currency, date) pair, from the rate
+        recorded on that exact date.
+
+        Args:
+            base_currency: Currency to convert to
+            mask: Rows to convert
+
+        Returns:
+            Tuple of absolute converted amounts (zero outside the mask and
+            for rows without a rate) and a mask of the rows without a rate
+        """
+        amounts = np.where(mask, np.abs(self.amounts), 0.0)
+        missing = np.zeros(self.size, dtype=bool)
+
+        foreign = [
+            code
+            for code, currency in enumerate(self.currency_codes)
+            if currency.upper() != base_currency.upper()
+        ]
+        rows = np.flatnonzero(mask & np.isin(self.currencies, foreign))
+        if not len(rows):
+            return amounts, missing
+
+        keys = [
+            (self.currency_codes[self.currencies[i]], self.dates[i][:10]) for i in rows
+        ]
+        rates = currency_service.get_rates_on_dates(set(keys), base_currency)
+
+        factors = np.array(
+            [
+                rates.get((currency.upper(), rate_date), np.nan)
+                for currency, rate_date in keys
+            ]
+        )
+        unrated = np.isnan(factors)
+        missing[rows[unrated]] = True
+        amounts[rows] *= np.where(unrated, 0.0, factors)
+
+        return amounts, missing
+
+
+class AnalyticsFrameService:
+    """Keeps the transaction frame in step with transactions.csv."""
+
+    def __init__(self):
+        """Initialize analytics frame service."""
+        self._lock = threading.Lock()
+        self._frame: Optional[TransactionFrame] = None
+        self._version: Optional[str] = None
+
+    def get_frame(self) -> TransactionFrame:
+        """Get the transaction frame, rebuilding it if transactions.csv changed."""
+        with self._lock:
+            version = csv_manager.get_file_version("transactions.csv")
+            if self._frame is None or version != self._version:
+                self._frame = TransactionFrame(csv_manager.read_csv("transactions.csv"))
+                self._version = version
+
+            return self._frame
+
+
+# Singleton instance
+analytics_frame_service = AnalyticsFrameService()
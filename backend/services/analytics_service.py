@@ -1,10 +1,12 @@
 """Analytics service for trend analysis, YoY comparisons, and pattern detection."""
 
 from datetime import datetime, date as date_type, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from collections import defaultdict
 import statistics
 
+import numpy as np
+
 from models.analytics import (
     TrendAnalysis,
     TrendDataPoint,
@@ -13,11 +15,30 @@ from models.analytics import (
     SpendingPattern,
     CategoryInsight,
     CustomReport,
+    CustomReportRequest,
+    DrillDownRequest,
     DrillDownResult,
+    PredictionReport,
 )
 from models.currency import CurrencyConversion
+from services.analytics_frame import TransactionFrame, analytics_frame_service
+from services.category_stats import RunningStats, category_stats_service
 from services.csv_manager import csv_manager
 from services.currency_service import currency_service
+from services.drilldown_cube import (
+    CHILD_DIMENSIONS,
+    PARENT_DIMENSIONS,
+    drilldown_cube_service,
+)
+from services.prediction_service import prediction_service
+
+# Custom report groupings and their trend period types
+CUSTOM_REPORT_PERIODS = {
+    "day": "daily",
+    "week": "weekly",
+    "month": "monthly",
+    "quarter": "quarterly",
+}
 
 
 class AnalyticsService:
@@ -81,44 +102,25 @@ class AnalyticsService:
         Returns:
             TrendAnalysis with data points and trend direction
         """
-        # Load transactions
-        transactions = csv_manager.read_csv("transactions.csv")
-
-        # Filter transactions
-        filtered = self._filter_transactions(
-            transactions, start_date, end_date, category_id
-        )
-
-        # Group by period
-        period_data = self._group_by_period(
-            filtered, period_type, metric, base_currency
-        )
-
-        # Create data points
-        data_points = []
-        for period, value in sorted(period_data.items()):
-            data_points.append(
-                TrendDataPoint(
-                    period=period, value=value["total"], count=value["count"]
-                )
-            )
-
-        # Calculate statistics
-        values = [dp.value for dp in data_points]
-        average = statistics.mean(values) if values else 0
-        total = sum(values)
-
-        # Determine trend direction
-        trend_direction, trend_percentage = self._calculate_trend(values)
-
-        return TrendAnalysis(
-            metric=metric,
-            period_type=period_type,
-            data_points=data_points,
-            average=average,
-            total=total,
-            trend_direction=trend_direction,
-            trend_percentage=trend_percentage,
+        frame = analytics_frame_service.get_frame()
+
+        # Select rows contributing to the metric
+        mask = frame.mask(start_date, end_date, category_id)
+        income = frame.type_mask("income")
+        if metric == "income":
+            mask &= income
+        elif metric == "expenses":
+            mask &= frame.type_mask("expense")
+        elif metric != "net":
+            mask[:] = False
+
+        # Group by period: income adds, anything else subtracts for net
+        amounts = frame.base_amounts(base_currency, mask)
+        if metric == "net":
+            amounts = np.where(income, amounts, -amounts)
+
+        return self._build_trend(
+            frame, metric, period_type, np.flatnonzero(mask), amounts
         )
 
     def get_yoy_comparison(
@@ -139,16 +141,23 @@ class AnalyticsService:
 
         previous_year = current_year - 1
 
-        # Load transactions
-        transactions = csv_manager.read_csv("transactions.csv")
+        frame = analytics_frame_service.get_frame()
 
-        # Calculate metrics for both years
-        current_metrics = self._calculate_year_metrics(
-            transactions, current_year, base_currency
+        # Income and expense rows of both years, converted in one batch
+        is_current = frame.years == current_year
+        is_expense = frame.type_mask("expense")
+        mask = (is_current | (frame.years == previous_year)) & (
+            frame.type_mask("income") | is_expense
         )
-        previous_metrics = self._calculate_year_metrics(
-            transactions, previous_year, base_currency
+        amounts = frame.base_amounts(base_currency, mask)
+
+        # Calculate metrics for both years: (is current year, is expense) sums
+        rows = np.flatnonzero(mask)
+        sums = np.bincount(
+            is_current[rows] * 2 + is_expense[rows], weights=amounts[rows], minlength=4
         )
+        previous_metrics = self._year_metrics(sums[0], sums[1])
+        current_metrics = self._year_metrics(sums[2], sums[3])
 
         # Create comparisons
         income_comparison = self._create_yoy_comparison(
@@ -192,7 +201,7 @@ class AnalyticsService:
 
         # Category comparisons
         category_comparisons = self._get_category_comparisons(
-            transactions, current_year, previous_year, base_currency
+            frame, rows[is_expense[rows]], is_current, amounts
         )
 
         return YoYReport(
@@ -215,6 +224,9 @@ class AnalyticsService:
         """
         Detect spending patterns across categories.
 
+        Without a date range the running per-category statistics are read
+        directly; a date range is summarized from the transaction frame.
+
         Args:
             start_date: Start date filter
             end_date: End date filter
@@ -223,46 +235,78 @@ class AnalyticsService:
         Returns:
             List of detected spending patterns
         """
-        # Load data
-        transactions = csv_manager.read_csv("transactions.csv")
-        categories = csv_manager.read_csv("categories.csv")
-        category_map = {cat["id"]: cat["name"] for cat in categories}
+        if not start_date and not end_date:
+            return self._patterns_from_stats(
+                category_stats_service.get_stats(base_currency)
+            )
 
-        # Filter transactions
-        filtered = self._filter_transactions(transactions, start_date, end_date)
+        frame = analytics_frame_service.get_frame()
 
-        # Group by category
-        category_data = defaultdict(list)
-        for txn in filtered:
-            if txn.get("type") == "expense":
-                category_id = txn.get("category_id", "")
-                amount = abs(float(txn.get("amount", 0)))
-
-                # Convert to base currency
-                txn_currency = txn.get("currency", base_currency)
-                if txn_currency != base_currency:
-                    txn_date = datetime.strptime(txn.get("date", ""), "%Y-%m-%d").date()
-                    amount = self._convert_amount(
-                        amount, txn_currency, base_currency, txn_date
-                    )
-
-                category_data[category_id].append(
-                    {"amount": amount, "date": txn.get("date", "")}
-                )
+        mask = frame.mask(start_date, end_date) & frame.type_mask("expense")
+        amounts = frame.base_amounts(base_currency, mask)
 
-        # Detect patterns for each category
-        patterns = []
-        for category_id, txns in category_data.items():
-            if len(txns) < 3:  # Need at least 3 transactions to detect pattern
-                continue
+        return self._patterns_from_rows(frame, np.flatnonzero(mask), amounts)
 
-            pattern = self._detect_category_pattern(
-                category_id, category_map.get(category_id, "Unknown"), txns
-            )
-            if pattern:
-                patterns.append(pattern)
+    def get_income_analysis(
+        self,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        base_currency: str = "ZAR",
+    ) -> Dict[str, Any]:
+        """
+        Get income trend, growth and forecast from one shared aggregation.
 
-        return patterns
+        Args:
+            start_date: Start date filter (trend only; forecasts use all history)
+            end_date: End date filter (trend only)
+            base_currency: Base currency for conversions
+
+        Returns:
+            Dictionary with trend, predictions, average_monthly, total and
+            growth_rate
+        """
+        _, _, _, trend, predictions = self._analyze_metric(
+            "income", "linear_regression", start_date, end_date, base_currency
+        )
+
+        return {
+            "trend": trend,
+            "predictions": predictions,
+            "average_monthly": trend.average,
+            "total": trend.total,
+            "growth_rate": trend.trend_percentage,
+        }
+
+    def get_expense_analysis(
+        self,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        base_currency: str = "ZAR",
+    ) -> Dict[str, Any]:
+        """
+        Get expense trend, forecast and spending patterns from one shared aggregation.
+
+        Args:
+            start_date: Start date filter (trend and patterns; forecasts use
+                all history)
+            end_date: End date filter (trend and patterns)
+            base_currency: Base currency for conversions
+
+        Returns:
+            Dictionary with trend, predictions, patterns, average_monthly and total
+        """
+        frame, rows, amounts, trend, predictions = self._analyze_metric(
+            "expenses", "seasonal", start_date, end_date, base_currency
+        )
+        patterns = self._patterns_from_rows(frame, rows, amounts)
+
+        return {
+            "trend": trend,
+            "predictions": predictions,
+            "patterns": patterns,
+            "average_monthly": trend.average,
+            "total": trend.total,
+        }
 
     def get_category_insights(
         self,
@@ -378,94 +422,514 @@ class AnalyticsService:
             monthly_breakdown=monthly_breakdown,
         )
 
-    # Helper methods
+    def generate_custom_report(
+        self, request: CustomReportRequest, base_currency: str = "ZAR"
+    ) -> CustomReport:
+        """
+        Build a custom date range report in one pass over the filtered rows.
+
+        The date range is selected and converted to the base currency once;
+        totals, category insights, trends and top lists are then grouped
+        from those rows. Sections that were not requested are skipped.
+
+        Args:
+            request: Custom report request
+            base_currency: Base currency for conversions
 
-    def _filter_transactions(
+        Returns:
+            CustomReport for the date range
+
+        Raises:
+            ValueError: If group_by is unknown or the range is reversed
+        """
+        if request.group_by not in CUSTOM_REPORT_PERIODS:
+            raise ValueError(
+                f"Unknown group_by: {request.group_by}. "
+                f"Supported: {list(CUSTOM_REPORT_PERIODS)}"
+            )
+        if request.end_date < request.start_date:
+            raise ValueError("end_date must not be before start_date")
+
+        frame = analytics_frame_service.get_frame()
+        income_mask = frame.type_mask("income")
+        expense_mask = frame.type_mask("expense")
+
+        # Preceding period of equal length, selected in the same pass
+        window_start = request.start_date
+        if request.include_comparisons:
+            length = request.end_date - request.start_date + timedelta(days=1)
+            window_start = request.start_date - length
+
+        window = frame.mask(window_start, request.end_date) & (
+            income_mask | expense_mask
+        )
+        amounts = frame.base_amounts(base_currency, window)
+        window_rows = np.flatnonzero(window)
+        is_current = frame.ordinals[window_rows] >= request.start_date.toordinal()
+        is_expense = expense_mask[window_rows]
+
+        # Totals: (is current, is expense) sums
+        sums = np.bincount(
+            is_current * 2 + is_expense, weights=amounts[window_rows], minlength=4
+        )
+        total_income = float(sums[2])
+        total_expenses = float(sums[3])
+        net_income = total_income - total_expenses
+
+        rows = window_rows[is_current]
+        income_rows = rows[income_mask[rows]]
+        expense_rows = rows[expense_mask[rows]]
+
+        report = CustomReport(
+            start_date=str(request.start_date),
+            end_date=str(request.end_date),
+            total_income=total_income,
+            total_expenses=total_expenses,
+            net_income=net_income,
+            savings_rate=(net_income / total_income * 100) if total_income > 0 else 0,
+        )
+
+        if request.include_categories and request.include_expenses:
+            report.category_breakdown = self._category_breakdown(
+                frame, expense_rows, amounts, total_expenses
+            )
+
+        if request.include_trends:
+            report.trends = self._custom_report_trends(
+                frame, request, rows, income_rows, expense_rows, amounts
+            )
+
+        if request.include_income:
+            report.top_income_sources = self._top_merchants(
+                frame, income_rows, amounts, "source"
+            )
+        if request.include_expenses:
+            report.top_expenses = self._top_merchants(
+                frame, expense_rows, amounts, "description"
+            )
+
+        if request.include_comparisons:
+            report.comparison = self._custom_report_comparison(
+                request, window_start, sums
+            )
+
+        return report
+
+    def _custom_report_trends(
         self,
-        transactions: List[Dict],
-        start_date: Optional[date_type],
-        end_date: Optional[date_type],
-        category_id: Optional[str] = None,
-    ) -> List[Dict]:
-        """Filter transactions by date and category."""
-        filtered = []
-        for txn in transactions:
-            # Date filter
-            if start_date and txn.get("date", "") < str(start_date):
-                continue
-            if end_date and txn.get("date", "") > str(end_date):
-                continue
+        frame: TransactionFrame,
+        request: CustomReportRequest,
+        rows: np.ndarray,
+        income_rows: np.ndarray,
+        expense_rows: np.ndarray,
+        amounts: np.ndarray,
+    ) -> List[TrendAnalysis]:
+        """
+        Build the income, expense and net trends of a custom report.
 
-            # Category filter
-            if category_id and txn.get("category_id") != category_id:
-                continue
+        Args:
+            frame: Transaction frame
+            request: Custom report request
+            rows: Income and expense rows of the report range
+            income_rows: Income rows of the report range
+            expense_rows: Expense rows of the report range
+            amounts: Base currency amount per row
+
+        Returns:
+            Trends for the requested metrics
+        """
+        period_type = CUSTOM_REPORT_PERIODS[request.group_by]
+        trends = []
+        if request.include_income:
+            trends.append(
+                self._build_trend(frame, "income", period_type, income_rows, amounts)
+            )
+        if request.include_expenses:
+            trends.append(
+                self._build_trend(frame, "expenses", period_type, expense_rows, amounts)
+            )
+        if request.include_income and request.include_expenses:
+            signed = np.where(frame.type_mask("income"), amounts, -amounts)
+            trends.append(self._build_trend(frame, "net", period_type, rows, signed))
+        return trends
+
+    def _custom_report_comparison(
+        self, request: CustomReportRequest, previous_start: date_type, sums: np.ndarray
+    ) -> Dict[str, Any]:
+        """
+        Compare a custom report range with the preceding period.
 
-            filtered.append(txn)
+        Args:
+            request: Custom report request
+            previous_start: First day of the preceding period
+            sums: Amounts by (is current, is expense) pair
 
-        return filtered
+        Returns:
+            Previous period totals and percentage changes
+        """
+        previous_income, previous_expenses, total_income, total_expenses = (
+            float(total) for total in sums
+        )
+        return {
+            "previous_start_date": str(previous_start),
+            "previous_end_date": str(request.start_date - timedelta(days=1)),
+            "previous_income": previous_income,
+            "previous_expenses": previous_expenses,
+            "previous_net_income": previous_income - previous_expenses,
+            "income_change_percentage": (
+                (total_income - previous_income) / previous_income * 100
+                if previous_income > 0
+                else 0
+            ),
+            "expense_change_percentage": (
+                (total_expenses - previous_expenses) / previous_expenses * 100
+                if previous_expenses > 0
+                else 0
+            ),
+        }
+
+    def get_drill_down(
+        self, request: DrillDownRequest, base_currency: str = "ZAR"
+    ) -> DrillDownResult:
+        """
+        Break spending down by a dimension, optionally under a parent item.
+
+        Dimensions are group, category, merchant, account and tag. Groups
+        drill into categories (parent_id is the group) and categories into
+        merchants (parent_id is the category ID). Answered from daily
+        pre-aggregated cubes, so a drill step costs a bincount over the
+        cells of the date range instead of a scan of the history.
+        Transactions without an exchange rate on their date are left out
+        and counted in unconverted_count.
+
+        Args:
+            request: Drill-down request
+            base_currency: Base currency for conversions
 
-    def _group_by_period(
+        Returns:
+            DrillDownResult with items by spending, descending
+
+        Raises:
+            ValueError: If the dimension is unknown or has no parent
+        """
+        if request.dimension not in CHILD_DIMENSIONS:
+            raise ValueError(
+                f"Unknown dimension: {request.dimension}. "
+                f"Supported: {list(CHILD_DIMENSIONS)}"
+            )
+        if request.parent_id is not None and request.dimension not in PARENT_DIMENSIONS:
+            raise ValueError(f"Dimension {request.dimension} has no parent dimension")
+
+        cube = drilldown_cube_service.get_cube(base_currency)
+        items = cube.dimensions[request.dimension].roll_up(
+            request.start_date, request.end_date, request.parent_id
+        )
+
+        total_value = sum(item["expenses"] for item in items)
+        child_dimension = CHILD_DIMENSIONS[request.dimension]
+        for item in items:
+            item["value"] = item["expenses"]
+            item["percentage"] = (
+                (item["expenses"] / total_value * 100) if total_value > 0 else 0
+            )
+            item["child_dimension"] = child_dimension
+        items.sort(key=lambda item: (-item["value"], -item["income"], item["name"]))
+
+        return DrillDownResult(
+            dimension=request.dimension,
+            items=items,
+            total_value=total_value,
+            item_count=len(items),
+            top_item=items[0] if items else None,
+            unconverted_count=cube.unconverted_count(
+                request.start_date, request.end_date
+            ),
+        )
+
+    # Helper methods
+
+    def _build_trend(
         self,
-        transactions: List[Dict],
+        frame: TransactionFrame,
+        metric: str,
         period_type: str,
+        rows: np.ndarray,
+        amounts: np.ndarray,
+    ) -> TrendAnalysis:
+        """
+        Group rows by period into a trend.
+
+        Args:
+            frame: Transaction frame
+            metric: Metric name
+            period_type: Period type (daily, weekly, monthly, quarterly, yearly)
+            rows: Rows contributing to the metric
+            amounts: Signed base currency value per row
+
+        Returns:
+            TrendAnalysis with one data point per period that has rows
+        """
+        periods, codes = np.unique(
+            frame.periods(period_type)[rows], return_inverse=True
+        )
+        totals = np.bincount(codes, weights=amounts[rows], minlength=len(periods))
+        counts = np.bincount(codes, minlength=len(periods))
+
+        # Create data points
+        data_points = [
+            TrendDataPoint(
+                period=frame.period_label(period, period_type),
+                value=float(total),
+                count=int(count),
+            )
+            for period, total, count in zip(periods, totals, counts)
+        ]
+
+        # Calculate statistics
+        values = [dp.value for dp in data_points]
+        average = statistics.mean(values) if values else 0
+        total = sum(values)
+
+        # Determine trend direction
+        trend_direction, trend_percentage = self._calculate_trend(values)
+
+        return TrendAnalysis(
+            metric=metric,
+            period_type=period_type,
+            data_points=data_points,
+            average=average,
+            total=total,
+            trend_direction=trend_direction,
+            trend_percentage=trend_percentage,
+        )
+
+    def _analyze_metric(
+        self,
         metric: str,
+        method: str,
+        start_date: Optional[date_type],
+        end_date: Optional[date_type],
         base_currency: str,
-    ) -> Dict[str, Dict[str, Any]]:
-        """Group transactions by period and calculate metric."""
-        period_data = defaultdict(lambda: {"total": 0, "count": 0})
-
-        for txn in transactions:
-            # Get period key
-            date_str = txn.get("date", "")
-            if not date_str:
-                continue
+    ) -> Tuple[
+        TransactionFrame, np.ndarray, np.ndarray, TrendAnalysis, PredictionReport
+    ]:
+        """
+        Aggregate an income or expenses metric once for trend and forecast.
 
-            period_key = self._get_period_key(date_str, period_type)
+        The metric's rows are converted to the base currency in one batch
+        and grouped by month; the trend covers the date range, and the
+        forecast the last 12 months of the whole history.
 
-            # Calculate value based on metric
-            amount = float(txn.get("amount", 0))
-            txn_type = txn.get("type", "")
+        Args:
+            metric: income or expenses
+            method: Forecast method
+            start_date: Start date filter for the trend
+            end_date: End date filter for the trend
+            base_currency: Base currency for conversions
 
-            # Convert to base currency
-            txn_currency = txn.get("currency", base_currency)
-            if txn_currency != base_currency:
-                txn_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                amount = self._convert_amount(
-                    abs(amount), txn_currency, base_currency, txn_date
-                )
-                # Restore sign
-                if txn_type == "expense":
-                    amount = -abs(amount)
-                else:
-                    amount = abs(amount)
-
-            if metric == "income" and txn_type == "income":
-                period_data[period_key]["total"] += abs(amount)
-                period_data[period_key]["count"] += 1
-            elif metric == "expenses" and txn_type == "expense":
-                period_data[period_key]["total"] += abs(amount)
-                period_data[period_key]["count"] += 1
-            elif metric == "net":
-                if txn_type == "income":
-                    period_data[period_key]["total"] += abs(amount)
-                else:
-                    period_data[period_key]["total"] -= abs(amount)
-                period_data[period_key]["count"] += 1
-
-        return period_data
-
-    def _get_period_key(self, date_str: str, period_type: str) -> str:
-        """Get period key from date string."""
-        if period_type == "monthly":
-            return date_str[:7]  # YYYY-MM
-        elif period_type == "quarterly":
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            quarter = (date_obj.month - 1) // 3 + 1
-            return f"{date_obj.year}-Q{quarter}"
-        elif period_type == "yearly":
-            return date_str[:4]  # YYYY
+        Returns:
+            Tuple of (frame, rows within the date range, base currency
+            amounts, trend, prediction report)
+        """
+        frame = analytics_frame_service.get_frame()
+
+        txn_type = "income" if metric == "income" else "expense"
+        mask = (frame.ordinals >= 0) & frame.type_mask(txn_type)
+        amounts = frame.base_amounts(base_currency, mask)
+        rows = np.flatnonzero(mask)
+
+        history = self._build_trend(frame, metric, "monthly", rows, amounts)
+        if start_date or end_date:
+            rows = rows[frame.mask(start_date, end_date)[rows]]
+            trend = self._build_trend(frame, metric, "monthly", rows, amounts)
         else:
-            return date_str[:7]  # Default to monthly
+            trend = history
+
+        # Forecast from the last 12 months
+        historical_data = [
+            {"period": dp.period, "value": dp.value} for dp in history.data_points
+        ]
+        predictions = prediction_service.predict_from_history(
+            metric, historical_data[-12:], periods_ahead=3, method=method
+        )
+
+        return frame, rows, amounts, trend, predictions
+
+    def _patterns_from_rows(
+        self, frame: TransactionFrame, rows: np.ndarray, amounts: np.ndarray
+    ) -> List[SpendingPattern]:
+        """
+        Detect spending patterns for expense rows, per category.
+
+        Args:
+            frame: Transaction frame
+            rows: Expense rows to consider
+            amounts: Base currency amount per row
+
+        Returns:
+            Patterns for categories with at least 3 transactions, in order of
+            first appearance
+        """
+        # Group rows by category, keeping file order within each category
+        codes = frame.categories[rows]
+        order = np.argsort(codes, kind="stable")
+        groups, starts, counts = np.unique(
+            codes[order], return_index=True, return_counts=True
+        )
+        first_rows = np.minimum.reduceat(order, starts) if len(order) else starts
+
+        stats = {}
+        for g in np.argsort(first_rows, kind="stable"):
+            group_rows = rows[order[starts[g] : starts[g] + counts[g]]]
+            ordinals = frame.ordinals[group_rows]
+            stats[frame.category_ids[groups[g]]] = RunningStats.from_amounts(
+                amounts[group_rows],
+                date_type.fromordinal(int(ordinals.min())).isoformat(),
+                date_type.fromordinal(int(ordinals.max())).isoformat(),
+            )
+
+        return self._patterns_from_stats(stats)
+
+    def _patterns_from_stats(
+        self, stats: Dict[str, RunningStats]
+    ) -> List[SpendingPattern]:
+        """
+        Detect spending patterns from per-category expense statistics.
+
+        Args:
+            stats: Dictionary mapping category_id to RunningStats
+
+        Returns:
+            Patterns for categories with at least 3 transactions, in the
+            order of stats
+        """
+        categories = csv_manager.read_csv("categories.csv")
+        category_map = {cat["id"]: cat["name"] for cat in categories}
+
+        patterns = []
+        for category_id, category_stats in stats.items():
+            pattern = self._detect_category_pattern(
+                category_map.get(category_id, "Unknown"), category_stats
+            )
+            if pattern:
+                patterns.append(pattern)
+
+        return patterns
+
+    def _category_breakdown(
+        self,
+        frame: TransactionFrame,
+        rows: np.ndarray,
+        amounts: np.ndarray,
+        total_expenses: float,
+    ) -> List[CategoryInsight]:
+        """
+        Build category insights for expense rows with one grouping per key.
+
+        Args:
+            frame: Transaction frame
+            rows: Expense rows of the report range
+            amounts: Base currency amount per row
+            total_expenses: Total expenses of the report range
+
+        Returns:
+            Category insights by amount spent, descending
+        """
+        categories = csv_manager.read_csv("categories.csv")
+        category_map = {cat["id"]: cat["name"] for cat in categories}
+
+        codes = frame.categories[rows]
+        n_categories = len(frame.category_ids)
+        totals = np.bincount(codes, weights=amounts[rows], minlength=n_categories)
+        counts = np.bincount(codes, minlength=n_categories)
+
+        # (category, month) sums and (category, merchant) counts
+        months, month_codes = np.unique(
+            frame.periods("monthly")[rows], return_inverse=True
+        )
+        monthly = np.bincount(
+            codes * len(months) + month_codes,
+            weights=amounts[rows],
+            minlength=n_categories * len(months),
+        ).reshape(n_categories, len(months))
+        monthly_counts = np.bincount(
+            codes * len(months) + month_codes, minlength=n_categories * len(months)
+        ).reshape(n_categories, len(months))
+        merchant_keys, merchant_counts = np.unique(
+            codes.astype(np.int64) * len(frame.merchant_names) + frame.merchants[rows],
+            return_counts=True,
+        )
+        merchant_categories = merchant_keys // max(len(frame.merchant_names), 1)
+
+        insights = []
+        for code in np.flatnonzero(counts):
+            category_id = frame.category_ids[code]
+            in_category = merchant_categories == code
+            top = sorted(
+                zip(merchant_counts[in_category], merchant_keys[in_category]),
+                key=lambda item: -item[0],
+            )[:5]
+            breakdown = [
+                TrendDataPoint(
+                    period=frame.period_label(period, "monthly"),
+                    value=float(monthly[code, i]),
+                    count=int(monthly_counts[code, i]),
+                )
+                for i, period in enumerate(months)
+                if monthly_counts[code, i]
+            ]
+            trend_direction, _ = self._calculate_trend([dp.value for dp in breakdown])
+
+            insights.append(
+                CategoryInsight(
+                    category_id=category_id,
+                    category_name=category_map.get(category_id, "Unknown"),
+                    total_spent=float(totals[code]),
+                    transaction_count=int(counts[code]),
+                    average_transaction=float(totals[code]) / int(counts[code]),
+                    percentage_of_total=(
+                        float(totals[code]) / total_expenses * 100
+                        if total_expenses > 0
+                        else 0
+                    ),
+                    trend=trend_direction,
+                    top_merchants=[
+                        frame.merchant_names[key % len(frame.merchant_names)]
+                        for _, key in top
+                    ],
+                    monthly_breakdown=breakdown,
+                )
+            )
+
+        insights.sort(key=lambda insight: insight.total_spent, reverse=True)
+        return insights
+
+    def _top_merchants(
+        self,
+        frame: TransactionFrame,
+        rows: np.ndarray,
+        amounts: np.ndarray,
+        label: str,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Sum rows by description and return the largest totals."""
+        codes = frame.merchants[rows]
+        totals = np.bincount(
+            codes, weights=amounts[rows], minlength=len(frame.merchant_names)
+        )
+        counts = np.bincount(codes, minlength=len(frame.merchant_names))
+
+        present = np.flatnonzero(counts)
+        top = present[np.argsort(-totals[present], kind="stable")][:limit]
+
+        return [
+            {
+                label: frame.merchant_names[code] or "Unknown",
+                "amount": float(totals[code]),
+                "count": int(counts[code]),
+            }
+            for code in top
+        ]
 
     def _calculate_trend(self, values: List[float]) -> tuple:
         """Calculate trend direction and percentage change."""
@@ -489,36 +953,10 @@ class AnalyticsService:
 
         return direction, change_percentage
 
-    def _calculate_year_metrics(
-        self, transactions: List[Dict], year: int, base_currency: str
-    ) -> Dict[str, float]:
-        """Calculate income, expenses, and net for a year."""
-        income = 0
-        expenses = 0
-
-        for txn in transactions:
-            date_str = txn.get("date", "")
-            if not date_str or not date_str.startswith(str(year)):
-                continue
-
-            amount = float(txn.get("amount", 0))
-            txn_type = txn.get("type", "")
-
-            # Convert to base currency
-            txn_currency = txn.get("currency", base_currency)
-            if txn_currency != base_currency:
-                txn_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                amount = self._convert_amount(
-                    abs(amount), txn_currency, base_currency, txn_date
-                )
-            else:
-                amount = abs(amount)
-
-            if txn_type == "income":
-                income += amount
-            elif txn_type == "expense":
-                expenses += amount
-
+    def _year_metrics(self, income: float, expenses: float) -> Dict[str, float]:
+        """Build income, expenses and net metrics for a year."""
+        income = float(income)
+        expenses = float(expenses)
         return {"income": income, "expenses": expenses, "net": income - expenses}
 
     def _create_yoy_comparison(
@@ -555,45 +993,41 @@ class AnalyticsService:
 
     def _get_category_comparisons(
         self,
-        transactions: List[Dict],
-        current_year: int,
-        previous_year: int,
-        base_currency: str,
+        frame: TransactionFrame,
+        rows: np.ndarray,
+        is_current: np.ndarray,
+        amounts: np.ndarray,
     ) -> List[Dict[str, Any]]:
-        """Get category-level year-over-year comparisons."""
-        categories = csv_manager.read_csv("categories.csv")
-        category_map = {cat["id"]: cat["name"] for cat in categories}
-
-        # Group by category and year
-        category_data = defaultdict(lambda: {"current": 0, "previous": 0})
-
-        for txn in transactions:
-            date_str = txn.get("date", "")
-            if not date_str:
-                continue
-
-            year = int(date_str[:4])
-            if year not in [current_year, previous_year]:
-                continue
-
-            if txn.get("type") != "expense":
-                continue
+        """
+        Get category-level year-over-year comparisons.
 
-            category_id = txn.get("category_id", "")
-            amount = abs(float(txn.get("amount", 0)))
+        Args:
+            frame: Transaction frame
+            rows: Expense rows of the current and previous year
+            is_current: Mask of current-year rows
+            amounts: Base currency amounts per row
 
-            # Convert to base currency
-            txn_currency = txn.get("currency", base_currency)
-            if txn_currency != base_currency:
-                txn_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                amount = self._convert_amount(
-                    amount, txn_currency, base_currency, txn_date
-                )
+        Returns:
+            Category comparisons, by current value descending
+        """
+        categories = csv_manager.read_csv("categories.csv")
+        category_map = {cat["id"]: cat["name"] for cat in categories}
 
-            if year == current_year:
-                category_data[category_id]["current"] += amount
-            else:
-                category_data[category_id]["previous"] += amount
+        # Sum by (category, year), categories in order of first appearance
+        codes = frame.categories[rows]
+        sums = np.bincount(
+            codes * 2 + is_current[rows],
+            weights=amounts[rows],
+            minlength=2 * len(frame.category_ids),
+        ).reshape(-1, 2)
+        _, first_rows = np.unique(codes, return_index=True)
+
+        category_data = {}
+        for code in codes[np.sort(first_rows)]:
+            category_data[frame.category_ids[code]] = {
+                "current": float(sums[code, 1]),
+                "previous": float(sums[code, 0]),
+            }
 
         # Create comparisons
         comparisons = []
@@ -623,17 +1057,16 @@ class AnalyticsService:
         return comparisons
 
     def _detect_category_pattern(
-        self, category_id: str, category_name: str, transactions: List[Dict]
+        self, category_name: str, stats: RunningStats
     ) -> Optional[SpendingPattern]:
-        """Detect spending pattern for a category."""
-        if len(transactions) < 3:
+        """Detect spending pattern for a category from its expense statistics."""
+        if stats.count < 3:  # Need at least 3 transactions to detect pattern
             return None
 
-        amounts = [txn["amount"] for txn in transactions]
-        average_amount = statistics.mean(amounts)
+        average_amount = stats.mean
 
         # Calculate coefficient of variation
-        std_dev = statistics.stdev(amounts) if len(amounts) > 1 else 0
+        std_dev = stats.std_dev
         cv = (std_dev / average_amount) if average_amount > 0 else 0
 
         # Determine pattern type
@@ -655,12 +1088,9 @@ class AnalyticsService:
             description = f"Highly variable spending, average {average_amount:.2f}"
 
         # Estimate frequency
-        dates = [datetime.strptime(txn["date"], "%Y-%m-%d") for txn in transactions]
-        dates.sort()
-
-        if len(dates) > 1:
-            avg_days_between = (dates[-1] - dates[0]).days / (len(dates) - 1)
+        avg_days_between = stats.avg_days_between
 
+        if avg_days_between is not None:
             if avg_days_between < 7:
                 frequency = "weekly"
             elif avg_days_between < 35:
@@ -0,0 +1,94 @@
+"""Anomaly detection for newly written transactions."""
+
+import logging
+from datetime import date as date_type
+from typing import List, Dict, Any, Optional
+
+from models.analytics import Anomaly
+from services.category_stats import category_stats_service
+from services.csv_manager import csv_manager
+
+logger = logging.getLogger(__name__)
+
+
+class AnomalyService:
+    """
+    Flags unusually large expenses as they are written.
+
+    Transaction writes (manual, import, recurring) call ``observe``, which
+    has the appended expenses scored against their category and merchant
+    running statistics and folded in, in O(1) per transaction, on a
+    background thread. Updates and deletes call it too, so the rebuild a
+    rewritten file needs also happens off the request path. Reads fold
+    anything still outstanding first.
+    """
+
+    def _get_base_currency(self) -> str:
+        """Get base currency from settings."""
+        settings = csv_manager.read_json("settings.json")
+        return settings.get("base_currency", "ZAR")
+
+    def observe(self):
+        """
+        Score the transactions written since the last call in the background.
+
+        Expenses without an exchange rate are parked and scored once the
+        rate exists, without holding back the others. Never raises, since
+        the transactions are already written.
+        """
+        try:
+            category_stats_service.refresh_in_background(self._get_base_currency())
+        except Exception as e:
+            logger.error(f"Error scheduling anomaly detection: {str(e)}")
+
+    def list_anomalies(
+        self,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        category_id: Optional[str] = None,
+        min_score: Optional[float] = None,
+        limit: int = 50,
+    ) -> List[Anomaly]:
+        """
+        List anomalous expenses, newest first.
+
+        Args:
+            start_date: Earliest transaction date (inclusive)
+            end_date: Latest transaction date (inclusive)
+            category_id: Filter by category
+            min_score: Minimum anomaly score
+            limit: Maximum number of anomalies to return
+
+        Returns:
+            List of anomalies with amounts in the base currency
+        """
+        base_currency = self._get_base_currency()
+        anomalies = category_stats_service.get_anomalies(base_currency)
+
+        categories = csv_manager.read_csv("categories.csv")
+        category_map = {cat["id"]: cat["name"] for cat in categories}
+
+        lower = str(start_date) if start_date else ""
+        upper = str(end_date) if end_date else "9999-12-31"
+
+        matching: List[Dict[str, Any]] = [
+            anomaly
+            for anomaly in anomalies
+            if lower <= anomaly["date"] <= upper
+            and (not category_id or anomaly["category_id"] == category_id)
+            and (min_score is None or anomaly["score"] >= min_score)
+        ]
+        matching.sort(key=lambda anomaly: anomaly["date"], reverse=True)
+
+        return [
+            Anomaly(
+                **anomaly,
+                category_name=category_map.get(anomaly["category_id"], "Unknown"),
+                currency=base_currency,
+            )
+            for anomaly in matching[:limit]
+        ]
+
+
+# Singleton instance
+anomaly_service = AnomalyService()
@@ -0,0 +1,258 @@
+"""Rolling-origin backtesting of forecast methods."""
+
+import os
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from models.currency import CurrencyConversion
+from services.csv_manager import csv_manager
+from services.currency_service import currency_service
+from services.prediction_service import prediction_service, FORECAST_METHODS
+
+
+def _backtest_series(
+    task: Tuple[str, List[Dict[str, Any]], List[str], int, int]
+) -> Dict[str, Any]:
+    """
+    Backtest every method on one series (runs inside a worker process).
+
+    For each forecast origin ``t`` the method is trained on ``series[:t]`` and
+    scored against the next ``horizon`` observed values.
+    """
+    name, series, methods, min_train, horizon = task
+    values = [item["value"] for item in series]
+    results = {}
+
+    for method in methods:
+        abs_errors = []
+        pct_errors = []
+        folds = 0
+        started = time.perf_counter()
+
+        for origin in range(min_train, len(series)):
+            actuals = values[origin : origin + horizon]
+            predictions = prediction_service.predict_series(
+                series[:origin], len(actuals), method
+            )
+            folds += 1
+
+            for actual, pred in zip(actuals, predictions):
+                error = abs(actual - pred.predicted_value)
+                abs_errors.append(error)
+                if actual > 0:
+                    pct_errors.append(error / actual)
+
+        results[method] = {
+            "folds": folds,
+            "mae": round(statistics.mean(abs_errors), 2) if abs_errors else None,
+            "mape": (
+                round(statistics.mean(pct_errors) * 100, 2) if pct_errors else None
+            ),
+            "seconds": time.perf_counter() - started,
+        }
+
+    return {"series": name, "points": len(series), "methods": results}
+
+
+class BacktestService:
+    """Service for evaluating forecast methods with rolling-origin cross-validation."""
+
+    def __init__(self):
+        """Initialize backtest service."""
+        pass
+
+    def load_series(
+        self, base_currency: str = "ZAR"
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Build every monthly series the prediction endpoints forecast.
+
+        Produces the ``income``, ``expenses`` and ``net`` metrics plus one
+        ``category:<id>`` series per category, from a single pass over
+        transactions.csv. Series are built the same way as
+        ``PredictionService`` builds them, but without the 12 month cap.
+
+        Args:
+            base_currency: Base currency for conversions
+
+        Returns:
+            Dictionary of series name to sorted list of {"period", "value"}
+        """
+        transactions = csv_manager.read_csv("transactions.csv")
+        monthly = defaultdict(lambda: defaultdict(float))
+
+        for txn in transactions:
+            date_str = txn.get("date", "")
+            if not date_str:
+                continue
+
+            month = date_str[:7]
+            amount = abs(float(txn.get("amount", 0) or 0))
+            txn_type = txn.get("type", "")
+
+            txn_currency = txn.get("currency") or base_currency
+            if txn_currency != base_currency:
+                conversion = CurrencyConversion(
+                    amount=amount,
+                    from_currency=txn_currency,
+                    to_currency=base_currency,
+                    date=datetime.strptime(date_str, "%Y-%m-%d").date(),
+                )
+                amount = currency_service.convert_currency(conversion).converted_amount
+
+            if txn_type == "income":
+                monthly["income"][month] += amount
+                monthly["net"][month] += amount
+            elif txn_type == "expense":
+                monthly["expenses"][month] += amount
+                monthly["net"][month] -= amount
+            else:
+                monthly["net"][month] -= amount
+
+            category_id = txn.get("category_id")
+            if category_id:
+                monthly[f"category:{category_id}"][month] += amount
+
+        return {
+            name: [
+                {"period": month, "value": value}
+                for month, value in sorted(months.items())
+            ]
+            for name, months in monthly.items()
+        }
+
+    def run(
+        self,
+        methods: Optional[List[str]] = None,
+        min_train: int = 6,
+        horizon: int = 3,
+        workers: Optional[int] = None,
+        base_currency: str = "ZAR",
+    ) -> Dict[str, Any]:
+        """
+        Backtest forecast methods across all series in parallel.
+
+        Args:
+            methods: Methods to evaluate (default: all supported methods)
+            min_train: Minimum number of months before the first forecast origin
+            horizon: Number of months forecast from each origin
+            workers: Worker processes (default: CPU count, 1 runs in-process)
+            base_currency: Base currency for conversions
+
+        Returns:
+            Dictionary with per-series scores, per-method aggregates,
+            recommended method per series and timings
+        """
+        methods = methods or FORECAST_METHODS
+        started = time.perf_counter()
+
+        series = self.load_series(base_currency)
+        load_seconds = time.perf_counter() - started
+
+        tasks = [
+            (name, data, methods, min_train, horizon)
+            for name, data in sorted(series.items())
+            if len(data) > min_train
+        ]
+
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                series_results = list(executor.map(_backtest_series, tasks))
+        else:
+            series_results = [_backtest_series(task) for task in tasks]
+
+        for result in series_results:
+            result["recommended_method"] = self._pick_method(result["methods"])
+
+        return {
+            "methods": self._summarize_methods(series_results, methods),
+            "series": series_results,
+            "skipped_series": sorted(
+                name for name, data in series.items() if len(data) <= min_train
+            ),
+            "endpoint_timings": self.time_prediction_endpoints(methods, base_currency),
+            "settings": {
+                "min_train": min_train,
+                "horizon": horizon,
+                "workers": workers,
+                "base_currency": base_currency,
+            },
+            "load_seconds": round(load_seconds, 4),
+            "wall_clock_seconds": round(time.perf_counter() - started, 4),
+        }
+
+    def time_prediction_endpoints(
+        self, methods: List[str], base_currency: str = "ZAR"
+    ) -> List[Dict[str, Any]]:
+        """
+        Measure wall-clock of ``predict_metric`` as served by /analytics/predictions.
+
+        Args:
+            methods: Methods to time
+            base_currency: Base currency for conversions
+
+        Returns:
+            List of {"metric", "method", "seconds"} entries
+        """
+        timings = []
+        for metric in ["income", "expenses", "net"]:
+            for method in methods:
+                started = time.perf_counter()
+                prediction_service.predict_metric(
+                    metric, method=method, base_currency=base_currency
+                )
+                timings.append(
+                    {
+                        "metric": metric,
+                        "method": method,
+                        "seconds": round(time.perf_counter() - started, 4),
+                    }
+                )
+        return timings
+
+    def _summarize_methods(
+        self, series_results: List[Dict[str, Any]], methods: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Aggregate per-series scores into one row per method."""
+        summary = []
+        for method in methods:
+            scores = [result["methods"][method] for result in series_results]
+            maes = [s["mae"] for s in scores if s["mae"] is not None]
+            mapes = [s["mape"] for s in scores if s["mape"] is not None]
+            wins = sum(
+                1 for result in series_results if result["recommended_method"] == method
+            )
+
+            summary.append(
+                {
+                    "method": method,
+                    "series": len(scores),
+                    "folds": sum(s["folds"] for s in scores),
+                    "mean_mae": round(statistics.mean(maes), 2) if maes else None,
+                    "mean_mape": round(statistics.mean(mapes), 2) if mapes else None,
+                    "wins": wins,
+                    "seconds": round(sum(s["seconds"] for s in scores), 4),
+                }
+            )
+        return summary
+
+    def _pick_method(self, scores: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        """Pick the method with the lowest MAPE, using MAE when MAPE is undefined."""
+        with_mape = {m: s["mape"] for m, s in scores.items() if s["mape"] is not None}
+        if with_mape:
+            return min(with_mape, key=with_mape.get)
+
+        with_mae = {m: s["mae"] for m, s in scores.items() if s["mae"] is not None}
+        if with_mae:
+            return min(with_mae, key=with_mae.get)
+
+        return None
+
+
+# Singleton instance
+backtest_service = BacktestService()
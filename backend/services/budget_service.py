@@ -6,6 +6,7 @@ from collections import defaultdict
 
 from services.csv_manager import csv_manager
 from services.calculator import calculator
+from services.report_cube import report_cube_service
 from models.budget import BUDGET_FIELDNAMES
 from models.transaction import TRANSACTION_FIELDNAMES
 
@@ -24,23 +25,12 @@ class BudgetService:
         Returns:
             Dictionary mapping category_id to actual spending amount
         """
-        # Get all transactions for the month
-        transactions = csv_manager.read_csv("transactions.csv")
+        cube = report_cube_service.get_cube()
 
-        # Filter transactions for the specified month
-        spending_by_category = defaultdict(float)
-
-        for tx in transactions:
-            tx_date = datetime.fromisoformat(tx["date"])
-            if tx_date.year == year and tx_date.month == month:
-                category_id = tx.get("category_id", "")
-                amount = float(tx["amount"])
-
-                # Only count expenses (negative amounts)
-                if amount < 0:
-                    spending_by_category[category_id] += abs(amount)
-
-        return dict(spending_by_category)
+        return {
+            category_id: data["amount"]
+            for category_id, data in cube.category_spending(year, month).items()
+        }
 
     def calculate_budget_status(self, budget_id: str) -> Dict[str, Any]:
         """
@@ -58,12 +48,29 @@ class BudgetService:
         if not budget:
             return None
 
+        # Get actual spending
+        actual_spending = self.calculate_actual_spending(
+            int(budget["year"]), int(budget["month"])
+        )
+
+        return self.build_budget_status(budget, actual_spending)
+
+    def build_budget_status(
+        self, budget: Dict[str, Any], actual_spending: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """
+        Compare a budget with actual spending.
+
+        Args:
+            budget: Budget row
+            actual_spending: Dictionary mapping category_id to actual spending
+
+        Returns:
+            Dictionary with budget status including utilization percentage
+        """
         year = int(budget["year"])
         month = int(budget["month"])
 
-        # Get actual spending
-        actual_spending = self.calculate_actual_spending(year, month)
-
         # Calculate totals by group
         categories = csv_manager.read_csv("categories.csv")
         category_map = {cat["id"]: cat for cat in categories}
@@ -0,0 +1,431 @@
+"""Running per-category statistics of expenses, folded from transactions.csv."""
+
+import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as date_type
+from typing import Dict, Any, List, Optional, Set
+
+import numpy as np
+
+from services.csv_manager import csv_manager
+from services.currency_service import currency_service
+
+logger = logging.getLogger(__name__)
+
+# Persisted snapshot of the running statistics
+CATEGORY_STATS_FILE = "category_stats.json"
+
+# Persist the snapshot after this many incrementally applied transactions
+PERSIST_EVERY = 100
+
+# Expenses this many standard deviations above their history are anomalies
+ANOMALY_THRESHOLD = 3.0
+
+# Expenses needed in a category or merchant history before scoring against it
+MIN_HISTORY = 5
+
+# Floor of the standard deviation relative to the mean (flat histories)
+MIN_RELATIVE_STD = 0.1
+
+
+class RunningStats:
+    """
+    Count, mean and variance of amounts (Welford's algorithm) plus date range.
+
+    Amounts are folded one at a time in O(1), so the statistics can follow
+    an append-only log without keeping the amounts themselves.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.first_date = ""
+        self.last_date = ""
+
+    def add(self, amount: float, date: str):
+        """Fold one amount recorded on a date (YYYY-MM-DD)."""
+        self.count += 1
+        delta = amount - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (amount - self.mean)
+
+        if not self.first_date or date < self.first_date:
+            self.first_date = date
+        if date > self.last_date:
+            self.last_date = date
+
+    @classmethod
+    def from_amounts(
+        cls, amounts: np.ndarray, first_date: str, last_date: str
+    ) -> "RunningStats":
+        """Summarize an array of amounts spanning first_date to last_date."""
+        stats = cls()
+        stats.count = len(amounts)
+        if stats.count:
+            stats.mean = float(amounts.mean())
+            stats.m2 = float(((amounts - stats.mean) ** 2).sum())
+        stats.first_date = first_date
+        stats.last_date = last_date
+        return stats
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the amounts (0 for fewer than two)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        """Sample standard deviation of the amounts."""
+        return math.sqrt(max(self.variance, 0.0))
+
+    @property
+    def avg_days_between(self) -> Optional[float]:
+        """Mean number of days between consecutive dates (None for fewer than two)."""
+        if self.count < 2:
+            return None
+        span = date_type.fromisoformat(self.last_date) - date_type.fromisoformat(
+            self.first_date
+        )
+        return span.days / (self.count - 1)
+
+    def z_score(self, amount: float) -> Optional[float]:
+        """
+        Score an amount against the statistics.
+
+        The standard deviation is floored at MIN_RELATIVE_STD of the mean,
+        so a history of identical amounts still yields a finite score.
+
+        Returns:
+            Standard deviations above the mean (None below MIN_HISTORY amounts)
+        """
+        if self.count < MIN_HISTORY:
+            return None
+        std_dev = max(self.std_dev, abs(self.mean) * MIN_RELATIVE_STD)
+        if std_dev <= 0:
+            return None
+        return (amount - self.mean) / std_dev
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the statistics."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "first_date": self.first_date,
+            "last_date": self.last_date,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        """Restore serialized statistics."""
+        stats = cls()
+        stats.count = data["count"]
+        stats.mean = data["mean"]
+        stats.m2 = data["m2"]
+        stats.first_date = data["first_date"]
+        stats.last_date = data["last_date"]
+        return stats
+
+
+def merchant_key(description: str) -> str:
+    """Normalize a transaction description into a merchant key."""
+    return " ".join((description or "").lower().split())
+
+
+def _expense_date(row: Dict[str, Any]) -> Optional[str]:
+    """Get the YYYY-MM-DD date of an expense row (None for other or undated rows)."""
+    if row.get("type") != "expense":
+        return None
+    try:
+        return date_type.fromisoformat((row.get("date") or "")[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+class CategoryStatsLedger:
+    """
+    Running expense statistics per category and merchant in one base currency.
+
+    Each expense is scored against its category and merchant statistics
+    before it is folded into them, so anomalies are detected in O(1) per
+    transaction as the log grows. Scores only depend on the transactions
+    before it in file order, so a rebuild flags the same transactions.
+
+    Expenses without an exchange rate on their date are parked (by ID)
+    instead of folded. Adding a rate changes exchange_rates.csv, which
+    rebuilds the ledger and folds them in their place.
+    """
+
+    def __init__(self, base_currency: str, rates_version: str):
+        """Initialize an empty ledger."""
+        self.base_currency = base_currency
+        self.rates_version = rates_version
+        self.cursor: Optional[Dict[str, Any]] = None
+        self.categories: Dict[str, RunningStats] = {}
+        self.merchants: Dict[str, RunningStats] = {}
+        self.anomalies: List[Dict[str, Any]] = []
+        self.unconverted: List[str] = []
+
+    def add(self, rows: List[Dict[str, Any]]):
+        """
+        Score and fold transactions.csv rows (in file order) into the statistics.
+
+        Amounts are absolute and converted to the base currency with the
+        rate recorded on the transaction date. Expenses without a rate are
+        parked in unconverted.
+        """
+        expenses = []
+        for row in rows:
+            expense_date = _expense_date(row)
+            if expense_date is not None:
+                currency = (row.get("currency") or "ZAR").upper()
+                expenses.append((row, expense_date, currency))
+
+        pairs = {
+            (currency, expense_date)
+            for _, expense_date, currency in expenses
+            if currency != self.base_currency.upper()
+        }
+        rates = (
+            currency_service.get_rates_on_dates(pairs, self.base_currency)
+            if pairs
+            else {}
+        )
+
+        converted = []
+        for row, expense_date, currency in expenses:
+            amount = abs(float(row.get("amount") or 0))
+            if currency != self.base_currency.upper():
+                rate = rates.get((currency, expense_date))
+                if rate is None:
+                    self.unconverted.append(row.get("id", ""))
+                    continue
+                amount *= rate
+            converted.append((row, expense_date, amount))
+
+        for row, expense_date, amount in converted:
+            category_id = row.get("category_id", "")
+            if category_id not in self.categories:
+                self.categories[category_id] = RunningStats()
+            merchant = merchant_key(row.get("description", ""))
+            if merchant not in self.merchants:
+                self.merchants[merchant] = RunningStats()
+
+            self._score(row, expense_date, amount, merchant)
+            self.categories[category_id].add(amount, expense_date)
+            self.merchants[merchant].add(amount, expense_date)
+
+    def _score(
+        self, row: Dict[str, Any], expense_date: str, amount: float, merchant: str
+    ):
+        """Record the expense as an anomaly if it is far above its history."""
+        category = self.categories[row.get("category_id", "")]
+        category_z = category.z_score(amount)
+        merchant_z = self.merchants[merchant].z_score(amount)
+
+        reasons = [
+            reason
+            for reason, z in (("category", category_z), ("merchant", merchant_z))
+            if z is not None and z >= ANOMALY_THRESHOLD
+        ]
+        if not reasons:
+            return
+
+        self.anomalies.append(
+            {
+                "transaction_id": row.get("id", ""),
+                "date": expense_date,
+                "description": row.get("description", ""),
+                "category_id": row.get("category_id", ""),
+                "account_id": row.get("account_id", ""),
+                "amount": amount,
+                "expected_amount": category.mean,
+                "score": max(z for z in (category_z, merchant_z) if z is not None),
+                "category_z_score": category_z,
+                "merchant_z_score": merchant_z,
+                "reasons": reasons,
+            }
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the ledger."""
+        return {
+            "rates_version": self.rates_version,
+            "cursor": self.cursor,
+            "categories": {
+                category_id: stats.to_dict()
+                for category_id, stats in self.categories.items()
+            },
+            "merchants": {
+                merchant: stats.to_dict() for merchant, stats in self.merchants.items()
+            },
+            "anomalies": self.anomalies,
+            "unconverted": self.unconverted,
+        }
+
+    @classmethod
+    def from_dict(
+        cls, base_currency: str, data: Dict[str, Any]
+    ) -> "CategoryStatsLedger":
+        """Restore a serialized ledger."""
+        ledger = cls(base_currency, data["rates_version"])
+        ledger.cursor = data["cursor"]
+        ledger.categories = {
+            category_id: RunningStats.from_dict(stats)
+            for category_id, stats in data["categories"].items()
+        }
+        ledger.merchants = {
+            merchant: RunningStats.from_dict(stats)
+            for merchant, stats in data["merchants"].items()
+        }
+        ledger.anomalies = data["anomalies"]
+        ledger.unconverted = data["unconverted"]
+        return ledger
+
+
+class CategoryStatsService:
+    """
+    Keeps per-category expense statistics in step with transactions.csv.
+
+    Statistics (and the anomalies found while folding them) are kept per
+    base currency together with a read cursor into transactions.csv, so
+    each read only folds the transactions appended since the last one. A
+    rewritten file (updates, deletes) or changed exchange rates trigger a
+    rebuild. The ledgers are persisted, so a restart resumes from the
+    snapshot instead of refolding the history.
+
+    Writers call refresh_in_background, which folds (or rebuilds) on a
+    background thread, so a write never waits for a rebuild.
+    """
+
+    def __init__(self):
+        """Initialize category statistics service."""
+        self._lock = threading.Lock()
+        self._ledgers: Optional[Dict[str, CategoryStatsLedger]] = None
+        self._pending = 0
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="category-stats"
+        )
+        self._queue_lock = threading.Lock()
+        self._queued: Set[str] = set()
+
+    def get_stats(self, base_currency: str = "ZAR") -> Dict[str, RunningStats]:
+        """
+        Get up-to-date expense statistics per category.
+
+        Args:
+            base_currency: Currency the amounts are converted to
+
+        Returns:
+            Dictionary mapping category_id to RunningStats, in order of first
+            appearance in transactions.csv
+        """
+        with self._lock:
+            return dict(self._sync(base_currency).categories)
+
+    def get_anomalies(self, base_currency: str = "ZAR") -> List[Dict[str, Any]]:
+        """
+        Get the anomalous expenses, in file order.
+
+        Args:
+            base_currency: Currency the amounts are converted to
+
+        Returns:
+            List of anomaly records (transaction, amount, scores and reasons)
+        """
+        with self._lock:
+            return list(self._sync(base_currency).anomalies)
+
+    def refresh_in_background(self, base_currency: str = "ZAR"):
+        """
+        Fold new transactions (or rebuild) on the background thread.
+
+        Calls made while a refresh is already queued are coalesced into it.
+
+        Args:
+            base_currency: Currency the amounts are converted to
+        """
+        with self._queue_lock:
+            if base_currency in self._queued:
+                return
+            self._queued.add(base_currency)
+
+        self._executor.submit(self._refresh, base_currency)
+
+    def _refresh(self, base_currency: str):
+        """Sync a ledger on the background thread, logging failures."""
+        # Writes from here on queue another refresh
+        with self._queue_lock:
+            self._queued.discard(base_currency)
+
+        try:
+            with self._lock:
+                self._sync(base_currency)
+        except Exception as e:
+            logger.error(f"Error updating category statistics: {str(e)}")
+
+    def _sync(self, base_currency: str) -> CategoryStatsLedger:
+        """Fold new transactions into a base currency ledger (caller holds the lock)."""
+        if self._ledgers is None:
+            self._load_snapshot()
+
+        ledger = self._ledgers.get(base_currency)
+        rates_version = csv_manager.get_file_version("exchange_rates.csv")
+        if ledger is None or ledger.rates_version != rates_version:
+            ledger = CategoryStatsLedger(base_currency, rates_version)
+
+        rows, cursor, continuation = csv_manager.read_csv_since(
+            "transactions.csv", ledger.cursor
+        )
+        if ledger.cursor is not None and not continuation:
+            ledger = CategoryStatsLedger(base_currency, rates_version)
+
+        ledger.add(rows)
+        rebuilt = ledger.cursor is None
+        ledger.cursor = cursor
+        self._ledgers[base_currency] = ledger
+
+        self._pending += len(rows)
+        if rebuilt or self._pending >= PERSIST_EVERY:
+            self._save_snapshot()
+
+        return ledger
+
+    def _load_snapshot(self):
+        """Load the persisted snapshot, if any."""
+        self._ledgers = {}
+
+        try:
+            snapshot = csv_manager.read_json(CATEGORY_STATS_FILE)
+        except Exception:
+            return
+
+        for base_currency, data in snapshot.get("ledgers", {}).items():
+            try:
+                self._ledgers[base_currency] = CategoryStatsLedger.from_dict(
+                    base_currency, data
+                )
+            except (KeyError, TypeError):
+                continue
+
+    def _save_snapshot(self):
+        """Persist the ledgers with their cursors."""
+        csv_manager.write_json(
+            CATEGORY_STATS_FILE,
+            {
+                "ledgers": {
+                    base_currency: ledger.to_dict()
+                    for base_currency, ledger in self._ledgers.items()
+                }
+            },
+        )
+        self._pending = 0
+
+
+# Singleton instance
+category_stats_service = CategoryStatsService()
@@ -0,0 +1,283 @@
+"""Log of row changes to the CSV tables, numbered by a change sequence."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# Import fcntl only on Unix systems (not available on Windows)
+if sys.platform != "win32":
+    import fcntl
+else:
+    fcntl = None
+
+from config import config
+from utils.dates import now_iso
+
+# Append-only log, one JSON object per line after a header line
+CHANGE_LOG_FILE = "change_log.jsonl"
+
+# Change operations
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+
+class ChangeLog:
+    """
+    Monotonic change sequence over all CSV table writes.
+
+    Every inserted, updated or deleted row gets the next sequence number
+    and is appended to the log with the row's new values, so a client
+    keeping a replica fetches only the changes after the last number it
+    saw. Entries are kept in memory in sequence order; a lookup bisects to
+    the first newer entry and costs O(changes returned).
+
+    Several processes (the server, scripts) may write the same log. Each
+    takes an exclusive file lock and reads the entries other processes
+    appended since its last look before numbering its own, and readers
+    catch up the same way under a shared lock, so numbers stay unique and
+    monotonic across processes.
+
+    The log keeps the latest CHANGE_LOG_RETENTION entries. Once it holds
+    twice that many it is truncated, and the header line records the
+    floor: the sequence number up to which changes were dropped. Clients
+    behind the floor have to reload the tables. A new log starts with
+    floor and sequence 1, so a client without a replica (since=0) always
+    starts with a reload.
+    """
+
+    def __init__(self):
+        """Initialize change log."""
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._seqs: List[int] = []
+        self._floor = 1
+        self._seq = 1
+
+        # Log file read up to (inode and byte offset)
+        self._inode: Optional[int] = None
+        self._size = 0
+
+    def record(self, table: str, changes: Iterable[Tuple[str, str, Any]]) -> int:
+        """
+        Append row changes of a table to the log.
+
+        Args:
+            table: Name of the table (CSV file name without extension)
+            changes: (operation, row key, row values or None for deletes)
+
+        Returns:
+            Sequence number of the last change
+        """
+        with self._lock, self._file_lock(exclusive=True) as f:
+            self._refresh()
+            timestamp = now_iso()
+            entries = []
+            for operation, key, row in changes:
+                self._seq += 1
+                entries.append(
+                    {
+                        "seq": self._seq,
+                        "table": table,
+                        "op": operation,
+                        "key": key,
+                        "row": row,
+                        "at": timestamp,
+                    }
+                )
+
+            if entries:
+                lines = [
+                    json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries
+                ]
+                if self._size == 0:
+                    lines.insert(0, json.dumps({"floor": self._floor}) + "\n")
+                elif os.fstat(f.fileno()).st_size > self._size:
+                    # Terminate a partially written line so it is skipped
+                    lines.insert(0, "\n")
+                f.writelines(lines)
+                f.flush()
+                self._size = os.fstat(f.fileno()).st_size
+                self._entries.extend(entries)
+                self._seqs.extend(entry["seq"] for entry in entries)
+
+                if len(self._entries) > 2 * config.CHANGE_LOG_RETENTION:
+                    self._truncate()
+
+            return self._seq
+
+    def current_seq(self) -> int:
+        """Get the sequence number of the latest change."""
+        with self._lock, self._file_lock(exclusive=False):
+            self._refresh()
+            return self._seq
+
+    def changes_since(
+        self, since: int, limit: int, tables: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the changes after a sequence number, latest per row.
+
+        Args:
+            since: Sequence number the client has seen
+            limit: Maximum number of log entries to return
+            tables: Only return changes to these tables
+
+        Returns:
+            Dictionary with changes (in sequence order, one per changed
+            row), seq (sequence number to pass as ``since`` next),
+            has_more and reset (the client is behind the floor or ahead of
+            the log and must reload the tables; seq is then the current
+            sequence number)
+        """
+        with self._lock, self._file_lock(exclusive=False):
+            self._refresh()
+            if since < self._floor or since > self._seq:
+                return {
+                    "changes": [],
+                    "seq": self._seq,
+                    "has_more": False,
+                    "reset": True,
+                }
+
+            latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            seq = self._seq
+            count = 0
+            for entry in self._entries[bisect_right(self._seqs, since) :]:
+                if count == limit:
+                    break
+                seq = entry["seq"]
+                if tables is None or entry["table"] in tables:
+                    latest.pop((entry["table"], entry["key"]), None)
+                    latest[(entry["table"], entry["key"])] = entry
+                    count += 1
+            else:
+                seq = self._seq
+
+            return {
+                "changes": list(latest.values()),
+                "seq": seq,
+                "has_more": seq < self._seq,
+                "reset": False,
+            }
+
+    def _path(self) -> Path:
+        """Get the path of the log file."""
+        return config.get_data_path(CHANGE_LOG_FILE)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """
+        Lock the log file currently at the path (no-op on Windows).
+
+        Truncation replaces the file, so a lock acquired on a file that was
+        replaced while waiting is released and retried on the new one.
+
+        Yields:
+            The log file opened for appending
+        """
+        path = self._path()
+        while True:
+            with open(path, "a", encoding="utf-8") as f:
+                if fcntl is None:
+                    yield f
+                    return
+
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                        yield f
+                        return
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """
+        Catch up with the log file (caller holds both locks).
+
+        Entries appended since the last read are added in place; a replaced
+        (truncated) or shrunk file is read again from the start.
+        """
+        path = self._path()
+        stat = os.stat(path)
+        if self._inode == stat.st_ino and self._size == stat.st_size:
+            return
+
+        if self._inode != stat.st_ino or stat.st_size < self._size:
+            self._entries = []
+            self._seqs = []
+            self._floor = 1
+            offset = 0
+        else:
+            offset = self._size
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+
+        # Only consume complete lines
+        data = data[: data.rfind(b"\n") + 1]
+        lines = data.decode("utf-8").splitlines()
+        if offset == 0 and lines:
+            try:
+                self._floor = json.loads(lines[0])["floor"]
+            except (ValueError, KeyError, TypeError):
+                self._floor = None
+            lines = lines[1:]
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Partially written line
+                continue
+            self._entries.append(entry)
+            self._seqs.append(entry["seq"])
+
+        if self._floor is None:
+            self._floor = self._seqs[-1] if self._seqs else 1
+        self._inode = stat.st_ino
+        self._size = offset + len(data)
+        self._seq = max([self._floor] + self._seqs[-1:])
+
+    def _truncate(self):
+        """Drop all but the latest CHANGE_LOG_RETENTION entries (caller holds both locks)."""
+        dropped = len(self._entries) - config.CHANGE_LOG_RETENTION
+        self._floor = self._seqs[dropped - 1]
+        self._entries = self._entries[dropped:]
+        self._seqs = self._seqs[dropped:]
+        self._write(self._entries)
+
+        stat = os.stat(self._path())
+        self._inode = stat.st_ino
+        self._size = stat.st_size
+
+    def _write(self, entries: List[Dict[str, Any]]):
+        """Rewrite the log file atomically (caller holds both locks)."""
+        path = self._path()
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{CHANGE_LOG_FILE}.", suffix=".tmp"
+        )
+
+        try:
+            with os.fdopen(temp_fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"floor": self._floor}) + "\n")
+                f.writelines(
+                    json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries
+                )
+            # Atomic rename
+            shutil.move(temp_path, path)
+        except Exception as e:
+            Path(temp_path).unlink(missing_ok=True)
+            raise e
+
+
+# Singleton instance
+change_log = ChangeLog()
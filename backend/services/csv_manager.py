@@ -1,11 +1,12 @@
-"""CSV file management with atomic writes and file locking."""
+"""CSV file management with atomic writes, file locking and change logging."""
 
 import csv
+import io
 import json
 import tempfile
 import shutil
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import os
 import sys
 from contextlib import contextmanager
@@ -17,6 +18,19 @@ else:
     fcntl = None
 
 from config import config
+from services.change_log import change_log, INSERT, UPDATE, DELETE
+
+
+def _key_field(fieldnames: List[str]) -> str:
+    """Get the field identifying rows of a table ("id", else the first field)."""
+    return "id" if "id" in fieldnames else fieldnames[0]
+
+
+def _row_values(row: Dict[str, Any], fieldnames: List[str]) -> Tuple[str, ...]:
+    """Get a row's values as written to CSV."""
+    return tuple(
+        "" if row.get(field) is None else str(row.get(field)) for field in fieldnames
+    )
 
 
 class CSVManager:
@@ -64,18 +78,94 @@ class CSVManager:
             reader = csv.DictReader(f)
             return list(reader)
 
+    @contextmanager
+    def _exclusive_lock(self, filepath: Path):
+        """
+        Lock the file currently at a path exclusively (no-op on Windows).
+
+        Atomic writes replace the file, so a lock acquired on a file that
+        was replaced while waiting is released and retried on the new one.
+        """
+        while True:
+            with open(filepath, "a", encoding="utf-8", newline="") as f:
+                if fcntl is None:
+                    yield f
+                    return
+
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    if os.fstat(f.fileno()).st_ino == os.stat(filepath).st_ino:
+                        yield f
+                        return
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def _locked_rows(self, filename: str, fieldnames: List[str]):
+        """
+        Hold an exclusive lock on a CSV file and read its rows.
+
+        Yields:
+            Rows as tuples of values in fieldnames order
+        """
+        filepath = config.get_data_path(filename)
+
+        if not filepath.exists():
+            self.write_csv(filename, [], fieldnames)
+
+        with self._exclusive_lock(filepath):
+            yield self._read_values(filepath, fieldnames)
+
+    @contextmanager
+    def edit_csv(self, filename: str, fieldnames: List[str]):
+        """
+        Read-modify-write a CSV file under an exclusive lock.
+
+        Yields the rows for the caller to modify in place. They are written
+        back with one atomic rename when the block exits without an error;
+        appends and other edits wait until then. The changes are recorded
+        against the rows read under the lock.
+
+        Args:
+            filename: Name of the CSV file
+            fieldnames: List of field names for CSV header
+        """
+        with self._locked_rows(filename, fieldnames) as previous:
+            rows = [dict(zip(fieldnames, values)) for values in previous]
+            yield rows
+
+            values = [_row_values(row, fieldnames) for row in rows]
+            self._replace(filename, fieldnames, values)
+            self._record_rewrite(filename, previous, values, fieldnames)
+
     def write_csv(
         self, filename: str, data: List[Dict[str, Any]], fieldnames: List[str]
     ) -> None:
         """
         Write data to CSV file atomically.
 
+        The rows replaced are read and the changes recorded under the same
+        exclusive lock as the rename, so the recorded changes match what was
+        overwritten and are numbered in write order.
+
         Args:
             filename: Name of the CSV file
             data: List of dictionaries to write
             fieldnames: List of field names for CSV header
         """
         filepath = config.get_data_path(filename)
+        values = [_row_values(row, fieldnames) for row in data]
+
+        with self._exclusive_lock(filepath):
+            previous = self._read_values(filepath, fieldnames)
+            self._replace(filename, fieldnames, values)
+            self._record_rewrite(filename, previous, values, fieldnames)
+
+    def _replace(
+        self, filename: str, fieldnames: List[str], values: List[Tuple[str, ...]]
+    ) -> None:
+        """Replace a CSV file with rows of values through an atomic rename."""
+        filepath = config.get_data_path(filename)
 
         # Create temporary file in the same directory
         temp_fd, temp_path = tempfile.mkstemp(
@@ -84,9 +174,9 @@ class CSVManager:
 
         try:
             with os.fdopen(temp_fd, "w", encoding="utf-8", newline="") as temp_file:
-                writer = csv.DictWriter(temp_file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(data)
+                writer = csv.writer(temp_file)
+                writer.writerow(fieldnames)
+                writer.writerows(values)
 
             # Atomic rename
             shutil.move(temp_path, filepath)
@@ -95,6 +185,53 @@ class CSVManager:
             Path(temp_path).unlink(missing_ok=True)
             raise e
 
+    def _read_values(self, filepath: Path, fieldnames: List[str]) -> List[Tuple]:
+        """
+        Read the rows of a CSV file (caller holds the lock, empty if missing).
+
+        Returns:
+            Rows as tuples of values in fieldnames order
+        """
+        try:
+            with open(filepath, "r", encoding="utf-8", newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                if header == fieldnames:
+                    return [tuple(row) for row in reader if row]
+                return [
+                    _row_values(dict(zip(header, row)), fieldnames)
+                    for row in reader
+                    if row
+                ]
+        except FileNotFoundError:
+            return []
+
+    def _record_rewrite(
+        self,
+        filename: str,
+        previous: List[Tuple],
+        values: List[Tuple],
+        fieldnames: List[str],
+    ) -> None:
+        """
+        Record the rows a rewrite inserted, updated and deleted in the change log.
+
+        Rows are matched by key and compared by the values written, so
+        unchanged rows are not recorded.
+        """
+        key_index = fieldnames.index(_key_field(fieldnames))
+        previous_rows = {row[key_index]: row for row in previous}
+
+        changes = []
+        for row in values:
+            old = previous_rows.pop(row[key_index], None)
+            if old != row:
+                operation = INSERT if old is None else UPDATE
+                changes.append((operation, row[key_index], dict(zip(fieldnames, row))))
+
+        changes.extend((DELETE, key, None) for key in previous_rows)
+        change_log.record(Path(filename).stem, changes)
+
     def append_csv(
         self, filename: str, row: Dict[str, Any], fieldnames: List[str]
     ) -> None:
@@ -113,9 +250,15 @@ class CSVManager:
             self.write_csv(filename, [row], fieldnames)
             return
 
-        with self._file_lock(filepath, "a") as f:
+        values = dict(zip(fieldnames, _row_values(row, fieldnames)))
+
+        with self._exclusive_lock(filepath) as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writerow(row)
+            f.flush()
+            change_log.record(
+                Path(filename).stem, [(INSERT, values[_key_field(fieldnames)], values)]
+            )
 
     def read_json(self, filename: str) -> Dict[str, Any]:
         """
@@ -181,19 +324,32 @@ class CSVManager:
         Returns:
             True if row was found and updated, False otherwise
         """
-        data = self.read_csv(filename)
-        found = False
-
-        for i, row in enumerate(data):
-            if row.get(id_field) == row_id:
-                data[i] = updated_row
-                found = True
-                break
-
-        if found:
-            self.write_csv(filename, data, fieldnames)
-
-        return found
+        id_index = fieldnames.index(id_field)
+        key_index = fieldnames.index(_key_field(fieldnames))
+
+        with self._locked_rows(filename, fieldnames) as rows:
+            for i, old in enumerate(rows):
+                if old[id_index] == row_id:
+                    break
+            else:
+                return False
+
+            new = _row_values(updated_row, fieldnames)
+            if new == old:
+                return True
+            rows[i] = new
+            self._replace(filename, fieldnames, rows)
+
+            if new[key_index] == old[key_index]:
+                changes = [(UPDATE, new[key_index], dict(zip(fieldnames, new)))]
+            else:
+                changes = [
+                    (DELETE, old[key_index], None),
+                    (INSERT, new[key_index], dict(zip(fieldnames, new))),
+                ]
+            change_log.record(Path(filename).stem, changes)
+
+        return True
 
     def delete_csv_row(
         self, filename: str, row_id: str, fieldnames: List[str], id_field: str = "id"
@@ -210,16 +366,24 @@ class CSVManager:
         Returns:
             True if row was found and deleted, False otherwise
         """
-        data = self.read_csv(filename)
-        original_length = len(data)
-
-        data = [row for row in data if row.get(id_field) != row_id]
-
-        if len(data) < original_length:
-            self.write_csv(filename, data, fieldnames)
-            return True
-
-        return False
+        id_index = fieldnames.index(id_field)
+        key_index = fieldnames.index(_key_field(fieldnames))
+
+        with self._locked_rows(filename, fieldnames) as rows:
+            remaining = [row for row in rows if row[id_index] != row_id]
+            if len(remaining) == len(rows):
+                return False
+            self._replace(filename, fieldnames, remaining)
+            change_log.record(
+                Path(filename).stem,
+                [
+                    (DELETE, row[key_index], None)
+                    for row in rows
+                    if row[id_index] == row_id
+                ],
+            )
+
+        return True
 
     def read_by_id(
         self, filename: str, row_id: str, id_field: str = "id"
@@ -241,6 +405,91 @@ class CSVManager:
                 return row
         return None
 
+    def get_file_version(self, filename: str) -> str:
+        """
+        Get a version token for a data file that changes whenever it is written.
+
+        Args:
+            filename: Name of the data file
+
+        Returns:
+            Version string (empty if the file doesn't exist)
+        """
+        filepath = config.get_data_path(filename)
+
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
+            return ""
+
+        return f"{stat.st_ino}-{stat.st_mtime_ns}-{stat.st_size}"
+
+    def read_csv_since(
+        self, filename: str, cursor: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any], bool]:
+        """
+        Read the rows appended to a CSV file since a cursor.
+
+        Appends keep the file in place, while rewrites (updates, deletes)
+        replace it through an atomic rename. The cursor records the file
+        inode, the byte offset read up to and the bytes just before it, so a
+        rewritten file is detected and read from the start instead.
+
+        Args:
+            filename: Name of the CSV file
+            cursor: Cursor returned by a previous call (None reads everything)
+
+        Returns:
+            Tuple of (rows, new cursor, is_continuation). is_continuation is
+            False when all rows were read from the start of the file.
+        """
+        filepath = config.get_data_path(filename)
+
+        if not filepath.exists():
+            return [], {"inode": 0, "offset": 0, "tail": ""}, False
+
+        with open(filepath, "rb") as f:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+
+                inode = os.fstat(f.fileno()).st_ino
+                header = f.readline()
+
+                continuation = False
+                if cursor and cursor.get("inode") == inode:
+                    offset = cursor.get("offset", 0)
+                    tail = bytes.fromhex(cursor.get("tail", ""))
+                    if offset >= len(header) and offset >= len(tail):
+                        f.seek(offset - len(tail))
+                        continuation = f.read(len(tail)) == tail
+
+                start = cursor["offset"] if continuation else len(header)
+                f.seek(start)
+                data = f.read()
+
+                # Only consume complete lines
+                data = data[: data.rfind(b"\n") + 1]
+                offset = start + len(data)
+                f.seek(max(0, offset - 32))
+                tail = f.read(offset - max(0, offset - 32))
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+        fieldnames = next(csv.reader([header.decode("utf-8")]), [])
+        rows = list(
+            csv.DictReader(
+                io.StringIO(data.decode("utf-8"), newline=""), fieldnames=fieldnames
+            )
+        )
+
+        return (
+            rows,
+            {"inode": inode, "offset": offset, "tail": tail.hex()},
+            continuation,
+        )
+
     def append(self, filename: str, row: Dict[str, Any]) -> None:
         """
         Append a row to CSV file (auto-detects fieldnames from file).
@@ -1,6 +1,6 @@
 """Currency and exchange rate management service."""
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Optional, Tuple
 from datetime import date as date_type, datetime
 from fastapi import HTTPException
 
@@ -217,6 +217,73 @@ class CurrencyService:
         rates.sort(key=lambda r: r.date, reverse=True)
         return rates[0]
 
+    def get_latest_rates(
+        self, from_currencies: Iterable[str], to_currency: str
+    ) -> Dict[str, float]:
+        """
+        Get the latest exchange rate from several currencies to one currency.
+
+        Reads exchange_rates.csv once for all currencies.
+
+        Args:
+            from_currencies: Source currency codes
+            to_currency: Target currency code
+
+        Returns:
+            Dictionary mapping source currency to rate (currencies without a
+            rate are omitted; the target currency maps to 1.0)
+        """
+        to_currency = to_currency.upper()
+        wanted = {code.upper() for code in from_currencies}
+        latest: Dict[str, tuple] = {}
+
+        if to_currency in wanted:
+            latest[to_currency] = ("9999-12-31", 1.0)
+
+        for rate in csv_manager.read_csv("exchange_rates.csv"):
+            from_code = rate.get("from_currency", "").upper()
+            if from_code not in wanted or from_code == to_currency:
+                continue
+            if rate.get("to_currency", "").upper() != to_currency:
+                continue
+
+            rate_date = rate.get("date", "")
+            if from_code not in latest or rate_date > latest[from_code][0]:
+                latest[from_code] = (rate_date, float(rate.get("rate", 0)))
+
+        return {code: value for code, (_, value) in latest.items()}
+
+    def get_rates_on_dates(
+        self, pairs: Iterable[Tuple[str, str]], to_currency: str
+    ) -> Dict[Tuple[str, str], float]:
+        """
+        Get the exchange rates to one currency on specific dates.
+
+        Reads exchange_rates.csv once for all pairs. Like convert_currency
+        with a date, the first rate recorded for that exact date is used.
+
+        Args:
+            pairs: (source currency code, date as YYYY-MM-DD) pairs
+            to_currency: Target currency code
+
+        Returns:
+            Dictionary mapping (source currency, date) to rate, with
+            currencies upper-cased (pairs without a rate are omitted)
+        """
+        to_currency = to_currency.upper()
+        wanted = {(code.upper(), rate_date) for code, rate_date in pairs}
+        rates: Dict[Tuple[str, str], float] = {}
+
+        for rate in csv_manager.read_csv("exchange_rates.csv"):
+            if rate.get("to_currency", "").upper() != to_currency:
+                continue
+
+            key = (rate.get("from_currency", "").upper(), rate.get("date", ""))
+            if key in wanted and key not in rates:
+                rates[key] = float(rate.get("rate", 0))
+
+        return rates
+
     def create_exchange_rate(self, rate_data: ExchangeRateCreate) -> ExchangeRate:
         """
         Create a new exchange rate.
@@ -1,7 +1,13 @@
 """Debt management service with payoff calculators."""
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from services.amortization import (
+    MAX_MONTHS,
+    avalanche_order,
+    simulate_payoff,
+    snowball_order,
+)
 from services.csv_manager import csv_manager
 
 
@@ -13,6 +19,10 @@ class DebtService:
         self.debts: List[Dict] = []
         self._load_debts()
 
+        # Extra-payment sweep results, valid for one version of debts.csv
+        self._sweep_cache: Dict[Tuple[float, ...], Dict] = {}
+        self._sweep_cache_version: Optional[str] = None
+
     def _load_debts(self):
         """Load debts from CSV."""
         try:
@@ -46,20 +56,11 @@ class DebtService:
         total_minimum = self.get_minimum_payment()
         return (total_minimum / monthly_income) * 100
 
-    def calculate_avalanche_plan(self, extra_payment: float = 0) -> Dict:
-        """
-        Calculate debt payoff using Avalanche method (highest interest first).
-
-        Args:
-            extra_payment: Extra amount to pay beyond minimums each month
-
-        Returns:
-            Payoff plan with timeline and total interest
-        """
+    def _get_active_debts(self) -> List[Dict]:
+        """Load debts with an outstanding balance."""
         self._load_debts()
 
-        # Filter active debts and sort by interest rate (highest first)
-        active_debts = [
+        return [
             {
                 "id": d["id"],
                 "name": d["name"],
@@ -71,20 +72,23 @@ class DebtService:
             if float(d["current_balance"]) > 0
         ]
 
-        if not active_debts:
-            return {
-                "method": "avalanche",
-                "total_months": 0,
-                "total_interest": 0,
-                "total_paid": 0,
-                "debts": [],
-                "monthly_schedule": [],
-            }
+    def _strategy_order(self, debts: List[Dict], method: str) -> List[int]:
+        """Get debt indices in payoff priority order for a strategy."""
+        if method == "avalanche":
+            return avalanche_order([d["interest_rate"] for d in debts])
+        return snowball_order([d["balance"] for d in debts])
 
-        # Sort by interest rate (highest first)
-        active_debts.sort(key=lambda x: x["interest_rate"], reverse=True)
+    def calculate_avalanche_plan(self, extra_payment: float = 0) -> Dict:
+        """
+        Calculate debt payoff using Avalanche method (highest interest first).
 
-        return self._calculate_payoff_schedule(active_debts, extra_payment, "avalanche")
+        Args:
+            extra_payment: Extra amount to pay beyond minimums each month
+
+        Returns:
+            Payoff plan with timeline and total interest
+        """
+        return self.calculate_plans([("avalanche", extra_payment)])[0]
 
     def calculate_snowball_plan(self, extra_payment: float = 0) -> Dict:
         """
@@ -96,35 +100,46 @@ class DebtService:
         Returns:
             Payoff plan with timeline and total interest
         """
-        self._load_debts()
+        return self.calculate_plans([("snowball", extra_payment)])[0]
 
-        # Filter active debts and sort by balance (smallest first)
-        active_debts = [
-            {
-                "id": d["id"],
-                "name": d["name"],
-                "balance": float(d["current_balance"]),
-                "interest_rate": float(d["interest_rate"]),
-                "minimum_payment": float(d["minimum_payment"]),
-            }
-            for d in self.debts
-            if float(d["current_balance"]) > 0
-        ]
+    def calculate_plans(
+        self, scenarios: List[Tuple[str, float]], schedule_months: int = 12
+    ) -> List[Dict]:
+        """
+        Calculate payoff plans for several (method, extra_payment) scenarios.
 
-        if not active_debts:
-            return {
-                "method": "snowball",
-                "total_months": 0,
-                "total_interest": 0,
-                "total_paid": 0,
-                "debts": [],
-                "monthly_schedule": [],
-            }
+        All scenarios are simulated together in one array-based run.
 
-        # Sort by balance (smallest first)
-        active_debts.sort(key=lambda x: x["balance"])
+        Args:
+            scenarios: List of ('avalanche' | 'snowball', extra_payment) pairs
+            schedule_months: Number of leading months to include in each schedule
 
-        return self._calculate_payoff_schedule(active_debts, extra_payment, "snowball")
+        Returns:
+            One payoff plan per scenario, in the same order
+        """
+        active_debts = self._get_active_debts()
+
+        if not active_debts:
+            return [
+                {
+                    "method": method,
+                    "total_months": 0,
+                    "total_interest": 0,
+                    "total_paid": 0,
+                    "debts": [],
+                    "monthly_schedule": [],
+                }
+                for method, _ in scenarios
+            ]
+
+        orders = [self._strategy_order(active_debts, method) for method, _ in scenarios]
+        return self._calculate_payoff_schedules(
+            active_debts,
+            orders,
+            [extra for _, extra in scenarios],
+            [method for method, _ in scenarios],
+            schedule_months,
+        )
 
     def _calculate_payoff_schedule(
         self, debts: List[Dict], extra_payment: float, method: str
@@ -140,122 +155,114 @@ class DebtService:
         Returns:
             Detailed payoff plan
         """
-        # Create working copy of debts
-        working_debts = [d.copy() for d in debts]
-
-        total_interest = 0
-        total_paid = 0
-        month = 0
-        monthly_schedule = []
-        debt_payoff_months = {}
-
-        # Calculate until all debts are paid
-        while any(d["balance"] > 0 for d in working_debts):
-            month += 1
-
-            # Safety check to prevent infinite loops
-            if month > 600:  # 50 years max
-                break
-
-            month_payment = 0
-            month_interest = 0
-
-            # Calculate interest and minimum payments for all debts
-            for debt in working_debts:
-                if debt["balance"] > 0:
-                    # Calculate monthly interest
-                    monthly_rate = debt["interest_rate"] / 100 / 12
-                    interest = debt["balance"] * monthly_rate
-                    month_interest += interest
-                    total_interest += interest
-
-                    # Add interest to balance
-                    debt["balance"] += interest
-
-            # Distribute payments
-            available_payment = (
-                sum(d["minimum_payment"] for d in working_debts if d["balance"] > 0)
-                + extra_payment
-            )
+        return self._calculate_payoff_schedules(
+            debts, [list(range(len(debts)))], [extra_payment], [method]
+        )[0]
+
+    def _calculate_payoff_schedules(
+        self,
+        debts: List[Dict],
+        orders: List[List[int]],
+        extra_payments: List[float],
+        methods: List[str],
+        schedule_months: int = 12,
+    ) -> List[Dict]:
+        """
+        Simulate payoff scenarios and build their plans.
 
-            # Pay minimums on all debts except the priority one
-            for i, debt in enumerate(working_debts):
-                if debt["balance"] > 0:
-                    if i == 0:  # Priority debt gets extra payment
-                        payment = min(debt["balance"], available_payment)
-                    else:
-                        payment = min(debt["balance"], debt["minimum_payment"])
-                        available_payment -= payment
-
-                    debt["balance"] -= payment
-                    month_payment += payment
-                    total_paid += payment
-
-                    # Record when debt is paid off
-                    if debt["balance"] <= 0:
-                        debt["balance"] = 0
-                        if debt["id"] not in debt_payoff_months:
-                            debt_payoff_months[debt["id"]] = month
-                        # Redistribute this debt's minimum to priority debt
-                        available_payment += debt["minimum_payment"]
-
-            # Record monthly snapshot
-            monthly_schedule.append(
-                {
-                    "month": month,
-                    "payment": round(month_payment, 2),
-                    "interest": round(month_interest, 2),
-                    "remaining_balance": round(
-                        sum(d["balance"] for d in working_debts), 2
-                    ),
-                    "debts": [
-                        {
-                            "id": d["id"],
-                            "name": d["name"],
-                            "balance": round(d["balance"], 2),
-                        }
-                        for d in working_debts
-                    ],
-                }
-            )
+        Only the first ``schedule_months`` monthly snapshots are materialized.
 
-            # Remove paid-off debts from priority queue
-            working_debts = [d for d in working_debts if d["balance"] > 0]
+        Args:
+            debts: List of debts
+            orders: Priority order (indices into debts) per scenario
+            extra_payments: Extra monthly payment per scenario
+            methods: Method label per scenario
+            schedule_months: Number of leading months to include in each schedule
 
-        # Build debt summary
-        debt_summary = []
-        for debt in debts:
-            payoff_month = debt_payoff_months.get(debt["id"], 0)
-            debt_summary.append(
+        Returns:
+            Detailed payoff plan per scenario
+        """
+        result = simulate_payoff(
+            [d["balance"] for d in debts],
+            [d["interest_rate"] for d in debts],
+            [d["minimum_payment"] for d in debts],
+            orders,
+            extra_payments,
+            snapshot_months=schedule_months,
+        )
+
+        today = datetime.now()
+        plans = []
+
+        for s, (order, method) in enumerate(zip(orders, methods)):
+            month = int(result["total_months"][s])
+
+            # Build debt summary
+            debt_summary = []
+            for i in order:
+                debt = debts[i]
+                payoff_month = int(result["payoff_month"][s, i])
+                debt_summary.append(
+                    {
+                        "id": debt["id"],
+                        "name": debt["name"],
+                        "original_balance": debt["balance"],
+                        "interest_rate": debt["interest_rate"],
+                        "payoff_month": payoff_month,
+                        "payoff_date": (
+                            (today + timedelta(days=30 * payoff_month)).strftime(
+                                "%Y-%m-%d"
+                            )
+                            if payoff_month > 0
+                            else None
+                        ),
+                    }
+                )
+
+            # Materialize snapshots for the requested months only
+            monthly_schedule = []
+            for idx in range(min(schedule_months, month, MAX_MONTHS)):
+                monthly_schedule.append(
+                    {
+                        "month": idx + 1,
+                        "payment": round(float(result["snapshot_payment"][s, idx]), 2),
+                        "interest": round(
+                            float(result["snapshot_interest"][s, idx]), 2
+                        ),
+                        "remaining_balance": round(
+                            float(result["snapshot_remaining"][s, idx]), 2
+                        ),
+                        "debts": [
+                            {
+                                "id": debts[i]["id"],
+                                "name": debts[i]["name"],
+                                "balance": round(
+                                    float(result["snapshot_balance"][s, idx, j]), 2
+                                ),
+                            }
+                            for j, i in enumerate(order)
+                            if result["snapshot_active"][s, idx, j]
+                        ],
+                    }
+                )
+
+            plans.append(
                 {
-                    "id": debt["id"],
-                    "name": debt["name"],
-                    "original_balance": debt["balance"],
-                    "interest_rate": debt["interest_rate"],
-                    "payoff_month": payoff_month,
+                    "method": method,
+                    "total_months": month,
+                    "total_interest": round(float(result["total_interest"][s]), 2),
+                    "total_paid": round(float(result["total_paid"][s]), 2),
                     "payoff_date": (
-                        (datetime.now() + timedelta(days=30 * payoff_month)).strftime(
-                            "%Y-%m-%d"
-                        )
-                        if payoff_month > 0
+                        (today + timedelta(days=30 * month)).strftime("%Y-%m-%d")
+                        if month > 0
                         else None
                     ),
+                    "debts": debt_summary,
+                    "monthly_schedule": monthly_schedule,
                 }
             )
 
-        return {
-            "method": method,
-            "total_months": month,
-            "total_interest": round(total_interest, 2),
-            "total_paid": round(total_paid, 2),
-            "payoff_date": (
-                (datetime.now() + timedelta(days=30 * month)).strftime("%Y-%m-%d")
-                if month > 0
-                else None
-            ),
-            "debts": debt_summary,
-            "monthly_schedule": monthly_schedule[:12],  # Return first year for preview
-        }
+        return plans
 
     def compare_strategies(self, extra_payment: float = 0) -> Dict:
         """
@@ -267,8 +274,9 @@ class DebtService:
         Returns:
             Comparison of both strategies
         """
-        avalanche = self.calculate_avalanche_plan(extra_payment)
-        snowball = self.calculate_snowball_plan(extra_payment)
+        avalanche, snowball = self.calculate_plans(
+            [("avalanche", extra_payment), ("snowball", extra_payment)]
+        )
 
         # Calculate savings
         interest_savings = snowball["total_interest"] - avalanche["total_interest"]
@@ -284,6 +292,82 @@ class DebtService:
             },
         }
 
+    def calculate_extra_payment_sweep(self, extra_payments: List[float]) -> Dict:
+        """
+        Evaluate both strategies across a grid of extra payments.
+
+        Every (strategy, extra_payment) scenario plus the no-extra baseline is
+        simulated in a single batched run. Results are cached until debts.csv
+        changes.
+
+        Args:
+            extra_payments: Extra monthly payment values to evaluate
+
+        Returns:
+            Baseline totals and one point per extra payment with months and
+            interest saved for each strategy
+        """
+        version = csv_manager.get_file_version("debts.csv")
+        if version != self._sweep_cache_version:
+            self._sweep_cache = {}
+            self._sweep_cache_version = version
+
+        key = tuple(extra_payments)
+        if key in self._sweep_cache:
+            return self._sweep_cache[key]
+
+        active_debts = self._get_active_debts()
+        methods = ["avalanche", "snowball"]
+        grid = [0.0] + list(extra_payments)
+
+        if active_debts:
+            orders = [
+                self._strategy_order(active_debts, method)
+                for method in methods
+                for _ in grid
+            ]
+            result = simulate_payoff(
+                [d["balance"] for d in active_debts],
+                [d["interest_rate"] for d in active_debts],
+                [d["minimum_payment"] for d in active_debts],
+                orders,
+                grid * len(methods),
+                snapshot_months=0,
+            )
+            months = result["total_months"].reshape(len(methods), len(grid))
+            interest = result["total_interest"].reshape(len(methods), len(grid))
+        else:
+            months = [[0] * len(grid) for _ in methods]
+            interest = [[0.0] * len(grid) for _ in methods]
+
+        baseline = {
+            method: {
+                "total_months": int(months[m][0]),
+                "total_interest": round(float(interest[m][0]), 2),
+            }
+            for m, method in enumerate(methods)
+        }
+
+        points = []
+        for g, extra in enumerate(extra_payments, start=1):
+            point = {"extra_payment": extra}
+            for m, method in enumerate(methods):
+                point[method] = {
+                    "total_months": int(months[m][g]),
+                    "total_interest": round(float(interest[m][g]), 2),
+                    "months_saved": int(months[m][0] - months[m][g]),
+                    "interest_saved": round(float(interest[m][0] - interest[m][g]), 2),
+                }
+            points.append(point)
+
+        sweep = {
+            "debt_count": len(active_debts),
+            "baseline": baseline,
+            "points": points,
+        }
+        self._sweep_cache[key] = sweep
+        return sweep
+
 
 # Global debt service instance
 debt_service = DebtService()
@@ -0,0 +1,285 @@
+"""Pre-aggregated cubes for drill-down analytics."""
+
+import threading
+from datetime import date as date_type
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from services.analytics_frame import TransactionFrame, analytics_frame_service
+from services.csv_manager import csv_manager
+
+# Drill-down dimensions and the dimension each one drills into
+CHILD_DIMENSIONS = {
+    "group": "category",
+    "category": "merchant",
+    "merchant": None,
+    "account": None,
+    "tag": None,
+}
+
+# Dimensions whose items belong to a parent (parent_id is its ID)
+PARENT_DIMENSIONS = {"category": "group", "merchant": "category"}
+
+
+class DimensionCube:
+    """
+    Daily aggregates of one dimension.
+
+    Cells hold income, expenses and transaction counts per (day, item,
+    parent item), sorted by day, so a date slice is two binary searches
+    and a drill-down is a bincount over the cells of that slice.
+    """
+
+    def __init__(
+        self,
+        ordinals: np.ndarray,
+        codes: np.ndarray,
+        parents: np.ndarray,
+        income: np.ndarray,
+        expenses: np.ndarray,
+        ids: List[str],
+        names: List[str],
+        parent_ids: List[str],
+    ):
+        """
+        Aggregate rows into cells.
+
+        Args:
+            ordinals: Date ordinal per row
+            codes: Item code per row (index into ids)
+            parents: Parent code per row (index into parent_ids, -1 for none)
+            income: Base currency income per row (0 for other rows)
+            expenses: Base currency expenses per row (0 for other rows)
+            ids: Item IDs by code
+            names: Item display names by code
+            parent_ids: Parent IDs by code
+        """
+        self.ids = ids
+        self.names = names
+        self.parent_ids = parent_ids
+
+        first_day = int(ordinals.min()) if len(ordinals) else 0
+        n_codes = max(len(ids), 1)
+        n_parents = len(parent_ids) + 1
+        days = ordinals.astype(np.int64) - first_day
+        keys = (days * n_codes + codes) * n_parents + parents + 1
+        keys, cells = np.unique(keys, return_inverse=True)
+
+        self.parents = keys % n_parents - 1
+        self.codes = keys // n_parents % n_codes
+        self.days = keys // n_parents // n_codes + first_day
+        self.income = np.bincount(cells, weights=income, minlength=len(keys))
+        self.expenses = np.bincount(cells, weights=expenses, minlength=len(keys))
+        self.counts = np.bincount(cells, minlength=len(keys))
+
+    def roll_up(
+        self,
+        start_date: Optional[date_type],
+        end_date: Optional[date_type],
+        parent_id: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Sum the cells of a date range (and parent) per item.
+
+        Args:
+            start_date: Earliest date (inclusive)
+            end_date: Latest date (inclusive)
+            parent_id: Only items under this parent
+
+        Returns:
+            Items with income, expenses and transaction counts, by code
+        """
+        low = np.searchsorted(self.days, start_date.toordinal()) if start_date else 0
+        high = (
+            np.searchsorted(self.days, end_date.toordinal(), side="right")
+            if end_date
+            else len(self.days)
+        )
+        cells = slice(low, max(low, high))
+        codes = self.codes[cells]
+        income = self.income[cells]
+        expenses = self.expenses[cells]
+        counts = self.counts[cells]
+
+        if parent_id is not None:
+            if parent_id not in self.parent_ids:
+                return []
+            selected = self.parents[cells] == self.parent_ids.index(parent_id)
+            codes = codes[selected]
+            income = income[selected]
+            expenses = expenses[selected]
+            counts = counts[selected]
+
+        size = len(self.ids)
+        totals = np.bincount(codes, weights=expenses, minlength=size)
+        incomes = np.bincount(codes, weights=income, minlength=size)
+        numbers = np.bincount(codes, weights=counts, minlength=size)
+
+        return [
+            {
+                "id": self.ids[code],
+                "name": self.names[code],
+                "expenses": float(totals[code]),
+                "income": float(incomes[code]),
+                "transaction_count": int(numbers[code]),
+            }
+            for code in np.flatnonzero(numbers)
+        ]
+
+
+class DrillDownCube:
+    """
+    Dimension cubes (group, category, merchant, account, tag) over a frame.
+
+    Rows without an exchange rate to the base currency on their date are
+    kept out of the cubes; their date ordinals are kept sorted so a slice
+    reports how many of its transactions were left out.
+    """
+
+    def __init__(
+        self,
+        frame: TransactionFrame,
+        base_currency: str,
+        categories: List[Dict[str, Any]],
+        accounts: List[Dict[str, Any]],
+    ):
+        """Build every dimension cube from the transaction frame."""
+        self.frame = frame
+        self.dimensions: Dict[str, DimensionCube] = {}
+
+        dated = frame.ordinals >= 0
+        amounts, missing = frame.convert(base_currency, dated)
+        self.unconverted = np.sort(frame.ordinals[missing])
+        dated &= ~missing
+        income = np.where(frame.type_mask("income"), amounts, 0.0)
+        expenses = np.where(frame.type_mask("expense"), amounts, 0.0)
+
+        category_names = {cat["id"]: cat.get("name", "") for cat in categories}
+        category_groups = {cat["id"]: cat.get("group") or "other" for cat in categories}
+        account_names = {acc["id"]: acc.get("name", "") for acc in accounts}
+
+        # Category groups, by category code
+        groups: Dict[str, int] = {}
+        group_codes = np.array(
+            [
+                groups.setdefault(
+                    category_groups.get(category_id, "other"), len(groups)
+                )
+                for category_id in frame.category_ids
+            ],
+            dtype=np.int64,
+        )
+        group_ids = list(groups)
+        rows = np.flatnonzero(dated)
+        no_parent = np.full(len(rows), -1)
+
+        self.dimensions["group"] = DimensionCube(
+            frame.ordinals[rows],
+            group_codes[frame.categories[rows]],
+            no_parent,
+            income[rows],
+            expenses[rows],
+            group_ids,
+            [group.title() for group in group_ids],
+            [],
+        )
+        self.dimensions["category"] = DimensionCube(
+            frame.ordinals[rows],
+            frame.categories[rows],
+            group_codes[frame.categories[rows]],
+            income[rows],
+            expenses[rows],
+            frame.category_ids,
+            [category_names.get(cat_id, "Unknown") for cat_id in frame.category_ids],
+            group_ids,
+        )
+        self.dimensions["merchant"] = DimensionCube(
+            frame.ordinals[rows],
+            frame.merchants[rows],
+            frame.categories[rows],
+            income[rows],
+            expenses[rows],
+            frame.merchant_names,
+            [name or "Unknown" for name in frame.merchant_names],
+            frame.category_ids,
+        )
+        self.dimensions["account"] = DimensionCube(
+            frame.ordinals[rows],
+            frame.accounts[rows],
+            no_parent,
+            income[rows],
+            expenses[rows],
+            frame.account_ids,
+            [account_names.get(acc_id, "Unknown") for acc_id in frame.account_ids],
+            [],
+        )
+
+        tag_rows = frame.tag_rows[dated[frame.tag_rows]]
+        tag_codes = frame.tags[dated[frame.tag_rows]]
+        self.dimensions["tag"] = DimensionCube(
+            frame.ordinals[tag_rows],
+            tag_codes,
+            np.full(len(tag_rows), -1),
+            income[tag_rows],
+            expenses[tag_rows],
+            frame.tag_names,
+            frame.tag_names,
+            [],
+        )
+
+    def unconverted_count(
+        self, start_date: Optional[date_type], end_date: Optional[date_type]
+    ) -> int:
+        """Get the number of transactions in a date range left out for lack of a rate."""
+        low = (
+            np.searchsorted(self.unconverted, start_date.toordinal())
+            if start_date
+            else 0
+        )
+        high = (
+            np.searchsorted(self.unconverted, end_date.toordinal(), side="right")
+            if end_date
+            else len(self.unconverted)
+        )
+        return int(max(high - low, 0))
+
+
+class DrillDownCubeService:
+    """
+    Keeps drill-down cubes in step with their inputs.
+
+    A cube is built per base currency and rebuilt when the transaction
+    frame, categories, accounts or exchange rates change.
+    """
+
+    def __init__(self):
+        """Initialize drill-down cube service."""
+        self._lock = threading.Lock()
+        self._cubes: Dict[str, Tuple[Tuple, DrillDownCube]] = {}
+
+    def get_cube(self, base_currency: str) -> DrillDownCube:
+        """Get the drill-down cube for a base currency."""
+        frame = analytics_frame_service.get_frame()
+
+        with self._lock:
+            versions = (
+                csv_manager.get_file_version("categories.csv"),
+                csv_manager.get_file_version("accounts.csv"),
+                csv_manager.get_file_version("exchange_rates.csv"),
+            )
+            cached = self._cubes.get(base_currency)
+            if cached is None or cached[0] != versions or cached[1].frame is not frame:
+                cube = DrillDownCube(
+                    frame,
+                    base_currency,
+                    csv_manager.read_csv("categories.csv"),
+                    csv_manager.read_csv("accounts.csv"),
+                )
+                self._cubes[base_currency] = (versions, cube)
+
+            return self._cubes[base_currency][1]
+
+
+# Singleton instance
+drilldown_cube_service = DrillDownCubeService()
@@ -1,20 +1,117 @@
 """Excel and CSV export service."""
 
+import io
 import os
 import csv
+import queue
+import threading
+from copy import copy
 from datetime import datetime, date as date_type
-from typing import List, Optional
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 
 from models.export import ExportConfig
-from services.csv_manager import csv_manager
+from models.transaction import TransactionFilter
 from services.calculator import calculator
 from services.debt_service import debt_service
 from services.portfolio_service import portfolio_service
+from services.transaction_query_service import transaction_query_service
 from utils.dates import get_current_month
 
+# Data rows sampled to size columns of streamed worksheets
+WIDTH_SAMPLE_ROWS = 500
+
+# Maximum column width (in characters)
+MAX_COLUMN_WIDTH = 50
+
+# Rows encoded per chunk of a streamed CSV
+CSV_CHUNK_ROWS = 500
+
+# Chunk size (in bytes) of streamed binary exports
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Chunks buffered between a workbook being saved and the response reading it
+PIPE_CHUNKS = 4
+
+# Rows written between progress reports
+PROGRESS_ROWS = 1000
+
+
+def _with_progress(
+    rows: Iterable, total: int, progress: Optional[Callable[[float], None]]
+) -> Iterator:
+    """Yield rows, reporting the fraction of total yielded every PROGRESS_ROWS rows."""
+    for index, row in enumerate(rows, start=1):
+        yield row
+        if progress and index % PROGRESS_ROWS == 0:
+            progress(min(index / total, 1.0))
+
+
+class _ChunkPipe(io.RawIOBase):
+    """
+    Unseekable file that hands bytes written to it to a reader in chunks.
+
+    The writer blocks once PIPE_CHUNKS chunks are waiting, so a slow reader
+    holds back the writer instead of the output piling up in memory. Writes
+    fail once the reader has gone away.
+    """
+
+    def __init__(self):
+        """Initialize an empty pipe."""
+        super().__init__()
+        self._chunks: queue.Queue = queue.Queue(maxsize=PIPE_CHUNKS)
+        self._buffer = bytearray()
+        self._cancelled = threading.Event()
+
+    def writable(self) -> bool:
+        """Pipes are write-only."""
+        return True
+
+    def write(self, data) -> int:
+        """Buffer data, passing on every full STREAM_CHUNK_SIZE chunk."""
+        self._buffer += data
+        while len(self._buffer) >= STREAM_CHUNK_SIZE:
+            if not self._put(bytes(self._buffer[:STREAM_CHUNK_SIZE])):
+                raise OSError("Stream closed by the reader")
+            del self._buffer[:STREAM_CHUNK_SIZE]
+        return len(data)
+
+    def _put(self, item) -> bool:
+        """Queue an item for the reader; False if the reader has gone away."""
+        while not self._cancelled.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def finish(self, error: Optional[Exception] = None) -> None:
+        """Pass on the remaining bytes, then the end of the stream (or error)."""
+        if error is None and self._buffer:
+            if not self._put(bytes(self._buffer)):
+                return
+        self._buffer.clear()
+        self._put(error)
+
+    def cancel(self) -> None:
+        """Stop the writer; used when the reader stops early."""
+        self._cancelled.set()
+
+    def chunks(self) -> Iterator[bytes]:
+        """Yield chunks as they are written, raising the writer's error."""
+        while True:
+            item = self._chunks.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
 
 class ExcelExportService:
     """Service for generating Excel and CSV exports."""
@@ -34,49 +131,118 @@ class ExcelExportService:
         formatted = f"{amount:{config.number_format}}"
         return f"{config.base_currency} {formatted}"
 
-    def _apply_header_style(self, ws, row: int, max_col: int):
-        """Apply header styling to a row."""
-        header_fill = PatternFill(
-            start_color="F3F4F6", end_color="F3F4F6", fill_type="solid"
+    def _create_workbook(self) -> Workbook:
+        """
+        Create a write-only workbook with the export styles predeclared.
+
+        Write-only worksheets stream rows to disk as they are appended, so
+        memory stays flat regardless of the number of rows. Styles are
+        registered once per workbook and applied by copying a template
+        cell's style, instead of styling every cell after the fact.
+        """
+        wb = Workbook(write_only=True)
+        border_side = Side(style="thin", color="E5E7EB")
+        border = Border(
+            left=border_side, right=border_side, top=border_side, bottom=border_side
         )
-        header_font = Font(bold=True, size=11)
-
-        for col in range(1, max_col + 1):
-            cell = ws.cell(row=row, column=col)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="left", vertical="center")
-
-    def _apply_border(self, ws, start_row: int, end_row: int, max_col: int):
-        """Apply borders to a range."""
-        thin_border = Border(
-            left=Side(style="thin", color="E5E7EB"),
-            right=Side(style="thin", color="E5E7EB"),
-            top=Side(style="thin", color="E5E7EB"),
-            bottom=Side(style="thin", color="E5E7EB"),
+
+        styles = {
+            "title": NamedStyle(name="title", font=Font(bold=True, size=14)),
+            "subtitle": NamedStyle(name="subtitle", font=Font(size=10, color="6B7280")),
+            "label": NamedStyle(name="label", font=Font(bold=True)),
+            "header": NamedStyle(
+                name="header",
+                font=Font(bold=True, size=11),
+                fill=PatternFill(
+                    start_color="F3F4F6", end_color="F3F4F6", fill_type="solid"
+                ),
+                alignment=Alignment(horizontal="left", vertical="center"),
+                border=border,
+            ),
+            "data": NamedStyle(name="data", border=border),
+        }
+        for style in styles.values():
+            wb.add_named_style(style)
+
+        return wb
+
+    def _styled_cell(self, template: WriteOnlyCell, value) -> WriteOnlyCell:
+        """Create a cell carrying the style of a template cell."""
+        cell = WriteOnlyCell(template.parent, value=value)
+        cell._style = copy(template._style)
+        return cell
+
+    def _column_widths(self, rows: List[list], max_col: int) -> List[float]:
+        """Compute column widths from a sample of rows."""
+        widths = [0] * max_col
+        for row in rows:
+            for col, value in enumerate(row[:max_col]):
+                if value is not None:
+                    widths[col] = max(widths[col], len(str(value)))
+
+        return [min(width + 2, MAX_COLUMN_WIDTH) for width in widths]
+
+    def _write_sheet(
+        self,
+        wb: Workbook,
+        title: str,
+        preamble: List[Tuple[list, Optional[str]]],
+        headers: List[str],
+        rows: Iterable[list],
+        merged_ranges: Iterable[str] = (),
+    ) -> int:
+        """
+        Stream a titled table into a new write-only worksheet.
+
+        Column widths are computed from the preamble, the headers and the
+        first WIDTH_SAMPLE_ROWS data rows, since write-only worksheets must
+        declare them before any row is written.
+
+        Args:
+            wb: Workbook from _create_workbook
+            title: Worksheet title
+            preamble: Rows above the table as (values, style of first cell)
+            headers: Table column headers
+            rows: Table rows (consumed lazily)
+            merged_ranges: Cell ranges to merge (e.g. "A1:F1")
+
+        Returns:
+            Number of data rows written
+        """
+        ws = wb.create_sheet(title)
+        rows = iter(rows)
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+
+        widths = self._column_widths(
+            [values for values, _ in preamble] + [headers] + sample, len(headers)
         )
+        for col, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(col)].width = width
 
-        for row in range(start_row, end_row + 1):
-            for col in range(1, max_col + 1):
-                ws.cell(row=row, column=col).border = thin_border
+        for cell_range in merged_ranges:
+            ws.merged_cells.add(cell_range)
 
-    def _auto_size_columns(self, ws, max_col: int):
-        """Auto-size columns based on content."""
-        for col in range(1, max_col + 1):
-            max_length = 0
-            column = get_column_letter(col)
+        templates = {}
+        for name in ["title", "subtitle", "label", "header", "data"]:
+            templates[name] = WriteOnlyCell(ws)
+            templates[name].style = name
 
-            for cell in ws[column]:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
+        for values, style in preamble:
+            if style and values:
+                values = [self._styled_cell(templates[style], values[0])] + values[1:]
+            ws.append(values)
 
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column].width = adjusted_width
+        ws.append([self._styled_cell(templates["header"], h) for h in headers])
 
-    def export_transactions_excel(
+        data = templates["data"]
+        count = 0
+        for row in chain(sample, rows):
+            ws.append([self._styled_cell(data, value) for value in row])
+            count += 1
+
+        return count
+
+    def _build_transactions_workbook(
         self,
         start_date: Optional[date_type],
         end_date: Optional[date_type],
@@ -84,59 +250,21 @@ class ExcelExportService:
         category_id: Optional[str],
         transaction_type: Optional[str],
         config: ExportConfig,
-    ) -> str:
-        """
-        Export transactions to Excel.
-
-        Returns:
-            File path of generated Excel file
-        """
-        # Load data
-        transactions = csv_manager.read_csv("transactions.csv")
-        accounts = csv_manager.read_csv("accounts.csv")
-        categories = csv_manager.read_csv("categories.csv")
-
-        # Create lookup maps
-        account_map = {acc["id"]: acc["name"] for acc in accounts}
-        category_map = {cat["id"]: cat["name"] for cat in categories}
-
-        # Filter transactions
-        filtered = []
-        for txn in transactions:
-            # Date filter
-            if start_date and txn.get("date", "") < str(start_date):
-                continue
-            if end_date and txn.get("date", "") > str(end_date):
-                continue
-
-            # Account filter
-            if account_id and txn.get("account_id") != account_id:
-                continue
-
-            # Category filter
-            if category_id and txn.get("category_id") != category_id:
-                continue
-
-            # Type filter
-            if transaction_type and txn.get("type") != transaction_type:
-                continue
-
-            filtered.append(txn)
-
-        # Sort by date descending
-        filtered.sort(key=lambda x: x.get("date", ""), reverse=True)
-
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Transactions"
+        progress: Optional[Callable[[float], None]] = None,
+    ) -> Workbook:
+        """Build the transactions workbook (rows are streamed to disk)."""
+        filters = TransactionFilter(
+            start_date=start_date,
+            end_date=end_date,
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=transaction_type,
+        )
 
-        # Title
-        ws["A1"] = "Transaction Report"
-        ws["A1"].font = Font(bold=True, size=14)
-        ws.merge_cells("A1:F1")
+        # Title and date range
+        preamble = [(["Transaction Report"], "title")]
+        merged_ranges = ["A1:F1"]
 
-        # Date range
         date_range = ""
         if start_date and end_date:
             date_range = f"{start_date} to {end_date}"
@@ -146,36 +274,28 @@ class ExcelExportService:
             date_range = f"Until {end_date}"
 
         if date_range:
-            ws["A2"] = date_range
-            ws["A2"].font = Font(size=10, color="6B7280")
-            ws.merge_cells("A2:F2")
+            preamble.append(([date_range], "subtitle"))
+            merged_ranges.append("A2:F2")
+        else:
+            preamble.append(([], None))
 
         # Summary
-        total_income = sum(
-            float(t.get("amount", 0)) for t in filtered if t.get("type") == "income"
-        )
-        total_expenses = sum(
-            abs(float(t.get("amount", 0)))
-            for t in filtered
-            if t.get("type") == "expense"
-        )
-        net = total_income - total_expenses
-
-        summary_row = 4
-        ws[f"A{summary_row}"] = "Total Income:"
-        ws[f"B{summary_row}"] = self._format_currency(total_income, config)
-        ws[f"A{summary_row}"].font = Font(bold=True)
-
-        ws[f"A{summary_row + 1}"] = "Total Expenses:"
-        ws[f"B{summary_row + 1}"] = self._format_currency(total_expenses, config)
-        ws[f"A{summary_row + 1}"].font = Font(bold=True)
-
-        ws[f"A{summary_row + 2}"] = "Net:"
-        ws[f"B{summary_row + 2}"] = self._format_currency(net, config)
-        ws[f"A{summary_row + 2}"].font = Font(bold=True)
+        totals = transaction_query_service.get_totals(filters)
+        total_income = totals["income"]
+        total_expenses = totals["expenses"]
+        net = totals["net"]
+
+        preamble += [
+            ([], None),
+            (["Total Income:", self._format_currency(total_income, config)], "label"),
+            (
+                ["Total Expenses:", self._format_currency(total_expenses, config)],
+                "label",
+            ),
+            (["Net:", self._format_currency(net, config)], "label"),
+            ([], None),
+        ]
 
-        # Headers
-        header_row = summary_row + 4
         headers = [
             "Date",
             "Description",
@@ -186,43 +306,56 @@ class ExcelExportService:
             "Currency",
             "Notes",
         ]
-        for col, header in enumerate(headers, start=1):
-            ws.cell(row=header_row, column=col, value=header)
-
-        self._apply_header_style(ws, header_row, len(headers))
-
-        # Data
-        data_start_row = header_row + 1
-        for row_idx, txn in enumerate(filtered, start=data_start_row):
-            amount = float(txn.get("amount", 0))
-
-            ws.cell(row=row_idx, column=1, value=txn.get("date", ""))
-            ws.cell(row=row_idx, column=2, value=txn.get("description", ""))
-            ws.cell(
-                row=row_idx,
-                column=3,
-                value=category_map.get(txn.get("category_id", ""), "Unknown"),
-            )
-            ws.cell(
-                row=row_idx,
-                column=4,
-                value=account_map.get(txn.get("account_id", ""), "Unknown"),
-            )
-            ws.cell(row=row_idx, column=5, value=txn.get("type", ""))
-            ws.cell(row=row_idx, column=6, value=abs(amount))
-            ws.cell(
-                row=row_idx, column=7, value=txn.get("currency", config.base_currency)
-            )
-            ws.cell(row=row_idx, column=8, value=txn.get("notes", ""))
 
-        # Apply borders
-        if filtered:
-            self._apply_border(
-                ws, header_row, data_start_row + len(filtered) - 1, len(headers)
-            )
+        # Data rows, generated as the sheet is streamed
+        rows = (
+            [
+                txn.get("date", ""),
+                txn.get("description", ""),
+                txn["category_name"],
+                txn["account_name"],
+                txn.get("type", ""),
+                abs(float(txn.get("amount", 0))),
+                txn.get("currency", config.base_currency),
+                txn.get("notes", ""),
+            ]
+            for txn in transaction_query_service.query(filters)
+        )
+        rows = _with_progress(rows, totals["count"], progress)
+
+        wb = self._create_workbook()
+        self._write_sheet(wb, "Transactions", preamble, headers, rows, merged_ranges)
+
+        return wb
+
+    def export_transactions_excel(
+        self,
+        start_date: Optional[date_type],
+        end_date: Optional[date_type],
+        account_id: Optional[str],
+        category_id: Optional[str],
+        transaction_type: Optional[str],
+        config: ExportConfig,
+        progress: Optional[Callable[[float], None]] = None,
+    ) -> str:
+        """
+        Export transactions to Excel.
 
-        # Auto-size columns
-        self._auto_size_columns(ws, len(headers))
+        Args:
+            progress: Called with the fraction of rows written so far
+
+        Returns:
+            File path of generated Excel file
+        """
+        wb = self._build_transactions_workbook(
+            start_date,
+            end_date,
+            account_id,
+            category_id,
+            transaction_type,
+            config,
+            progress,
+        )
 
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -234,7 +367,7 @@ class ExcelExportService:
 
         return filepath
 
-    def export_transactions_csv(
+    def stream_transactions_excel(
         self,
         start_date: Optional[date_type],
         end_date: Optional[date_type],
@@ -242,47 +375,146 @@ class ExcelExportService:
         category_id: Optional[str],
         transaction_type: Optional[str],
         config: ExportConfig,
-    ) -> str:
+    ) -> Iterator[bytes]:
         """
-        Export transactions to CSV.
+        Generate a transactions Excel workbook as chunks.
 
-        Returns:
-            File path of generated CSV file
+        The workbook is built and saved on a worker thread into a pipe, and
+        chunks are yielded while the xlsx zip container is being written,
+        so neither the rows nor the compressed file are held in memory.
+
+        Yields:
+            Chunks of the xlsx file
         """
-        # Load data
-        transactions = csv_manager.read_csv("transactions.csv")
-        accounts = csv_manager.read_csv("accounts.csv")
-        categories = csv_manager.read_csv("categories.csv")
-
-        # Create lookup maps
-        account_map = {acc["id"]: acc["name"] for acc in accounts}
-        category_map = {cat["id"]: cat["name"] for cat in categories}
-
-        # Filter transactions
-        filtered = []
-        for txn in transactions:
-            # Date filter
-            if start_date and txn.get("date", "") < str(start_date):
-                continue
-            if end_date and txn.get("date", "") > str(end_date):
-                continue
+        pipe = _ChunkPipe()
+
+        def write_workbook():
+            try:
+                wb = self._build_transactions_workbook(
+                    start_date,
+                    end_date,
+                    account_id,
+                    category_id,
+                    transaction_type,
+                    config,
+                )
+                wb.save(pipe)
+            except Exception as e:
+                pipe.finish(e)
+            else:
+                pipe.finish()
+
+        writer = threading.Thread(
+            target=write_workbook, name="excel-stream", daemon=True
+        )
+        writer.start()
+        try:
+            yield from pipe.chunks()
+        finally:
+            pipe.cancel()
+            writer.join()
+
+    def stream_transactions_csv(
+        self,
+        start_date: Optional[date_type],
+        end_date: Optional[date_type],
+        account_id: Optional[str],
+        category_id: Optional[str],
+        transaction_type: Optional[str],
+        config: ExportConfig,
+        progress: Optional[Callable[[float], None]] = None,
+    ) -> Iterator[bytes]:
+        """
+        Generate a transactions CSV as UTF-8 encoded chunks.
 
-            # Account filter
-            if account_id and txn.get("account_id") != account_id:
-                continue
+        Rows are encoded in batches of CSV_CHUNK_ROWS as the generator is
+        consumed, so the CSV can be written straight into a response.
 
-            # Category filter
-            if category_id and txn.get("category_id") != category_id:
-                continue
+        Args:
+            progress: Called with the fraction of rows encoded so far
 
-            # Type filter
-            if transaction_type and txn.get("type") != transaction_type:
-                continue
+        Yields:
+            Encoded CSV chunks, starting with the header row
+        """
+        filters = TransactionFilter(
+            start_date=start_date,
+            end_date=end_date,
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=transaction_type,
+        )
+
+        fieldnames = [
+            "Date",
+            "Description",
+            "Category",
+            "Account",
+            "Type",
+            "Amount",
+            "Currency",
+            "Notes",
+            "Tags",
+        ]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+
+        writer.writeheader()
+
+        rows = transaction_query_service.query(filters)
+        if progress:
+            total = transaction_query_service.get_totals(filters)["count"]
+            rows = _with_progress(rows, total, progress)
+
+        for index, txn in enumerate(rows, start=1):
+            writer.writerow(
+                {
+                    "Date": txn.get("date", ""),
+                    "Description": txn.get("description", ""),
+                    "Category": txn["category_name"],
+                    "Account": txn["account_name"],
+                    "Type": txn.get("type", ""),
+                    "Amount": txn.get("amount", ""),
+                    "Currency": txn.get("currency", config.base_currency),
+                    "Notes": txn.get("notes", ""),
+                    "Tags": txn.get("tags", ""),
+                }
+            )
 
-            filtered.append(txn)
+            if index % CSV_CHUNK_ROWS == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
 
-        # Sort by date descending
-        filtered.sort(key=lambda x: x.get("date", ""), reverse=True)
+        yield buffer.getvalue().encode("utf-8")
+
+    def export_transactions_csv(
+        self,
+        start_date: Optional[date_type],
+        end_date: Optional[date_type],
+        account_id: Optional[str],
+        category_id: Optional[str],
+        transaction_type: Optional[str],
+        config: ExportConfig,
+        progress: Optional[Callable[[float], None]] = None,
+    ) -> str:
+        """
+        Export transactions to CSV.
+
+        Args:
+            progress: Called with the fraction of rows written so far
+
+        Returns:
+            File path of generated CSV file
+        """
+        chunks = self.stream_transactions_csv(
+            start_date,
+            end_date,
+            account_id,
+            category_id,
+            transaction_type,
+            config,
+            progress,
+        )
 
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -290,40 +522,9 @@ class ExcelExportService:
         filepath = os.path.join(self.exports_dir, filename)
 
         # Write CSV
-        with open(filepath, "w", newline="", encoding="utf-8") as f:
-            fieldnames = [
-                "Date",
-                "Description",
-                "Category",
-                "Account",
-                "Type",
-                "Amount",
-                "Currency",
-                "Notes",
-                "Tags",
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-            writer.writeheader()
-
-            for txn in filtered:
-                writer.writerow(
-                    {
-                        "Date": txn.get("date", ""),
-                        "Description": txn.get("description", ""),
-                        "Category": category_map.get(
-                            txn.get("category_id", ""), "Unknown"
-                        ),
-                        "Account": account_map.get(
-                            txn.get("account_id", ""), "Unknown"
-                        ),
-                        "Type": txn.get("type", ""),
-                        "Amount": txn.get("amount", ""),
-                        "Currency": txn.get("currency", config.base_currency),
-                        "Notes": txn.get("notes", ""),
-                        "Tags": txn.get("tags", ""),
-                    }
-                )
+        with open(filepath, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
 
         return filepath
 
@@ -349,48 +550,42 @@ class ExcelExportService:
             config.base_currency
         )
 
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Portfolio"
-
-        # Title
-        ws["A1"] = "Investment Portfolio"
-        ws["A1"].font = Font(bold=True, size=14)
-        ws.merge_cells("A1:H1")
-
-        # Summary
-        summary_row = 3
-        ws[f"A{summary_row}"] = "Total Investments:"
-        ws[f"B{summary_row}"] = portfolio_summary.total_investments
-        ws[f"A{summary_row}"].font = Font(bold=True)
-
-        ws[f"A{summary_row + 1}"] = "Total Value:"
-        ws[f"B{summary_row + 1}"] = self._format_currency(
-            portfolio_summary.total_value, config
-        )
-        ws[f"A{summary_row + 1}"].font = Font(bold=True)
-
-        ws[f"A{summary_row + 2}"] = "Total Cost:"
-        ws[f"B{summary_row + 2}"] = self._format_currency(
-            portfolio_summary.total_cost, config
-        )
-        ws[f"A{summary_row + 2}"].font = Font(bold=True)
-
-        ws[f"A{summary_row + 3}"] = "Profit/Loss:"
-        ws[f"B{summary_row + 3}"] = self._format_currency(
-            portfolio_summary.total_profit_loss, config
-        )
-        ws[f"A{summary_row + 3}"].font = Font(bold=True)
-
-        ws[f"A{summary_row + 4}"] = "Return:"
-        ws[f"B{summary_row + 4}"] = (
-            f"{portfolio_summary.total_profit_loss_percentage:.2f}%"
-        )
-        ws[f"A{summary_row + 4}"].font = Font(bold=True)
+        # Title and summary
+        preamble = [
+            (["Investment Portfolio"], "title"),
+            ([], None),
+            (["Total Investments:", portfolio_summary.total_investments], "label"),
+            (
+                [
+                    "Total Value:",
+                    self._format_currency(portfolio_summary.total_value, config),
+                ],
+                "label",
+            ),
+            (
+                [
+                    "Total Cost:",
+                    self._format_currency(portfolio_summary.total_cost, config),
+                ],
+                "label",
+            ),
+            (
+                [
+                    "Profit/Loss:",
+                    self._format_currency(portfolio_summary.total_profit_loss, config),
+                ],
+                "label",
+            ),
+            (
+                [
+                    "Return:",
+                    f"{portfolio_summary.total_profit_loss_percentage:.2f}%",
+                ],
+                "label",
+            ),
+            ([], None),
+        ]
 
-        # Headers
-        header_row = summary_row + 6
         headers = [
             "Symbol",
             "Name",
@@ -401,33 +596,28 @@ class ExcelExportService:
             "Total Value",
             "P/L %",
         ]
-        for col, header in enumerate(headers, start=1):
-            ws.cell(row=header_row, column=col, value=header)
-
-        self._apply_header_style(ws, header_row, len(headers))
-
-        # Data
-        data_start_row = header_row + 1
-        for row_idx, inv in enumerate(investments, start=data_start_row):
-            perf = investment_service.get_investment_performance(inv.id)
-
-            ws.cell(row=row_idx, column=1, value=inv.symbol)
-            ws.cell(row=row_idx, column=2, value=inv.name)
-            ws.cell(row=row_idx, column=3, value=inv.type)
-            ws.cell(row=row_idx, column=4, value=perf.quantity)
-            ws.cell(row=row_idx, column=5, value=perf.average_cost)
-            ws.cell(row=row_idx, column=6, value=perf.current_price)
-            ws.cell(row=row_idx, column=7, value=perf.current_value)
-            ws.cell(row=row_idx, column=8, value=f"{perf.profit_loss_percentage:.2f}%")
-
-        # Apply borders
-        if investments:
-            self._apply_border(
-                ws, header_row, data_start_row + len(investments) - 1, len(headers)
-            )
 
-        # Auto-size columns
-        self._auto_size_columns(ws, len(headers))
+        # Data rows, generated as the sheet is streamed
+        performances = {
+            p.investment_id: p
+            for p in investment_service.get_performances(type_filter=investment_type)
+        }
+        rows = (
+            [
+                inv.symbol,
+                inv.name,
+                inv.type,
+                performances[inv.id].quantity,
+                performances[inv.id].average_cost,
+                performances[inv.id].current_price,
+                performances[inv.id].current_value,
+                f"{performances[inv.id].profit_loss_percentage:.2f}%",
+            ]
+            for inv in investments
+        )
+
+        wb = self._create_workbook()
+        self._write_sheet(wb, "Portfolio", preamble, headers, rows, ["A1:H1"])
 
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
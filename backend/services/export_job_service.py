@@ -0,0 +1,403 @@
+"""Background export jobs with a content-addressed result cache."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from config import Config
+from models.export import ExportConfig, ExportJob, ExportResponse
+from services.csv_manager import csv_manager
+from services.excel_export_service import excel_export_service
+from services.export_manifest import export_manifest
+from services.pdf_export_service import pdf_export_service
+from utils.dates import now_iso, utc_iso
+from utils.ids import generate_uuid
+
+# Data files each export type reads; their versions are part of the cache key
+EXPORT_TABLES = {
+    "transactions": ["transactions.csv", "accounts.csv", "categories.csv"],
+    "financial_summary": [
+        "accounts.csv",
+        "transactions.csv",
+        "categories.csv",
+        "debts.csv",
+        "goals.csv",
+        "settings.json",
+        "investments.csv",
+        "investment_transactions.csv",
+        "exchange_rates.csv",
+    ],
+    "investment_portfolio": [
+        "investments.csv",
+        "investment_transactions.csv",
+        "exchange_rates.csv",
+    ],
+    "debt_report": ["debts.csv"],
+}
+
+# Exporter parameters per export type
+EXPORT_PARAMS = {
+    "transactions": [
+        "start_date",
+        "end_date",
+        "account_id",
+        "category_id",
+        "transaction_type",
+    ],
+    "financial_summary": [],
+    "investment_portfolio": ["include_transactions", "investment_type"],
+    "debt_report": ["include_paid_off"],
+}
+
+# Exported files carry the leading characters of their cache key
+KEY_LENGTH = 16
+CACHED_FILE_PATTERN = re.compile(r"_([0-9a-f]{16})\.[a-z]+$")
+
+# Finished jobs kept in memory for status queries
+MAX_JOBS = 200
+
+# Exporters that report progress while they run
+PROGRESS_EXPORTS = {
+    ("transactions", "pdf"),
+    ("transactions", "excel"),
+    ("transactions", "csv"),
+}
+
+
+class ExportJobService:
+    """
+    Runs exports on a worker pool and caches their results.
+
+    Every export is identified by a hash of its type, format, parameters,
+    export configuration, the current date (reports are stamped "as of"
+    today) and the versions of the data files it reads. Generated files are
+    renamed to carry that hash, so an identical export finds the existing
+    file instead of regenerating it, also across restarts. Any write to an
+    input file changes its version and therefore the hash.
+    """
+
+    def __init__(self):
+        """Initialize export job service."""
+        self.exports_dir = "exports"
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=Config.EXPORT_WORKERS, thread_name_prefix="export"
+        )
+        self._jobs: "OrderedDict[str, ExportJob]" = OrderedDict()
+        self._in_flight: Dict[str, str] = {}
+        self._cache: Optional[Dict[str, str]] = None
+        self._export_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+        self._exporters = {
+            ("transactions", "pdf"): pdf_export_service.export_transactions_pdf,
+            ("transactions", "excel"): excel_export_service.export_transactions_excel,
+            ("transactions", "csv"): excel_export_service.export_transactions_csv,
+            (
+                "financial_summary",
+                "pdf",
+            ): pdf_export_service.export_financial_summary_pdf,
+            (
+                "investment_portfolio",
+                "pdf",
+            ): pdf_export_service.export_investment_portfolio_pdf,
+            (
+                "investment_portfolio",
+                "excel",
+            ): excel_export_service.export_investment_portfolio_excel,
+            ("debt_report", "pdf"): pdf_export_service.export_debt_report_pdf,
+        }
+
+    def _check_supported(self, export_type: str, format: str):
+        """Raise ValueError for export type/format pairs without an exporter."""
+        if (export_type, format) not in self._exporters:
+            supported = sorted(f"{t}/{f}" for t, f in self._exporters)
+            raise ValueError(
+                f"Unsupported export: {export_type}/{format}. Supported: {supported}"
+            )
+
+    def get_cache_key(
+        self,
+        export_type: str,
+        format: str,
+        params: Dict[str, Any],
+        config: ExportConfig,
+    ) -> str:
+        """
+        Hash the inputs that determine an export's content.
+
+        Args:
+            export_type: Type of export
+            format: Export format
+            params: Exporter parameters
+            config: Export configuration
+
+        Returns:
+            Hex digest identifying the export
+        """
+        payload = {
+            "export_type": export_type,
+            "format": format,
+            "params": params,
+            "config": config.model_dump(),
+            "date": date.today().isoformat(),
+            "versions": {
+                filename: csv_manager.get_file_version(filename)
+                for filename in EXPORT_TABLES.get(export_type, [])
+            },
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+
+        return hashlib.sha256(encoded).hexdigest()
+
+    def export(
+        self,
+        export_type: str,
+        format: str,
+        params: Dict[str, Any],
+        config: ExportConfig,
+    ) -> str:
+        """
+        Export synchronously, reusing a cached file when the inputs are unchanged.
+
+        Args:
+            export_type: Type of export
+            format: Export format
+            params: Exporter parameters
+            config: Export configuration
+
+        Returns:
+            File path of the export
+
+        Raises:
+            ValueError: If the export type/format is not supported
+        """
+        self._check_supported(export_type, format)
+        key = self.get_cache_key(export_type, format, params, config)
+
+        filepath, _ = self._get_or_generate(export_type, format, params, config, key)
+        return filepath
+
+    def submit(
+        self,
+        export_type: str,
+        format: str,
+        params: Dict[str, Any],
+        config: ExportConfig,
+    ) -> ExportJob:
+        """
+        Queue an export job.
+
+        A cached result completes the job immediately, and an identical job
+        that is still queued or running is returned instead of a new one.
+
+        Args:
+            export_type: Type of export
+            format: Export format
+            params: Exporter parameters
+            config: Export configuration
+
+        Returns:
+            The export job
+
+        Raises:
+            ValueError: If the export type/format is not supported
+        """
+        self._check_supported(export_type, format)
+        key = self.get_cache_key(export_type, format, params, config)
+
+        with self._lock:
+            if key in self._in_flight:
+                return self._jobs[self._in_flight[key]].model_copy()
+
+            job = ExportJob(
+                job_id=f"exp_{generate_uuid()[:8]}",
+                export_type=export_type,
+                format=format,
+                params=params,
+                cache_key=key,
+                created_at=now_iso(),
+            )
+
+            filepath = self._lookup(key)
+            if filepath:
+                self._complete(job, filepath, cached=True)
+            else:
+                self._in_flight[key] = job.job_id
+
+            self._jobs[job.job_id] = job
+            self._trim_jobs()
+
+        if job.status == "queued":
+            self._executor.submit(self._run, job.job_id, config)
+
+        return job.model_copy()
+
+    def get_job(self, job_id: str) -> Optional[ExportJob]:
+        """Get an export job by ID."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
+
+    def list_jobs(self) -> List[ExportJob]:
+        """List export jobs, newest first."""
+        with self._lock:
+            return [job.model_copy() for job in reversed(self._jobs.values())]
+
+    def cleanup(self, retention_days: Optional[int] = None) -> Dict[str, int]:
+        """
+        Delete exports older than the retention period.
+
+        Args:
+            retention_days: Maximum age in days (default: EXPORT_RETENTION_DAYS)
+
+        Returns:
+            Number of files deleted and bytes freed
+        """
+        result = export_manifest.sweep(retention_days)
+
+        with self._lock:
+            if self._cache is not None:
+                self._cache = {
+                    key: path
+                    for key, path in self._cache.items()
+                    if os.path.exists(path)
+                }
+
+        return result
+
+    def describe(self, filepath: str, export_type: str, format: str) -> ExportResponse:
+        """Create export metadata for a generated file."""
+        return ExportResponse(
+            filename=os.path.basename(filepath),
+            file_path=filepath,
+            file_size=os.path.getsize(filepath),
+            export_type=export_type,
+            format=format,
+            created_at=utc_iso(),
+        )
+
+    def _run(self, job_id: str, config: ExportConfig):
+        """Run a queued job on a worker thread."""
+        with self._lock:
+            job = self._jobs[job_id]
+            job.status = "running"
+
+        try:
+            filepath, cached = self._get_or_generate(
+                job.export_type,
+                job.format,
+                job.params,
+                config,
+                job.cache_key,
+                progress=lambda fraction: self._set_progress(job, fraction),
+            )
+            with self._lock:
+                self._complete(job, filepath, cached)
+        except Exception as e:
+            with self._lock:
+                job.status = "failed"
+                job.error = str(e)
+                job.completed_at = now_iso()
+        finally:
+            with self._lock:
+                self._in_flight.pop(job.cache_key, None)
+
+    def _set_progress(self, job: ExportJob, fraction: float):
+        """Record a running job's progress (never backwards, 1 only once completed)."""
+        with self._lock:
+            job.progress = max(job.progress, min(fraction, 0.99))
+
+    def _get_or_generate(
+        self,
+        export_type: str,
+        format: str,
+        params: Dict[str, Any],
+        config: ExportConfig,
+        key: str,
+        progress: Optional[Callable[[float], None]] = None,
+    ) -> Tuple[str, bool]:
+        """
+        Return the cached file for a key or generate it.
+
+        Exporters name files by the second they were generated, so exports of
+        the same type and format are serialized to keep them from writing to
+        the same path. Exporters in PROGRESS_EXPORTS report to progress.
+        """
+        with self._lock:
+            export_lock = self._export_locks.setdefault(
+                (export_type, format), threading.Lock()
+            )
+
+        with export_lock:
+            with self._lock:
+                filepath = self._lookup(key)
+            if filepath:
+                return filepath, True
+
+            kwargs = dict(params)
+            if progress and (export_type, format) in PROGRESS_EXPORTS:
+                kwargs["progress"] = progress
+            generated = self._exporters[(export_type, format)](**kwargs, config=config)
+
+            stem, extension = os.path.splitext(generated)
+            filepath = f"{stem}_{key[:KEY_LENGTH]}{extension}"
+            os.replace(generated, filepath)
+
+            with self._lock:
+                self._load_cache()
+                self._cache[key[:KEY_LENGTH]] = filepath
+
+        export_manifest.record(self.describe(filepath, export_type, format))
+
+        return filepath, False
+
+    def _load_cache(self):
+        """Index cached files in the exports directory (caller holds the lock)."""
+        if self._cache is not None:
+            return
+
+        self._cache = {}
+        if os.path.isdir(self.exports_dir):
+            for filename in os.listdir(self.exports_dir):
+                match = CACHED_FILE_PATTERN.search(filename)
+                if match:
+                    self._cache[match.group(1)] = os.path.join(
+                        self.exports_dir, filename
+                    )
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """Find the cached file for a key (caller holds the lock)."""
+        self._load_cache()
+
+        filepath = self._cache.get(key[:KEY_LENGTH])
+        if filepath and not os.path.exists(filepath):
+            del self._cache[key[:KEY_LENGTH]]
+            return None
+
+        return filepath
+
+    def _complete(self, job: ExportJob, filepath: str, cached: bool):
+        """Mark a job completed (caller holds the lock)."""
+        job.status = "completed"
+        job.progress = 1.0
+        job.cached = cached
+        job.result = self.describe(filepath, job.export_type, job.format)
+        job.completed_at = now_iso()
+
+    def _trim_jobs(self):
+        """Drop the oldest finished jobs beyond MAX_JOBS (caller holds the lock)."""
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= MAX_JOBS:
+                break
+            if self._jobs[job_id].status in ("completed", "failed"):
+                del self._jobs[job_id]
+
+
+# Singleton instance
+export_job_service = ExportJobService()
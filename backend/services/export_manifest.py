@@ -0,0 +1,283 @@
+"""Persisted manifest of generated export files."""
+
+import heapq
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date as date_type, timedelta
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from config import Config
+from models.export import ExportResponse
+from utils.dates import utc_iso
+
+# Manifest file inside the exports directory (JSON lines, oldest first)
+MANIFEST_FILE = ".manifest.jsonl"
+
+# Export formats by file extension, where they differ
+FORMATS_BY_EXTENSION = {"xlsx": "excel"}
+
+
+def _infer_export_type(filename: str) -> str:
+    """Infer the export type from a filename (exports made before the manifest)."""
+    if "transaction" in filename:
+        return "transactions"
+    if "financial_summary" in filename:
+        return "financial_summary"
+    if "investment" in filename:
+        return "investment_portfolio"
+    if "debt" in filename:
+        return "debt_report"
+    return "unknown"
+
+
+class ExportGroup:
+    """Manifest entries of one (export type, format), oldest first."""
+
+    def __init__(self):
+        """Initialize an empty group."""
+        self.created: List[str] = []
+        self.entries: List[Dict[str, Any]] = []
+
+    def add(self, entry: Dict[str, Any]):
+        """Insert an entry in created_at order."""
+        position = bisect_right(self.created, entry["created_at"])
+        self.created.insert(position, entry["created_at"])
+        self.entries.insert(position, entry)
+
+    def window(self, created_from: Optional[str], created_to: Optional[str]) -> range:
+        """Get entry positions created in [created_from, created_to)."""
+        low = bisect_left(self.created, created_from) if created_from else 0
+        high = (
+            bisect_left(self.created, created_to) if created_to else len(self.created)
+        )
+        return range(low, max(low, high))
+
+    def newest_first(self, window: range) -> Iterator[Dict[str, Any]]:
+        """Iterate over the entries of a window, newest first."""
+        for position in reversed(window):
+            yield self.entries[position]
+
+
+class ExportManifest:
+    """
+    Index of the files in the exports directory.
+
+    Every completed export is appended to a JSON lines manifest and kept in
+    memory grouped by (export type, format) in creation order, so listing a
+    page of exports is a bisect plus a merge of the newest entries of the
+    matching groups, without touching the directory. The manifest is built
+    from a directory scan when it does not exist yet, and reloaded when
+    another process has written to it.
+    """
+
+    def __init__(self, exports_dir: str = "exports"):
+        """Initialize export manifest."""
+        self.exports_dir = exports_dir
+        self._lock = threading.Lock()
+        self._groups: Optional[Dict[Tuple[str, str], ExportGroup]] = None
+        self._filenames: Dict[str, Tuple[str, str]] = {}
+        self._version: Optional[Tuple[int, int]] = None
+
+    @property
+    def manifest_path(self) -> str:
+        """Path of the manifest file."""
+        return os.path.join(self.exports_dir, MANIFEST_FILE)
+
+    def record(self, export: ExportResponse):
+        """
+        Add a completed export to the manifest.
+
+        Args:
+            export: Export metadata
+        """
+        entry = export.model_dump()
+
+        with self._lock:
+            self._ensure_loaded()
+            if entry["filename"] in self._filenames:
+                return
+
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._add(entry)
+            self._version = self._file_version()
+
+    def list_exports(
+        self,
+        export_type: Optional[str] = None,
+        format: Optional[str] = None,
+        created_from: Optional[date_type] = None,
+        created_to: Optional[date_type] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List exports, newest first.
+
+        Args:
+            export_type: Filter by export type
+            format: Filter by format (pdf, excel, csv)
+            created_from: Earliest creation date (inclusive)
+            created_to: Latest creation date (inclusive)
+            limit: Maximum number of exports to return (None for all)
+            offset: Number of exports to skip
+
+        Returns:
+            Tuple of (page of export entries, total matching exports)
+        """
+        lower = str(created_from) if created_from else None
+        upper = str(created_to + timedelta(days=1)) if created_to else None
+
+        with self._lock:
+            self._ensure_loaded()
+            windows = [
+                (group, group.window(lower, upper))
+                for (group_type, group_format), group in self._groups.items()
+                if (not export_type or group_type == export_type)
+                and (not format or group_format == format)
+            ]
+            total = sum(len(window) for _, window in windows)
+
+            newest_first = heapq.merge(
+                *[group.newest_first(window) for group, window in windows],
+                key=lambda entry: entry["created_at"],
+                reverse=True,
+            )
+            stop = offset + limit if limit is not None else None
+            page = [dict(entry) for entry in islice(newest_first, offset, stop)]
+
+        return page, total
+
+    def sweep(self, retention_days: Optional[int] = None) -> Dict[str, int]:
+        """
+        Delete exports older than the retention period and compact the manifest.
+
+        Entries whose files no longer exist are dropped as well.
+
+        Args:
+            retention_days: Maximum age in days (default: EXPORT_RETENTION_DAYS)
+
+        Returns:
+            Number of files deleted and bytes freed
+        """
+        if retention_days is None:
+            retention_days = Config.EXPORT_RETENTION_DAYS
+
+        cutoff = time.time() - retention_days * 86400
+        deleted = 0
+        freed = 0
+
+        with self._lock:
+            self._ensure_loaded()
+            kept = []
+            for group in self._groups.values():
+                for entry in group.entries:
+                    try:
+                        stat = os.stat(entry["file_path"])
+                    except FileNotFoundError:
+                        continue
+                    if stat.st_mtime < cutoff:
+                        try:
+                            os.remove(entry["file_path"])
+                        except FileNotFoundError:
+                            continue
+                        deleted += 1
+                        freed += stat.st_size
+                        continue
+                    kept.append(entry)
+
+            kept.sort(key=lambda entry: entry["created_at"])
+            self._write(kept)
+
+        return {"deleted": deleted, "bytes_freed": freed}
+
+    def rebuild(self) -> int:
+        """
+        Rebuild the manifest from the files in the exports directory.
+
+        Returns:
+            Number of exports indexed
+        """
+        with self._lock:
+            entries = self._scan()
+            self._write(entries)
+            return len(entries)
+
+    def _ensure_loaded(self):
+        """Load the manifest, reloading it if changed elsewhere (caller holds the lock)."""
+        if self._groups is not None and self._file_version() == self._version:
+            return
+
+        if not os.path.exists(self.manifest_path):
+            self._write(self._scan())
+            return
+
+        self._groups = {}
+        self._filenames = {}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self._add(json.loads(line))
+        self._version = self._file_version()
+
+    def _add(self, entry: Dict[str, Any]):
+        """Add an entry to the in-memory index."""
+        key = (entry["export_type"], entry["format"])
+        self._groups.setdefault(key, ExportGroup()).add(entry)
+        self._filenames[entry["filename"]] = key
+
+    def _write(self, entries: List[Dict[str, Any]]):
+        """Replace the manifest with entries (oldest first) and reindex them."""
+        os.makedirs(self.exports_dir, exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(temp_path, self.manifest_path)
+
+        self._groups = {}
+        self._filenames = {}
+        for entry in entries:
+            self._add(entry)
+        self._version = self._file_version()
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        """Describe the export files in the exports directory, oldest first."""
+        entries = []
+        if not os.path.isdir(self.exports_dir):
+            return entries
+
+        for item in os.scandir(self.exports_dir):
+            if not item.is_file() or item.name.startswith("."):
+                continue
+            stat = item.stat()
+            extension = item.name.split(".")[-1]
+            entries.append(
+                {
+                    "filename": item.name,
+                    "file_path": os.path.join(self.exports_dir, item.name),
+                    "file_size": stat.st_size,
+                    "export_type": _infer_export_type(item.name),
+                    "format": FORMATS_BY_EXTENSION.get(extension, extension),
+                    "created_at": utc_iso(stat.st_ctime),
+                }
+            )
+
+        entries.sort(key=lambda entry: entry["created_at"])
+        return entries
+
+    def _file_version(self) -> Optional[Tuple[int, int]]:
+        """Get (size, mtime) of the manifest file."""
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+
+# Singleton instance
+export_manifest = ExportManifest()
@@ -6,6 +6,7 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
+from services.anomaly_service import anomaly_service
 from services.csv_manager import csv_manager
 from services.categorizer import categorizer
 from services.statement_parser import StatementParser
@@ -293,6 +294,8 @@ class ImportService:
                     "errors": errors,
                 }
 
+            anomaly_service.observe()
+
         return {
             "success": True,
             "imported": imported,
@@ -454,6 +457,9 @@ class ImportService:
                 errors.append({"transaction": txn, "error": str(e)})
                 skipped_count += 1
 
+        if imported_count:
+            anomaly_service.observe()
+
         # Update import record
         import_record["status"] = "completed"
         import_record["imported_count"] = imported_count
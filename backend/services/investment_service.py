@@ -1,8 +1,10 @@
 """Investment management service."""
 
-from typing import List, Optional
+import math
+from typing import List, Optional, Tuple
 from datetime import date as date_type
 from fastapi import HTTPException
+import numpy as np
 
 from models.investment import (
     Investment,
@@ -11,17 +13,26 @@ from models.investment import (
     InvestmentTransaction,
     InvestmentTransactionCreate,
     InvestmentPerformance,
+    InvestmentPosition,
+    PositionLot,
     PriceUpdate,
     INVESTMENT_FIELDNAMES,
     INVESTMENT_TRANSACTION_FIELDNAMES,
 )
 from services.csv_manager import csv_manager
+from services.position_ledger import position_ledger, Position
 from utils.ids import generate_uuid
 from utils.dates import now_iso
 
 
 class InvestmentService:
-    """Service for managing investments and transactions."""
+    """
+    Service for managing investments and transactions.
+
+    The quantity and average_cost stored in investments.csv are the opening
+    holding. Current positions are derived from the opening holding plus the
+    trades in investment_transactions.csv by the position ledger.
+    """
 
     def __init__(self):
         """Initialize investment service and ensure CSV files exist."""
@@ -74,7 +85,18 @@ class InvestmentService:
 
             filtered.append(inv)
 
-        return [Investment.from_csv(inv) for inv in filtered]
+        positions = position_ledger.get_positions(investments)
+        return [self._to_investment(inv, positions[inv["id"]]) for inv in filtered]
+
+    def _to_investment(self, row: dict, position: Position) -> Investment:
+        """Build an Investment with its derived quantity and average cost."""
+        investment = Investment.from_csv(row)
+        return investment.model_copy(
+            update={
+                "quantity": position.quantity,
+                "average_cost": position.average_cost,
+            }
+        )
 
     def get_investment(self, investment_id: str) -> Investment:
         """
@@ -89,11 +111,18 @@ class InvestmentService:
         Raises:
             HTTPException: If investment not found
         """
+        return self._get_investment_with_position(investment_id)[0]
+
+    def _get_investment_with_position(
+        self, investment_id: str
+    ) -> Tuple[Investment, Position]:
+        """Get an investment together with its derived position."""
         investments = csv_manager.read_csv("investments.csv")
 
         for inv in investments:
             if inv.get("id") == investment_id:
-                return Investment.from_csv(inv)
+                position = position_ledger.get_positions(investments)[investment_id]
+                return self._to_investment(inv, position), position
 
         raise HTTPException(
             status_code=404, detail=f"Investment {investment_id} not found"
@@ -113,7 +142,8 @@ class InvestmentService:
 
         for inv in investments:
             if inv.get("symbol", "").upper() == symbol.upper():
-                return Investment.from_csv(inv)
+                positions = position_ledger.get_positions(investments)
+                return self._to_investment(inv, positions[inv["id"]])
 
         return None
 
@@ -156,6 +186,12 @@ class InvestmentService:
         """
         Update an investment.
 
+        Quantity and average_cost are derived from the opening holding and
+        the recorded transactions. Values equal to the derived ones are
+        ignored, so an edit form can send them back unchanged. Without
+        transactions, other values replace the opening holding; once
+        transactions exist, holdings change through buys and sells only.
+
         Args:
             investment_id: Investment ID
             investment_update: Update data
@@ -164,13 +200,17 @@ class InvestmentService:
             Updated Investment object
 
         Raises:
-            HTTPException: If investment not found
+            HTTPException: If investment not found, or quantity or
+                average_cost change after transactions were recorded
         """
         investments = csv_manager.read_csv("investments.csv")
         updated = False
 
         for inv in investments:
             if inv.get("id") == investment_id:
+                position = position_ledger.get_positions(investments)[investment_id]
+                self._check_holding_update(position, investment_update)
+
                 # Update fields
                 if investment_update.name is not None:
                     inv["name"] = investment_update.name
@@ -178,10 +218,7 @@ class InvestmentService:
                     inv["type"] = investment_update.type
                 if investment_update.currency is not None:
                     inv["currency"] = investment_update.currency.upper()
-                if investment_update.quantity is not None:
-                    inv["quantity"] = str(investment_update.quantity)
-                if investment_update.average_cost is not None:
-                    inv["average_cost"] = str(investment_update.average_cost)
+                self._update_opening_holding(inv, position, investment_update)
                 if investment_update.current_price is not None:
                     inv["current_price"] = str(investment_update.current_price)
                 if investment_update.last_updated is not None:
@@ -202,6 +239,50 @@ class InvestmentService:
 
         return self.get_investment(investment_id)
 
+    def _update_opening_holding(
+        self, inv: dict, position: Position, investment_update: InvestmentUpdate
+    ):
+        """
+        Apply quantity and average_cost to the opening holding.
+
+        Once transactions exist, the holding is derived from them and the
+        opening holding is left unchanged.
+        """
+        if position.trade_count > 0:
+            return
+
+        if investment_update.quantity is not None:
+            inv["quantity"] = str(investment_update.quantity)
+        if investment_update.average_cost is not None:
+            inv["average_cost"] = str(investment_update.average_cost)
+
+    def _check_holding_update(
+        self, position: Position, investment_update: InvestmentUpdate
+    ):
+        """
+        Reject changes to a holding derived from recorded transactions.
+
+        Raises:
+            HTTPException: If quantity or average_cost differ from the
+                derived position and the investment has transactions
+        """
+        if position.trade_count == 0:
+            return
+
+        for field, current in (
+            ("quantity", position.quantity),
+            ("average_cost", position.average_cost),
+        ):
+            value = getattr(investment_update, field)
+            if value is not None and not math.isclose(
+                value, current, rel_tol=1e-9, abs_tol=1e-9
+            ):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{field} is derived from the recorded transactions; "
+                    "record a buy or sell transaction to change it",
+                )
+
     def update_price(self, investment_id: str, price_update: PriceUpdate) -> Investment:
         """
         Update investment price.
@@ -320,7 +401,10 @@ class InvestmentService:
         self, transaction_data: InvestmentTransactionCreate
     ) -> InvestmentTransaction:
         """
-        Create a new investment transaction and update investment quantity/average cost.
+        Create a new investment transaction.
+
+        The trade is appended to the log; the investment's position is
+        derived from it on the next read.
 
         Args:
             transaction_data: Transaction creation data
@@ -329,7 +413,7 @@ class InvestmentService:
             Created InvestmentTransaction object
         """
         # Verify investment exists
-        investment = self.get_investment(transaction_data.investment_id)
+        self.get_investment(transaction_data.investment_id)
 
         # Generate ID and timestamps
         transaction_id = f"invtxn_{generate_uuid()[:8]}"
@@ -355,47 +439,13 @@ class InvestmentService:
             INVESTMENT_TRANSACTION_FIELDNAMES,
         )
 
-        # Update investment quantity and average cost
-        self._update_investment_from_transaction(investment, transaction_data)
-
         return InvestmentTransaction.from_csv(transaction_row)
 
-    def _update_investment_from_transaction(
-        self, investment: Investment, transaction: InvestmentTransactionCreate
-    ):
-        """
-        Update investment quantity and average cost based on transaction.
-
-        Args:
-            investment: Investment object
-            transaction: Transaction data
-        """
-        current_quantity = investment.quantity
-        current_avg_cost = investment.average_cost
-
-        if transaction.type == "buy":
-            # Calculate new average cost
-            total_cost = (
-                current_quantity * current_avg_cost
-            ) + transaction.total_amount
-            new_quantity = current_quantity + transaction.quantity
-            new_avg_cost = total_cost / new_quantity if new_quantity > 0 else 0
-
-            update_data = InvestmentUpdate(
-                quantity=new_quantity, average_cost=new_avg_cost
-            )
-        else:  # sell
-            # Reduce quantity, keep average cost the same
-            new_quantity = max(0, current_quantity - transaction.quantity)
-
-            update_data = InvestmentUpdate(quantity=new_quantity)
-
-        self.update_investment(investment.id, update_data)
-
     def delete_transaction(self, transaction_id: str) -> dict:
         """
         Delete an investment transaction.
-        Note: This does NOT reverse the quantity/cost changes.
+
+        The investment's position is re-derived without it.
 
         Args:
             transaction_id: Transaction ID
@@ -442,9 +492,9 @@ class InvestmentService:
         Returns:
             InvestmentPerformance object
         """
-        investment = self.get_investment(investment_id)
+        investment, position = self._get_investment_with_position(investment_id)
 
-        total_cost = investment.quantity * investment.average_cost
+        total_cost = position.cost_basis
         current_value = investment.quantity * investment.current_price
         profit_loss = current_value - total_cost
         profit_loss_percentage = (
@@ -464,7 +514,110 @@ class InvestmentService:
             profit_loss=profit_loss,
             profit_loss_percentage=profit_loss_percentage,
             currency=investment.currency,
+            realized_profit_loss=position.realized_profit_loss,
+            unrealized_profit_loss=profit_loss,
+        )
+
+    def get_performances(
+        self, type_filter: Optional[str] = None
+    ) -> List[InvestmentPerformance]:
+        """
+        Calculate performance metrics for all investments at once.
+
+        Loads investments and positions once and computes every row with
+        array operations.
+
+        Args:
+            type_filter: Filter by investment type
+
+        Returns:
+            List of InvestmentPerformance objects (in each investment's currency)
+        """
+        investments = csv_manager.read_csv("investments.csv")
+        positions = position_ledger.get_positions(investments)
+
+        if type_filter:
+            investments = [inv for inv in investments if inv.get("type") == type_filter]
+
+        if not investments:
+            return []
+
+        quantity = np.array([positions[inv["id"]].quantity for inv in investments])
+        total_cost = np.array([positions[inv["id"]].cost_basis for inv in investments])
+        average_cost = np.divide(
+            total_cost, quantity, out=np.zeros_like(total_cost), where=quantity > 0
+        )
+        current_price = np.array(
+            [float(inv.get("current_price") or 0) for inv in investments]
         )
+        current_value = quantity * current_price
+        profit_loss = current_value - total_cost
+        profit_loss_percentage = np.divide(
+            profit_loss * 100,
+            total_cost,
+            out=np.zeros_like(total_cost),
+            where=total_cost > 0,
+        )
+
+        return [
+            InvestmentPerformance(
+                investment_id=inv["id"],
+                symbol=inv.get("symbol", ""),
+                name=inv.get("name", ""),
+                type=inv.get("type", ""),
+                quantity=quantity[i],
+                average_cost=average_cost[i],
+                current_price=current_price[i],
+                total_cost=total_cost[i],
+                current_value=current_value[i],
+                profit_loss=profit_loss[i],
+                profit_loss_percentage=profit_loss_percentage[i],
+                currency=inv.get("currency", ""),
+                realized_profit_loss=positions[inv["id"]].realized_profit_loss,
+                unrealized_profit_loss=profit_loss[i],
+            )
+            for i, inv in enumerate(investments)
+        ]
+
+    # Positions
+
+    def get_position(self, investment_id: str) -> InvestmentPosition:
+        """
+        Get an investment position with its open FIFO lots.
+
+        Args:
+            investment_id: Investment ID
+
+        Returns:
+            InvestmentPosition object
+        """
+        investment, position = self._get_investment_with_position(investment_id)
+        current_value = position.quantity * investment.current_price
+
+        return InvestmentPosition(
+            investment_id=investment.id,
+            symbol=investment.symbol,
+            quantity=position.quantity,
+            average_cost=position.average_cost,
+            cost_basis=position.cost_basis,
+            current_price=investment.current_price,
+            current_value=current_value,
+            realized_profit_loss=position.realized_profit_loss,
+            unrealized_profit_loss=current_value - position.cost_basis,
+            fees=position.fees,
+            trade_count=position.trade_count,
+            lots=[PositionLot(**lot) for lot in position.lots],
+        )
+
+    def rebuild_positions(self) -> dict:
+        """
+        Rebuild all positions from the transaction log.
+
+        Returns:
+            Number of positions and trades folded
+        """
+        investments = csv_manager.read_csv("investments.csv")
+        return position_ledger.rebuild(investments)
 
 
 # Singleton instance
@@ -1,8 +1,13 @@
 """PDF export service for generating formatted PDF reports."""
 
+import multiprocessing
 import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, date as date_type
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -16,14 +21,89 @@ from reportlab.platypus import (
     PageBreak,
 )
 from reportlab.platypus.flowables import HRFlowable
+import pypdfium2 as pdfium
 
 from models.export import ExportConfig
+from models.transaction import TransactionFilter
 from services.csv_manager import csv_manager
 from services.calculator import calculator
 from services.debt_service import debt_service
 from services.portfolio_service import portfolio_service
+from services.transaction_query_service import transaction_query_service
 from utils.dates import now_iso, get_current_month
 
+# Transaction rows per table (with its header row, one A4 page)
+ROWS_PER_TABLE = 34
+
+# Transaction reports with this many rows are rendered in parallel sections
+PARALLEL_MIN_ROWS = 5000
+
+# Transaction rows per parallel section
+SECTION_ROWS = ROWS_PER_TABLE * 60
+
+TRANSACTION_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f3f4f6")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.HexColor("#1f2937")),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+        ("ALIGN", (-1, 0), (-1, -1), "RIGHT"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 10),
+        ("FONTSIZE", (0, 1), (-1, -1), 9),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
+        ("TOPPADDING", (0, 1), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 1), (-1, -1), 4),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#e5e7eb")),
+        (
+            "ROWBACKGROUNDS",
+            (0, 1),
+            (-1, -1),
+            [colors.white, colors.HexColor("#f9fafb")],
+        ),
+    ]
+)
+
+
+def _transaction_tables(rows: List[List[str]]) -> List[Table]:
+    """
+    Split transaction rows into page-sized tables.
+
+    Table layout cost grows faster than linearly with the number of rows,
+    so a long report is laid out as many small tables (each repeating the
+    header row) instead of one table spanning every page.
+    """
+    tables = []
+    for start in range(0, len(rows), ROWS_PER_TABLE):
+        table = Table(
+            [["Date", "Description", "Category", "Account", "Amount"]]
+            + rows[start : start + ROWS_PER_TABLE],
+            colWidths=[1 * inch, 2 * inch, 1.5 * inch, 1.5 * inch, 1.5 * inch],
+            repeatRows=1,
+        )
+        table.setStyle(TRANSACTION_TABLE_STYLE)
+        tables.append(table)
+
+    return tables
+
+
+def _render_transaction_section(
+    task: Tuple[str, Tuple[float, float], List[List[str]]]
+) -> str:
+    """Render one section of transaction tables to a PDF (runs in a worker process)."""
+    filepath, pagesize, rows = task
+
+    doc = SimpleDocTemplate(
+        filepath,
+        pagesize=pagesize,
+        rightMargin=0.75 * inch,
+        leftMargin=0.75 * inch,
+        topMargin=0.75 * inch,
+        bottomMargin=0.75 * inch,
+    )
+    doc.build(_transaction_tables(rows))
+
+    return filepath
+
 
 class PDFExportService:
     """Service for generating PDF exports."""
@@ -32,12 +112,30 @@ class PDFExportService:
         """Initialize PDF export service."""
         self.exports_dir = "exports"
         self._ensure_exports_dir()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
 
     def _ensure_exports_dir(self):
         """Ensure exports directory exists."""
         if not os.path.exists(self.exports_dir):
             os.makedirs(self.exports_dir)
 
+    def _section_pool(self) -> ProcessPoolExecutor:
+        """
+        Get the process pool rendering report sections, created on first use.
+
+        Workers are spawned rather than forked, since forking the threaded
+        server can copy locks held by other threads into the child, and the
+        pool is kept for later reports instead of started per report.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
     def _get_page_size(self, config: ExportConfig):
         """Get page size from config."""
         return letter if config.page_size == "Letter" else A4
@@ -109,47 +207,25 @@ class PDFExportService:
         category_id: Optional[str],
         transaction_type: Optional[str],
         config: ExportConfig,
+        progress: Optional[Callable[[float], None]] = None,
     ) -> str:
         """
         Export transactions to PDF.
 
+        Args:
+            progress: Called with the fraction of sections rendered so far
+                (long reports only)
+
         Returns:
             File path of generated PDF
         """
-        # Load data
-        transactions = csv_manager.read_csv("transactions.csv")
-        accounts = csv_manager.read_csv("accounts.csv")
-        categories = csv_manager.read_csv("categories.csv")
-
-        # Create account and category lookup
-        account_map = {acc["id"]: acc["name"] for acc in accounts}
-        category_map = {cat["id"]: cat["name"] for cat in categories}
-
-        # Filter transactions
-        filtered = []
-        for txn in transactions:
-            # Date filter
-            if start_date and txn.get("date", "") < str(start_date):
-                continue
-            if end_date and txn.get("date", "") > str(end_date):
-                continue
-
-            # Account filter
-            if account_id and txn.get("account_id") != account_id:
-                continue
-
-            # Category filter
-            if category_id and txn.get("category_id") != category_id:
-                continue
-
-            # Type filter
-            if transaction_type and txn.get("type") != transaction_type:
-                continue
-
-            filtered.append(txn)
-
-        # Sort by date descending
-        filtered.sort(key=lambda x: x.get("date", ""), reverse=True)
+        filters = TransactionFilter(
+            start_date=start_date,
+            end_date=end_date,
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=transaction_type,
+        )
 
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -183,15 +259,10 @@ class PDFExportService:
         elements.extend(self._create_header(config, "Transactions", subtitle))
 
         # Summary
-        total_income = sum(
-            float(t.get("amount", 0)) for t in filtered if t.get("type") == "income"
-        )
-        total_expenses = sum(
-            abs(float(t.get("amount", 0)))
-            for t in filtered
-            if t.get("type") == "expense"
-        )
-        net = total_income - total_expenses
+        totals = transaction_query_service.get_totals(filters)
+        total_income = totals["income"]
+        total_expenses = totals["expenses"]
+        net = totals["net"]
 
         summary_data = [
             ["Total Income:", self._format_currency(total_income, config)],
@@ -213,67 +284,99 @@ class PDFExportService:
         elements.append(summary_table)
         elements.append(Spacer(1, 20))
 
-        # Transactions table
-        if filtered:
-            table_data = [["Date", "Description", "Category", "Account", "Amount"]]
+        # Transactions table, rendered in page-sized chunks
+        rows = []
+        for txn in transaction_query_service.query(filters):
+            amount = float(txn.get("amount", 0))
+            amount_str = self._format_currency(abs(amount), config)
+            if txn.get("type") == "expense":
+                amount_str = f"({amount_str})"
 
-            for txn in filtered:
-                amount = float(txn.get("amount", 0))
-                amount_str = self._format_currency(abs(amount), config)
-                if txn.get("type") == "expense":
-                    amount_str = f"({amount_str})"
-
-                table_data.append(
-                    [
-                        txn.get("date", ""),
-                        txn.get("description", "")[:30],
-                        category_map.get(txn.get("category_id", ""), "Unknown")[:20],
-                        account_map.get(txn.get("account_id", ""), "Unknown")[:20],
-                        amount_str,
-                    ]
-                )
-
-            transactions_table = Table(
-                table_data,
-                colWidths=[1 * inch, 2 * inch, 1.5 * inch, 1.5 * inch, 1.5 * inch],
-            )
-            transactions_table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f3f4f6")),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.HexColor("#1f2937")),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("ALIGN", (-1, 0), (-1, -1), "RIGHT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 10),
-                        ("FONTSIZE", (0, 1), (-1, -1), 9),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
-                        ("TOPPADDING", (0, 1), (-1, -1), 4),
-                        ("BOTTOMPADDING", (0, 1), (-1, -1), 4),
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#e5e7eb")),
-                        (
-                            "ROWBACKGROUNDS",
-                            (0, 1),
-                            (-1, -1),
-                            [colors.white, colors.HexColor("#f9fafb")],
-                        ),
-                    ]
-                )
+            rows.append(
+                [
+                    txn.get("date", ""),
+                    txn.get("description", "")[:30],
+                    txn["category_name"][:20],
+                    txn["account_name"][:20],
+                    amount_str,
+                ]
             )
-            elements.append(transactions_table)
-        else:
+
+        if not rows:
             styles = getSampleStyleSheet()
             elements.append(
                 Paragraph(
                     "No transactions found for the selected criteria.", styles["Normal"]
                 )
             )
-
-        # Build PDF
-        doc.build(elements)
+            doc.build(elements)
+        elif len(rows) < PARALLEL_MIN_ROWS:
+            elements.extend(_transaction_tables(rows))
+            doc.build(elements)
+        else:
+            self._build_sections(doc, elements, rows, filepath, progress)
 
         return filepath
 
+    def _build_sections(
+        self,
+        doc: SimpleDocTemplate,
+        elements: List,
+        rows: List[List[str]],
+        filepath: str,
+        progress: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Render a long transaction report as sections in parallel and join them.
+
+        The first section (with the header and summary elements) is built in
+        this process while the remaining SECTION_ROWS-row sections are
+        rendered to temporary PDFs by the section pool. Each section starts
+        on a new page. Progress is reported as sections are collected.
+        """
+        sections = [
+            rows[i : i + SECTION_ROWS] for i in range(0, len(rows), SECTION_ROWS)
+        ]
+        pool = self._section_pool()
+
+        with tempfile.TemporaryDirectory(dir=self.exports_dir) as temp_dir:
+            futures = [
+                pool.submit(
+                    _render_transaction_section,
+                    (os.path.join(temp_dir, f"section_{i}.pdf"), doc.pagesize, section),
+                )
+                for i, section in enumerate(sections[1:], start=1)
+            ]
+
+            try:
+                first_path = os.path.join(temp_dir, "section_0.pdf")
+                doc.filename = first_path
+                doc.build(elements + _transaction_tables(sections[0]))
+                section_paths = [first_path]
+                for future in futures:
+                    if progress:
+                        progress(len(section_paths) / len(sections))
+                    section_paths.append(future.result())
+                if progress:
+                    progress(1.0)
+            except BrokenProcessPool:
+                # A worker died; start a new pool for the next report
+                with self._pool_lock:
+                    if self._pool is pool:
+                        self._pool = None
+                raise
+            finally:
+                for future in futures:
+                    future.cancel()
+
+            merged = pdfium.PdfDocument.new()
+            for path in section_paths:
+                section_pdf = pdfium.PdfDocument(path)
+                merged.import_pages(section_pdf)
+                section_pdf.close()
+            merged.save(filepath)
+            merged.close()
+
     def export_financial_summary_pdf(self, config: ExportConfig) -> str:
         """
         Export financial summary to PDF.
@@ -551,8 +654,14 @@ class PDFExportService:
                 ]
             ]
 
+            performances = {
+                p.investment_id: p
+                for p in investment_service.get_performances(
+                    type_filter=investment_type
+                )
+            }
             for inv in investments:
-                perf = investment_service.get_investment_performance(inv.id)
+                perf = performances[inv.id]
 
                 table_data.append(
                     [
@@ -1,30 +1,147 @@
 """Portfolio analytics and performance calculation service."""
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import defaultdict
 
+import numpy as np
+
 from models.investment import PortfolioSummary, InvestmentPerformance
+from services.csv_manager import csv_manager
+from services.currency_service import currency_service
 from services.investment_service import investment_service
 
 
 class PortfolioService:
     """Service for portfolio analytics and performance metrics."""
 
-    def get_portfolio_summary(self, base_currency: str = "USD") -> PortfolioSummary:
+    def __init__(self):
+        """Initialize portfolio service."""
+        # Summaries by base currency, valid for one version of the input files
+        self._summary_cache: Dict[str, PortfolioSummary] = {}
+        self._summary_cache_version: Optional[tuple] = None
+
+    def get_performances(
+        self, base_currency: str, type_filter: Optional[str] = None
+    ) -> List[InvestmentPerformance]:
+        """
+        Value all holdings in the base currency in one batch.
+
+        Performance rows come from a single load of the holdings, and all
+        amounts are converted with one lookup of the latest exchange rates.
+        Holdings without a rate to the base currency are left unconverted
+        and keep their own currency.
+
+        Args:
+            base_currency: Currency to report amounts in
+            type_filter: Filter by investment type
+
+        Returns:
+            List of InvestmentPerformance objects in base currency
+        """
+        performances = investment_service.get_performances(type_filter=type_filter)
+        if not performances:
+            return []
+
+        rates = currency_service.get_latest_rates(
+            {p.currency for p in performances}, base_currency
+        )
+        converted = np.array([p.currency.upper() in rates for p in performances])
+        rate = np.array(
+            [rates.get(p.currency.upper(), 1.0) for p in performances], dtype=float
+        )
+
+        average_cost = np.array([p.average_cost for p in performances]) * rate
+        current_price = np.array([p.current_price for p in performances]) * rate
+        total_cost = np.array([p.total_cost for p in performances]) * rate
+        current_value = np.array([p.current_value for p in performances]) * rate
+        realized = np.array([p.realized_profit_loss for p in performances]) * rate
+        profit_loss = current_value - total_cost
+
+        return [
+            p.model_copy(
+                update={
+                    "average_cost": average_cost[i],
+                    "current_price": current_price[i],
+                    "total_cost": total_cost[i],
+                    "current_value": current_value[i],
+                    "profit_loss": profit_loss[i],
+                    "unrealized_profit_loss": profit_loss[i],
+                    "realized_profit_loss": realized[i],
+                    "currency": base_currency if converted[i] else p.currency,
+                }
+            )
+            for i, p in enumerate(performances)
+        ]
+
+    def _resolve_base_currency(self, base_currency: Optional[str]) -> str:
+        """Return the requested base currency, or the one from settings."""
+        if base_currency:
+            return base_currency
+        settings = csv_manager.read_json("settings.json")
+        return settings.get("base_currency", "ZAR")
+
+    def get_portfolio_summary(
+        self, base_currency: Optional[str] = None
+    ) -> PortfolioSummary:
         """
         Get comprehensive portfolio summary with performance metrics.
 
+        Summaries are cached until investments, investment transactions or
+        exchange rates change.
+
         Args:
-            base_currency: Base currency for reporting (default: USD)
+            base_currency: Base currency for reporting (default: settings
+                base currency)
 
         Returns:
             PortfolioSummary object with all metrics
         """
-        investments = investment_service.list_investments()
+        base_currency = self._resolve_base_currency(base_currency)
+        version = tuple(
+            csv_manager.get_file_version(filename)
+            for filename in [
+                "investments.csv",
+                "investment_transactions.csv",
+                "exchange_rates.csv",
+            ]
+        )
+        if version != self._summary_cache_version:
+            self._summary_cache = {}
+            self._summary_cache_version = version
+
+        if base_currency not in self._summary_cache:
+            self._summary_cache[base_currency] = self._build_portfolio_summary(
+                base_currency
+            )
 
-        if not investments:
+        return self._summary_cache[base_currency]
+
+    def _build_portfolio_summary(self, base_currency: str) -> PortfolioSummary:
+        """
+        Build the portfolio summary from one batch valuation.
+
+        Holdings without an exchange rate to the base currency are left out
+        of the totals, allocation and performers. They are listed by symbol
+        in unconverted_investments and totalled in their own currency in
+        unconverted_totals.
+        """
+        performances = self.get_performances(base_currency)
+        holdings = len(performances)
+        unconverted = [p for p in performances if p.currency != base_currency]
+        performances = [p for p in performances if p.currency == base_currency]
+
+        unconverted_totals = defaultdict(
+            lambda: {"count": 0, "total_value": 0.0, "total_cost": 0.0}
+        )
+        for perf in unconverted:
+            unconverted_totals[perf.currency]["count"] += 1
+            unconverted_totals[perf.currency]["total_value"] += perf.current_value
+            unconverted_totals[perf.currency]["total_cost"] += perf.total_cost
+        unconverted_symbols = [p.symbol for p in unconverted]
+
+        if not performances:
             return PortfolioSummary(
-                total_investments=0,
+                total_investments=holdings,
                 total_value=0.0,
                 total_cost=0.0,
                 total_profit_loss=0.0,
@@ -33,20 +150,13 @@ class PortfolioService:
                 by_type={},
                 top_performers=[],
                 worst_performers=[],
+                unconverted_investments=unconverted_symbols,
+                unconverted_totals=dict(unconverted_totals),
             )
 
-        # Calculate performance for each investment
-        performances: List[InvestmentPerformance] = []
-        for inv in investments:
-            try:
-                perf = investment_service.get_investment_performance(inv.id)
-                performances.append(perf)
-            except Exception:
-                continue
-
         # Calculate totals
-        total_value = sum(p.current_value for p in performances)
-        total_cost = sum(p.total_cost for p in performances)
+        total_value = float(sum(p.current_value for p in performances))
+        total_cost = float(sum(p.total_cost for p in performances))
         total_profit_loss = total_value - total_cost
         total_profit_loss_percentage = (
             (total_profit_loss / total_cost * 100) if total_cost > 0 else 0
@@ -83,7 +193,7 @@ class PortfolioService:
         ]
 
         return PortfolioSummary(
-            total_investments=len(performances),
+            total_investments=holdings,
             total_value=total_value,
             total_cost=total_cost,
             total_profit_loss=total_profit_loss,
@@ -92,6 +202,8 @@ class PortfolioService:
             by_type=by_type,
             top_performers=top_performers,
             worst_performers=worst_performers,
+            unconverted_investments=unconverted_symbols,
+            unconverted_totals=dict(unconverted_totals),
         )
 
     def _calculate_asset_allocation(
@@ -133,25 +245,32 @@ class PortfolioService:
 
         return dict(allocation)
 
-    def get_asset_allocation(self) -> Dict[str, float]:
+    def get_asset_allocation(
+        self, base_currency: Optional[str] = None
+    ) -> Dict[str, float]:
         """
         Get simple asset allocation percentages by type.
 
+        Args:
+            base_currency: Base currency for reporting (default: settings
+                base currency)
+
         Returns:
             Dictionary mapping investment type to percentage
         """
-        summary = self.get_portfolio_summary()
+        summary = self.get_portfolio_summary(base_currency)
 
         return {
             inv_type: data["percentage"] for inv_type, data in summary.by_type.items()
         }
 
-    def get_total_portfolio_value(self, base_currency: str = "USD") -> float:
+    def get_total_portfolio_value(self, base_currency: Optional[str] = None) -> float:
         """
         Get total portfolio value.
 
         Args:
-            base_currency: Base currency for reporting
+            base_currency: Base currency for reporting (default: settings
+                base currency)
 
         Returns:
             Total portfolio value
@@ -159,12 +278,15 @@ class PortfolioService:
         summary = self.get_portfolio_summary(base_currency)
         return summary.total_value
 
-    def get_portfolio_profit_loss(self, base_currency: str = "USD") -> Dict[str, float]:
+    def get_portfolio_profit_loss(
+        self, base_currency: Optional[str] = None
+    ) -> Dict[str, float]:
         """
         Get portfolio profit/loss metrics.
 
         Args:
-            base_currency: Base currency for reporting
+            base_currency: Base currency for reporting (default: settings
+                base currency)
 
         Returns:
             Dictionary with profit/loss metrics
@@ -176,7 +298,7 @@ class PortfolioService:
             "total_value": summary.total_value,
             "profit_loss": summary.total_profit_loss,
             "profit_loss_percentage": summary.total_profit_loss_percentage,
-            "currency": base_currency,
+            "currency": summary.currency,
         }
 
     def get_investments_by_type(
@@ -191,15 +313,7 @@ class PortfolioService:
         Returns:
             List of InvestmentPerformance objects
         """
-        investments = investment_service.list_investments(type_filter=investment_type)
-
-        performances = []
-        for inv in investments:
-            try:
-                perf = investment_service.get_investment_performance(inv.id)
-                performances.append(perf)
-            except Exception:
-                continue
+        performances = investment_service.get_performances(type_filter=investment_type)
 
         # Sort by current value descending
         performances.sort(key=lambda p: p.current_value, reverse=True)
@@ -0,0 +1,314 @@
+"""Event-sourced investment positions with FIFO lot tracking."""
+
+import threading
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+from services.csv_manager import csv_manager
+
+# Persisted snapshot of the folded positions
+POSITIONS_FILE = "investment_positions.json"
+
+# Persist the snapshot after this many incrementally applied trades
+PERSIST_EVERY = 100
+
+
+def _opening(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the opening position recorded on an investments.csv row."""
+    return {
+        "quantity": float(row.get("quantity") or 0),
+        "average_cost": float(row.get("average_cost") or 0),
+        "date": (row.get("created_at") or "")[:10],
+    }
+
+
+class Position:
+    """Position in one investment, folded from its trades."""
+
+    def __init__(self, investment_id: str, opening: Dict[str, Any]):
+        """Open a position from the opening holding."""
+        self.investment_id = investment_id
+        self.opening = opening
+        self.lots: deque = deque()
+        self.quantity = 0.0
+        self.cost_basis = 0.0
+        self.realized_profit_loss = 0.0
+        self.fees = 0.0
+        self.trade_count = 0
+        self.last_trade_date = ""
+
+        if opening["quantity"] > 0:
+            self._add_lot(
+                opening["quantity"], opening["average_cost"], opening["date"], None
+            )
+
+    @property
+    def average_cost(self) -> float:
+        """Average cost per unit of the open lots."""
+        return self.cost_basis / self.quantity if self.quantity > 0 else 0.0
+
+    def _add_lot(
+        self,
+        quantity: float,
+        unit_cost: float,
+        date: str,
+        transaction_id: Optional[str],
+    ):
+        self.lots.append(
+            {
+                "quantity": quantity,
+                "unit_cost": unit_cost,
+                "date": date,
+                "transaction_id": transaction_id,
+            }
+        )
+        self.quantity += quantity
+        self.cost_basis += quantity * unit_cost
+
+    def apply(self, trade: Dict[str, Any]):
+        """
+        Apply one trade row from investment_transactions.csv.
+
+        Buys open a lot at total_amount / quantity (fees included in cost).
+        Sells consume lots first-in first-out and realize the difference
+        between net proceeds and the consumed cost. Quantity sold beyond the
+        holding is ignored. The opening lot is consumed first and is dated
+        no later than the earliest trade.
+        """
+        quantity = float(trade.get("quantity") or 0)
+        total_amount = float(trade.get("total_amount") or 0)
+        self.fees += float(trade.get("fees") or 0)
+        self.trade_count += 1
+        self.last_trade_date = max(self.last_trade_date, trade.get("date", ""))
+
+        # The opening holding precedes every trade, even back-dated ones
+        date = trade.get("date") or ""
+        if date and self.lots and self.lots[0]["transaction_id"] is None:
+            self.lots[0]["date"] = min(self.lots[0]["date"], date)
+
+        if quantity <= 0:
+            return
+
+        if trade.get("type") == "buy":
+            self._add_lot(
+                quantity,
+                total_amount / quantity,
+                trade.get("date", ""),
+                trade.get("id"),
+            )
+            return
+
+        remaining = quantity
+        consumed_cost = 0.0
+        while remaining > 1e-12 and self.lots:
+            lot = self.lots[0]
+            take = min(lot["quantity"], remaining)
+            consumed_cost += take * lot["unit_cost"]
+            lot["quantity"] -= take
+            remaining -= take
+            if lot["quantity"] <= 1e-12:
+                self.lots.popleft()
+
+        sold = quantity - remaining
+        self.quantity = max(0.0, self.quantity - sold)
+        self.cost_basis = max(0.0, self.cost_basis - consumed_cost)
+        if not self.lots:
+            self.quantity = 0.0
+            self.cost_basis = 0.0
+        self.realized_profit_loss += total_amount * (sold / quantity) - consumed_cost
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the position."""
+        return {
+            "investment_id": self.investment_id,
+            "opening": self.opening,
+            "quantity": self.quantity,
+            "average_cost": self.average_cost,
+            "cost_basis": self.cost_basis,
+            "realized_profit_loss": self.realized_profit_loss,
+            "fees": self.fees,
+            "trade_count": self.trade_count,
+            "last_trade_date": self.last_trade_date,
+            "lots": list(self.lots),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Position":
+        """Restore a serialized position."""
+        position = cls(data["investment_id"], {**data["opening"], "quantity": 0})
+        position.opening = data["opening"]
+        position.lots = deque(data["lots"])
+        position.quantity = data["quantity"]
+        position.cost_basis = data["cost_basis"]
+        position.realized_profit_loss = data["realized_profit_loss"]
+        position.fees = data["fees"]
+        position.trade_count = data["trade_count"]
+        position.last_trade_date = data["last_trade_date"]
+        return position
+
+
+class PositionLedger:
+    """
+    Derives investment positions from investment_transactions.csv.
+
+    Positions are a fold over the trade log, starting from the opening
+    holding stored on each investments.csv row. The folded state is cached
+    in memory together with a read cursor into the trade log, so each read
+    only applies rows appended since the last one (O(1) per new trade). A
+    rewritten log (e.g. after a delete), a back-dated trade or a changed
+    opening holding triggers a full deterministic rebuild, which applies
+    trades in (date, recording order).
+    """
+
+    def __init__(self):
+        """Initialize position ledger."""
+        self._lock = threading.Lock()
+        self._positions: Optional[Dict[str, Position]] = None
+        self._cursor: Optional[Dict[str, Any]] = None
+        self._pending = 0
+
+    def get_positions(
+        self, investment_rows: List[Dict[str, Any]]
+    ) -> Dict[str, Position]:
+        """
+        Get up-to-date positions for investments.
+
+        Args:
+            investment_rows: Rows from investments.csv
+
+        Returns:
+            Dictionary mapping investment ID to Position
+        """
+        openings = {row["id"]: _opening(row) for row in investment_rows}
+
+        with self._lock:
+            if self._positions is None:
+                self._load_snapshot()
+
+            if not self._sync(openings):
+                self._rebuild(openings)
+
+            return {
+                investment_id: self._positions.get(investment_id)
+                or Position(investment_id, opening)
+                for investment_id, opening in openings.items()
+            }
+
+    def rebuild(self, investment_rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Rebuild all positions from scratch.
+
+        Args:
+            investment_rows: Rows from investments.csv
+
+        Returns:
+            Number of positions and trades folded
+        """
+        openings = {row["id"]: _opening(row) for row in investment_rows}
+
+        with self._lock:
+            self._rebuild(openings)
+            return {
+                "positions": len(self._positions),
+                "trades": sum(p.trade_count for p in self._positions.values()),
+            }
+
+    def _sync(self, openings: Dict[str, Dict[str, Any]]) -> bool:
+        """Apply newly appended trades. Returns False if a rebuild is needed."""
+        if self._cursor is None:
+            return False
+
+        for investment_id, position in self._positions.items():
+            if (
+                investment_id in openings
+                and position.opening != openings[investment_id]
+            ):
+                return False
+
+        rows, cursor, continuation = csv_manager.read_csv_since(
+            "investment_transactions.csv", self._cursor
+        )
+        if not continuation:
+            return False
+
+        for row in rows:
+            position = self._positions.get(row.get("investment_id"))
+            if position is None:
+                opening = openings.get(row.get("investment_id"))
+                if opening is None:
+                    # Trade for an unknown investment, fold it on rebuild
+                    return False
+                position = Position(row["investment_id"], opening)
+                self._positions[row["investment_id"]] = position
+            elif row.get("date", "") < position.last_trade_date:
+                # Back-dated trade changes FIFO order
+                return False
+            position.apply(row)
+
+        self._cursor = cursor
+        self._pending += len(rows)
+        if self._pending >= PERSIST_EVERY:
+            self._save_snapshot()
+
+        return True
+
+    def _rebuild(self, openings: Dict[str, Dict[str, Any]]):
+        """Fold the whole trade log into fresh positions."""
+        rows, cursor, _ = csv_manager.read_csv_since("investment_transactions.csv")
+
+        positions: Dict[str, Position] = {}
+        ordered = sorted(
+            enumerate(rows), key=lambda item: (item[1].get("date", ""), item[0])
+        )
+        for _, row in ordered:
+            investment_id = row.get("investment_id")
+            if investment_id not in openings:
+                continue
+            if investment_id not in positions:
+                positions[investment_id] = Position(
+                    investment_id, openings[investment_id]
+                )
+            positions[investment_id].apply(row)
+
+        for investment_id, opening in openings.items():
+            if investment_id not in positions:
+                positions[investment_id] = Position(investment_id, opening)
+
+        self._positions = positions
+        self._cursor = cursor
+        self._save_snapshot()
+
+    def _load_snapshot(self):
+        """Load the persisted snapshot, if any."""
+        self._positions = {}
+        self._cursor = None
+
+        try:
+            snapshot = csv_manager.read_json(POSITIONS_FILE)
+        except Exception:
+            return
+
+        if snapshot.get("cursor") and snapshot.get("positions") is not None:
+            self._positions = {
+                investment_id: Position.from_dict(data)
+                for investment_id, data in snapshot["positions"].items()
+            }
+            self._cursor = snapshot["cursor"]
+
+    def _save_snapshot(self):
+        """Persist the folded positions with their cursor."""
+        csv_manager.write_json(
+            POSITIONS_FILE,
+            {
+                "cursor": self._cursor,
+                "positions": {
+                    investment_id: position.to_dict()
+                    for investment_id, position in self._positions.items()
+                },
+            },
+        )
+        self._pending = 0
+
+
+# Singleton instance
+position_ledger = PositionLedger()
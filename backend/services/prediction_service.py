@@ -11,6 +11,10 @@ from services.csv_manager import csv_manager
 from services.currency_service import currency_service
 
 
+# Supported forecast methods
+FORECAST_METHODS = ["moving_average", "linear_regression", "seasonal"]
+
+
 class PredictionService:
     """Service for predicting future financial metrics."""
 
@@ -71,6 +75,27 @@ class PredictionService:
         # Get historical data
         historical_data = self._get_historical_monthly_data(metric, base_currency)
 
+        return self.predict_from_history(metric, historical_data, periods_ahead, method)
+
+    def predict_from_history(
+        self,
+        metric: str,
+        historical_data: List[Dict[str, Any]],
+        periods_ahead: int = 3,
+        method: str = "moving_average",
+    ) -> PredictionReport:
+        """
+        Predict future values for a metric from its monthly history.
+
+        Args:
+            metric: Metric name
+            historical_data: Sorted list of {"period": "YYYY-MM", "value": float}
+            periods_ahead: Number of months to predict
+            method: Prediction method (moving_average, linear_regression, seasonal)
+
+        Returns:
+            PredictionReport with predictions
+        """
         if len(historical_data) < 3:
             # Not enough data for predictions
             return PredictionReport(
@@ -78,16 +103,7 @@ class PredictionService:
             )
 
         # Generate predictions based on method
-        if method == "moving_average":
-            predictions = self._predict_moving_average(historical_data, periods_ahead)
-        elif method == "linear_regression":
-            predictions = self._predict_linear_regression(
-                historical_data, periods_ahead
-            )
-        elif method == "seasonal":
-            predictions = self._predict_seasonal(historical_data, periods_ahead)
-        else:
-            predictions = self._predict_moving_average(historical_data, periods_ahead)
+        predictions = self.predict_series(historical_data, periods_ahead, method)
 
         # Calculate historical accuracy
         accuracy = self._calculate_historical_accuracy(historical_data, method)
@@ -134,6 +150,29 @@ class PredictionService:
             historical_accuracy=None,
         )
 
+    def predict_series(
+        self,
+        historical_data: List[Dict[str, Any]],
+        periods_ahead: int,
+        method: str = "moving_average",
+    ) -> List[Prediction]:
+        """
+        Forecast a monthly series with the given method.
+
+        Args:
+            historical_data: Sorted list of {"period": "YYYY-MM", "value": float}
+            periods_ahead: Number of months to predict
+            method: Prediction method (falls back to moving_average if unknown)
+
+        Returns:
+            List of predictions
+        """
+        if method == "linear_regression":
+            return self._predict_linear_regression(historical_data, periods_ahead)
+        if method == "seasonal":
+            return self._predict_seasonal(historical_data, periods_ahead)
+        return self._predict_moving_average(historical_data, periods_ahead)
+
     # Prediction methods
 
     def _predict_moving_average(
@@ -3,8 +3,10 @@
 from datetime import datetime, timedelta, date
 from dateutil.relativedelta import relativedelta
 from typing import List, Optional, Dict, Any
+import re
 import uuid
 
+from services.anomaly_service import anomaly_service
 from services.csv_manager import csv_manager
 from models.recurring_transaction import (
     RecurringTransaction,
@@ -13,6 +15,19 @@ from models.recurring_transaction import (
 )
 from models.transaction import TransactionCreate
 
+# Nominal length in days of each recurrence frequency
+FREQUENCY_DAYS = {
+    "daily": 1,
+    "weekly": 7,
+    "biweekly": 14,
+    "monthly": 30.44,
+    "quarterly": 91.31,
+    "yearly": 365.25,
+}
+
+# Characters not allowed in recurring transaction ID slugs (e.g. "#", "/")
+UNSAFE_ID_CHARS = re.compile(r"[^a-z0-9]+")
+
 
 class RecurringTransactionService:
     """Service for managing recurring transactions."""
@@ -81,7 +96,8 @@ class RecurringTransactionService:
     ) -> RecurringTransaction:
         """Create a new recurring transaction."""
         now = datetime.utcnow().isoformat() + "Z"
-        recurring_id = f"rec_{recurring_data.name.lower().replace(' ', '-')}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+        slug = UNSAFE_ID_CHARS.sub("-", recurring_data.name.lower()).strip("-")
+        recurring_id = f"rec_{slug}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
 
         # Calculate next due date
         next_due = self._calculate_next_due(
@@ -302,6 +318,9 @@ class RecurringTransactionService:
             csv_manager.append("transactions.csv", transaction)
             generated.append(transaction)
 
+        if generated:
+            anomaly_service.observe()
+
         return generated
 
 
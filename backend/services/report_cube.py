@@ -0,0 +1,213 @@
+"""Precomputed year x month x category x sign aggregates of transactions."""
+
+import threading
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+from services.csv_manager import csv_manager
+
+# Sign of a transaction amount: income (> 0), expense (< 0) or zero
+INCOME = 1
+EXPENSE = -1
+ZERO = 0
+
+
+def _new_cell() -> Dict[int, List[float]]:
+    """Create an empty aggregate cell: sign -> [sum of amounts, count]."""
+    return {INCOME: [0.0, 0], EXPENSE: [0.0, 0], ZERO: [0.0, 0]}
+
+
+def _parse_month(date_str: str) -> Optional[Tuple[int, int]]:
+    """Get (year, month) of an ISO date, or None if it cannot be parsed."""
+    try:
+        date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+    return date.year, date.month
+
+
+def _copy_cell(cell: Dict[int, List[float]]) -> Dict[int, List[float]]:
+    """Copy an aggregate cell."""
+    return {sign: list(total) for sign, total in cell.items()}
+
+
+def _writable(
+    container: Dict,
+    key: Any,
+    scope: Any,
+    copied: Optional[Set[Tuple]],
+    new: Callable[[], Any],
+    copy: Callable[[Any], Any],
+) -> Any:
+    """
+    Get a value to modify, creating it if missing.
+
+    With a copied set, a value not created or copied in this pass (scope and
+    key not in copied) may be shared with another cube and is copied first.
+    """
+    value = container.get(key)
+    if value is None:
+        value = container[key] = new()
+    elif copied is not None and (scope, key) not in copied:
+        value = container[key] = copy(value)
+    if copied is not None:
+        copied.add((scope, key))
+    return value
+
+
+class ReportCube:
+    """
+    Sums and counts of transaction amounts by year, month, category and sign.
+
+    Built in one pass over transactions.csv and extended with appended rows.
+    Aggregates are kept per cell, per month and per year, each accumulated
+    in file order, so totals match summing the matching rows directly.
+    """
+
+    def __init__(self, transactions: List[Dict[str, str]]):
+        """Build the cube from transactions.csv rows."""
+        self.cells: Dict[Tuple[int, int], Dict[str, Dict[int, List[float]]]] = {}
+        self.month_totals: Dict[Tuple[int, int], Dict[int, List[float]]] = {}
+        self.year_totals: Dict[int, Dict[int, List[float]]] = {}
+        self._fold(transactions)
+
+    def extended(self, transactions: List[Dict[str, str]]) -> "ReportCube":
+        """
+        Get a copy of the cube with appended rows (in file order) folded in.
+
+        Only the cells the rows touch are copied, and the cube itself is
+        left untouched, so reports iterating over it while transactions
+        are written stay consistent.
+        """
+        cube = ReportCube.__new__(ReportCube)
+        cube.cells = dict(self.cells)
+        cube.month_totals = dict(self.month_totals)
+        cube.year_totals = dict(self.year_totals)
+        cube._fold(transactions, copied=set())
+        return cube
+
+    def _fold(
+        self, transactions: List[Dict[str, str]], copied: Optional[Set[Tuple]] = None
+    ):
+        """
+        Fold transactions.csv rows (in file order) into the cube.
+
+        Args:
+            transactions: Rows to fold
+            copied: Keys of the cells already copied by this pass (None when
+                the cube shares no cells with another cube)
+        """
+        for tx in transactions:
+            period = _parse_month(tx.get("date", ""))
+            if period is None:
+                continue
+
+            amount = float(tx["amount"])
+            sign = INCOME if amount > 0 else EXPENSE if amount < 0 else ZERO
+
+            month_cells = _writable(self.cells, period, "month", copied, dict, dict)
+            cells = (
+                _writable(
+                    month_cells,
+                    tx.get("category_id", ""),
+                    period,
+                    copied,
+                    _new_cell,
+                    _copy_cell,
+                ),
+                _writable(
+                    self.month_totals, period, "total", copied, _new_cell, _copy_cell
+                ),
+                _writable(
+                    self.year_totals, period[0], "year", copied, _new_cell, _copy_cell
+                ),
+            )
+            for cell in cells:
+                cell[sign][0] += amount
+                cell[sign][1] += 1
+
+    def summarize(self, cell: Optional[Dict[int, List[float]]]) -> Dict[str, float]:
+        """Turn an aggregate cell into income/expenses totals and counts."""
+        cell = cell or _new_cell()
+        return {
+            "income": cell[INCOME][0],
+            "expenses": abs(cell[EXPENSE][0]),
+            "count": cell[INCOME][1] + cell[EXPENSE][1] + cell[ZERO][1],
+            "income_count": cell[INCOME][1],
+            "expense_count": cell[EXPENSE][1],
+        }
+
+    def month_summary(self, year: int, month: int) -> Dict[str, float]:
+        """Get income/expenses totals and counts for a month."""
+        return self.summarize(self.month_totals.get((year, month)))
+
+    def year_summary(self, year: int) -> Dict[str, float]:
+        """Get income/expenses totals and counts for a year."""
+        return self.summarize(self.year_totals.get(year))
+
+    def category_spending(self, year: int, month: int) -> Dict[str, Dict[str, float]]:
+        """
+        Get expense totals per category for a month.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+
+        Returns:
+            Dictionary mapping category_id to {"amount", "count"}, in order of
+            first appearance, for categories with expenses
+        """
+        return {
+            category_id: {
+                "amount": abs(cell[EXPENSE][0]),
+                "count": cell[EXPENSE][1],
+            }
+            for category_id, cell in self.cells.get((year, month), {}).items()
+            if cell[EXPENSE][1]
+        }
+
+    def months(self) -> List[Tuple[int, int, int]]:
+        """Get (year, month, transaction count) of non-empty months, newest first."""
+        return [
+            (year, month, self.summarize(self.month_totals[(year, month)])["count"])
+            for year, month in sorted(self.month_totals, reverse=True)
+        ]
+
+
+class ReportCubeService:
+    """
+    Keeps the report cube in step with transactions.csv.
+
+    Appended transactions are folded into a copy of the existing cube; the
+    cube is only rebuilt when the file was rewritten (updates, deletes).
+    """
+
+    def __init__(self):
+        """Initialize report cube service."""
+        self._lock = threading.Lock()
+        self._cube: Optional[ReportCube] = None
+        self._version: Optional[str] = None
+        self._cursor: Optional[Dict[str, Any]] = None
+
+    def get_cube(self) -> ReportCube:
+        """Get the report cube, updating it if transactions.csv changed."""
+        with self._lock:
+            version = csv_manager.get_file_version("transactions.csv")
+            if self._cube is not None and version == self._version:
+                return self._cube
+
+            rows, cursor, continuation = csv_manager.read_csv_since(
+                "transactions.csv", self._cursor
+            )
+            if self._cube is not None and continuation:
+                self._cube = self._cube.extended(rows)
+            else:
+                self._cube = ReportCube(rows)
+            self._cursor = cursor
+            self._version = version
+
+            return self._cube
+
+
+# Singleton instance
+report_cube_service = ReportCubeService()
@@ -1,10 +1,19 @@
 """Monthly report generation service."""
 
-from typing import Dict, List
-from datetime import datetime
-from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
 from services.csv_manager import csv_manager
 from services.budget_service import budget_service
+from services.report_cube import ReportCube, report_cube_service
+
+# Longest month range a batch report may span
+MAX_BATCH_MONTHS = 120
+
+
+def month_range(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """List the (year, month) pairs from start to end, inclusive."""
+    first = start[0] * 12 + start[1] - 1
+    last = end[0] * 12 + end[1] - 1
+    return [(index // 12, index % 12 + 1) for index in range(first, last + 1)]
 
 
 class ReportService:
@@ -25,36 +34,70 @@ class ReportService:
         Returns:
             Monthly report with income, expenses, categories, budget performance
         """
-        # Load data
-        transactions = csv_manager.read_csv("transactions.csv")
+        return self._build_monthly_report(
+            year,
+            month,
+            report_cube_service.get_cube(),
+            csv_manager.read_csv("categories.csv"),
+            csv_manager.read_csv("budgets.csv"),
+        )
+
+    def generate_batch_reports(
+        self, start: Tuple[int, int], end: Tuple[int, int]
+    ) -> Iterator[Dict]:
+        """
+        Generate monthly reports for a range of months plus YTD summaries.
+
+        All reports are answered from one snapshot of the report cube, with
+        categories and budgets loaded once, so the batch costs a single pass
+        over the data however many months it spans.
+
+        Args:
+            start: First (year, month) of the range
+            end: Last (year, month) of the range (inclusive)
+
+        Yields:
+            {"type": "monthly", ...report} for each month, followed by
+            {"type": "ytd", ...summary} after the last month of each year
+        """
+        cube = report_cube_service.get_cube()
         categories = csv_manager.read_csv("categories.csv")
         budgets = csv_manager.read_csv("budgets.csv")
 
-        # Filter transactions for the month
-        month_transactions = [
-            tx for tx in transactions if self._is_in_month(tx["date"], year, month)
-        ]
+        months = month_range(start, end)
+        for i, (year, month) in enumerate(months):
+            yield {
+                "type": "monthly",
+                **self._build_monthly_report(year, month, cube, categories, budgets),
+            }
 
-        # Calculate income and expenses
-        income = sum(
-            float(tx["amount"]) for tx in month_transactions if float(tx["amount"]) > 0
-        )
-        expenses = abs(
-            sum(
-                float(tx["amount"])
-                for tx in month_transactions
-                if float(tx["amount"]) < 0
-            )
-        )
+            if i == len(months) - 1 or months[i + 1][0] != year:
+                yield {"type": "ytd", **self._build_ytd_summary(year, cube)}
+
+    def _build_monthly_report(
+        self,
+        year: int,
+        month: int,
+        cube: ReportCube,
+        categories: List[Dict],
+        budgets: List[Dict],
+    ) -> Dict:
+        """Build a monthly report from the report cube."""
+        # Income and expenses for the month
+        month_summary = cube.month_summary(year, month)
+        income = month_summary["income"]
+        expenses = month_summary["expenses"]
         net_income = income - expenses
 
         # Category breakdown
         category_spending = self._calculate_category_spending(
-            month_transactions, categories
+            cube.category_spending(year, month), expenses, categories
         )
 
         # Budget performance
-        budget_performance = self._calculate_budget_performance(year, month, budgets)
+        budget_performance = self._calculate_budget_performance(
+            year, month, budgets, cube
+        )
 
         # Top spending categories
         top_categories = sorted(
@@ -65,15 +108,15 @@ class ReportService:
         savings_rate = (net_income / income * 100) if income > 0 else 0
 
         # Transaction count
-        transaction_count = len(month_transactions)
-        income_count = sum(1 for tx in month_transactions if float(tx["amount"]) > 0)
-        expense_count = sum(1 for tx in month_transactions if float(tx["amount"]) < 0)
+        transaction_count = month_summary["count"]
+        income_count = month_summary["income_count"]
+        expense_count = month_summary["expense_count"]
 
         # Average transaction
         avg_expense = expenses / expense_count if expense_count > 0 else 0
 
         # Month-over-month comparison
-        mom_comparison = self._calculate_mom_comparison(year, month, transactions)
+        mom_comparison = self._calculate_mom_comparison(year, month, cube)
 
         # Insights
         insights = self._generate_insights(
@@ -120,35 +163,22 @@ class ReportService:
         Returns:
             YTD summary
         """
-        transactions = csv_manager.read_csv("transactions.csv")
-
-        # Filter transactions for the year
-        ytd_transactions = [
-            tx for tx in transactions if tx["date"].startswith(str(year))
-        ]
+        return self._build_ytd_summary(year, report_cube_service.get_cube())
 
+    def _build_ytd_summary(self, year: int, cube: ReportCube) -> Dict:
+        """Build a year-to-date summary from the report cube."""
         # Calculate totals
-        income = sum(
-            float(tx["amount"]) for tx in ytd_transactions if float(tx["amount"]) > 0
-        )
-        expenses = abs(
-            sum(
-                float(tx["amount"])
-                for tx in ytd_transactions
-                if float(tx["amount"]) < 0
-            )
-        )
+        year_summary = cube.year_summary(year)
+        income = year_summary["income"]
+        expenses = year_summary["expenses"]
         net_income = income - expenses
 
         # Monthly breakdown
-        monthly_data = defaultdict(lambda: {"income": 0, "expenses": 0})
-        for tx in ytd_transactions:
-            month = int(tx["date"].split("-")[1])
-            amount = float(tx["amount"])
-            if amount > 0:
-                monthly_data[month]["income"] += amount
-            else:
-                monthly_data[month]["expenses"] += abs(amount)
+        monthly_data = {
+            month: cube.month_summary(year, month)
+            for month in range(1, 13)
+            if (year, month) in cube.month_totals
+        }
 
         monthly_breakdown = [
             {
@@ -157,7 +187,7 @@ class ReportService:
                 "expenses": round(data["expenses"], 2),
                 "net": round(data["income"] - data["expenses"], 2),
             }
-            for month, data in sorted(monthly_data.items())
+            for month, data in monthly_data.items()
         ]
 
         return {
@@ -172,41 +202,27 @@ class ReportService:
             "monthly_breakdown": monthly_breakdown,
         }
 
-    def _is_in_month(self, date_str: str, year: int, month: int) -> bool:
-        """Check if date is in specified month."""
-        try:
-            date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            return date.year == year and date.month == month
-        except:
-            return False
-
     def _calculate_category_spending(
-        self, transactions: List[Dict], categories: List[Dict]
+        self, spending: Dict[str, Dict], total_expenses: float, categories: List[Dict]
     ) -> Dict:
-        """Calculate spending by category."""
+        """Add names and percentages to per-category expense totals."""
         category_map = {cat["id"]: cat["name"] for cat in categories}
-        category_totals = defaultdict(lambda: {"amount": 0, "count": 0})
-
-        total_expenses = 0
-        for tx in transactions:
-            amount = float(tx["amount"])
-            if amount < 0:  # Expenses only
-                cat_id = tx["category_id"]
-                category_totals[cat_id]["amount"] += abs(amount)
-                category_totals[cat_id]["count"] += 1
-                category_totals[cat_id]["name"] = category_map.get(cat_id, "Unknown")
-                total_expenses += abs(amount)
-
-        # Calculate percentages
-        for cat_id, data in category_totals.items():
-            data["percentage"] = (
-                (data["amount"] / total_expenses * 100) if total_expenses > 0 else 0
-            )
 
-        return dict(category_totals)
+        category_totals = {}
+        for cat_id, data in spending.items():
+            category_totals[cat_id] = {
+                "amount": data["amount"],
+                "count": data["count"],
+                "name": category_map.get(cat_id, "Unknown"),
+                "percentage": (
+                    (data["amount"] / total_expenses * 100) if total_expenses > 0 else 0
+                ),
+            }
+
+        return category_totals
 
     def _calculate_budget_performance(
-        self, year: int, month: int, budgets: List[Dict]
+        self, year: int, month: int, budgets: List[Dict], cube: ReportCube
     ) -> Dict:
         """Calculate budget vs actual performance."""
         # Find budget for the month
@@ -218,8 +234,12 @@ class ReportService:
         if not budget:
             return {"has_budget": False, "message": "No budget set for this month"}
 
-        # Get budget status from budget service
-        budget_status = budget_service.calculate_budget_status(budget["id"])
+        # Get budget status from budget service, with actuals from the cube
+        actual_spending = {
+            cat_id: data["amount"]
+            for cat_id, data in cube.category_spending(year, month).items()
+        }
+        budget_status = budget_service.build_budget_status(budget, actual_spending)
 
         return {
             "has_budget": True,
@@ -248,36 +268,20 @@ class ReportService:
         }
 
     def _calculate_mom_comparison(
-        self, year: int, month: int, transactions: List[Dict]
+        self, year: int, month: int, cube: ReportCube
     ) -> Dict:
         """Calculate month-over-month comparison."""
         # Previous month
         prev_month = month - 1 if month > 1 else 12
         prev_year = year if month > 1 else year - 1
 
-        # Current month transactions
-        current = [
-            tx for tx in transactions if self._is_in_month(tx["date"], year, month)
-        ]
-        current_income = sum(
-            float(tx["amount"]) for tx in current if float(tx["amount"]) > 0
-        )
-        current_expenses = abs(
-            sum(float(tx["amount"]) for tx in current if float(tx["amount"]) < 0)
-        )
+        current = cube.month_summary(year, month)
+        current_income = current["income"]
+        current_expenses = current["expenses"]
 
-        # Previous month transactions
-        previous = [
-            tx
-            for tx in transactions
-            if self._is_in_month(tx["date"], prev_year, prev_month)
-        ]
-        prev_income = sum(
-            float(tx["amount"]) for tx in previous if float(tx["amount"]) > 0
-        )
-        prev_expenses = abs(
-            sum(float(tx["amount"]) for tx in previous if float(tx["amount"]) < 0)
-        )
+        previous = cube.month_summary(prev_year, prev_month)
+        prev_income = previous["income"]
+        prev_expenses = previous["expenses"]
 
         # Calculate changes
         income_change = (
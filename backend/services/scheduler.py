@@ -6,6 +6,8 @@ from datetime import datetime
 import logging
 
 from services.recurring_service import recurring_service
+from services.export_job_service import export_job_service
+from services.search_index import search_index_service, PERSIST_INTERVAL_MINUTES
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -44,6 +46,26 @@ class SchedulerService:
             name="Process Recurring Transactions (Startup)",
         )
 
+        # Delete exports past their retention period
+        # Run daily at 00:30
+        self.scheduler.add_job(
+            func=self.cleanup_exports,
+            trigger=CronTrigger(hour=0, minute=30),
+            id="cleanup_exports",
+            name="Clean Up Old Exports",
+            replace_existing=True,
+        )
+
+        # Persist the search index off the request path
+        self.scheduler.add_job(
+            func=self.save_search_index,
+            trigger="interval",
+            minutes=PERSIST_INTERVAL_MINUTES,
+            id="save_search_index",
+            name="Save Search Index",
+            replace_existing=True,
+        )
+
         self.scheduler.start()
         self.is_running = True
         logger.info("Scheduler started successfully")
@@ -55,6 +77,7 @@ class SchedulerService:
             return
 
         self.scheduler.shutdown()
+        self.save_search_index()
         self.is_running = False
         logger.info("Scheduler stopped")
 
@@ -69,6 +92,24 @@ class SchedulerService:
             logger.error(f"Error processing recurring transactions: {str(e)}")
             return []
 
+    def cleanup_exports(self):
+        """Delete exports older than the retention period."""
+        try:
+            result = export_job_service.cleanup()
+            logger.info(f"Deleted {result['deleted']} old exports")
+            return result
+        except Exception as e:
+            logger.error(f"Error cleaning up exports: {str(e)}")
+            return {"deleted": 0, "bytes_freed": 0}
+
+    def save_search_index(self):
+        """Persist the search index if it changed."""
+        try:
+            return search_index_service.save()
+        except Exception as e:
+            logger.error(f"Error saving search index: {str(e)}")
+            return False
+
     def get_jobs(self):
         """Get all scheduled jobs."""
         return self.scheduler.get_jobs()
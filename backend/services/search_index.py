@@ -0,0 +1,512 @@
+"""Full-text and fuzzy search over transaction descriptions and tags."""
+
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import numpy as np
+
+from services.change_log import change_log, DELETE
+from services.csv_manager import csv_manager
+
+# Persisted snapshot of the search index
+SEARCH_INDEX_FILE = "search_index.json"
+
+# Minutes between snapshots of a changed index (taken by the scheduler)
+PERSIST_INTERVAL_MINUTES = 5
+
+# Change log entries applied per lookup while catching up
+SYNC_BATCH = 1000
+
+# Tokens are runs of letters and digits
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Weight of a term matched exactly, by prefix and (times similarity) fuzzily
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.6
+
+# Minimum trigram similarity (Jaccard) of a fuzzy match
+FUZZY_THRESHOLD = 0.4
+
+# Maximum vocabulary terms a query term expands to by prefix or fuzzily
+MAX_EXPANSIONS = 50
+
+# Compact the index when this share of its documents is deleted
+MAX_DEAD_RATIO = 0.5
+
+# Document fields a search can be constrained to a value of
+CONSTRAINT_FIELDS = ["category_id", "account_id", "type"]
+
+# Fields of transactions.csv rows kept per document, in order
+DOC_FIELDS = [
+    "id",
+    "date",
+    "amount",
+    "description",
+    "tags",
+    "category_id",
+    "account_id",
+    "type",
+    "currency",
+]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case letter and digit tokens."""
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    """Get the trigrams of a token padded with $ on both sides."""
+    padded = f"${token}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _compact(row: Dict[str, Any]) -> List[Any]:
+    """Get the document of a transactions.csv row."""
+    doc = [row.get(field) or "" for field in DOC_FIELDS]
+    doc[DOC_FIELDS.index("amount")] = float(row.get("amount") or 0)
+    doc[DOC_FIELDS.index("currency")] = row.get("currency") or "ZAR"
+    return doc
+
+
+class SearchIndex:
+    """
+    Inverted index of transaction descriptions and tags.
+
+    Every transaction is a document numbered in indexing order. Postings map
+    each token to the ascending numbers of the documents containing it; a
+    sorted vocabulary serves prefix lookups and a trigram index over the
+    vocabulary serves fuzzy lookups. Updated and deleted transactions leave
+    a tombstone and updated ones are indexed again as new documents, so
+    only changed rows are tokenized.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.docs: List[List[Any]] = []
+        self.dead: Set[int] = set()
+        self.ids: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.vocabulary: List[str] = []
+        self.trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._cached_columns: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def size(self) -> int:
+        """Number of live documents."""
+        return len(self.docs) - len(self.dead)
+
+    def add(self, row: Dict[str, Any]):
+        """Index a transactions.csv row as a new document."""
+        if row.get("id") in self.ids:
+            self.remove(row["id"])
+
+        number = len(self.docs)
+        doc = _compact(row)
+        self.docs.append(doc)
+        self.ids[doc[0]] = number
+
+        text = (
+            doc[DOC_FIELDS.index("description")] + " " + doc[DOC_FIELDS.index("tags")]
+        )
+        for token in dict.fromkeys(tokenize(text)):
+            if token not in self.postings:
+                self._add_term(token)
+            self.postings[token].append(number)
+
+    def remove(self, transaction_id: str):
+        """Tombstone the document of a transaction."""
+        number = self.ids.pop(transaction_id, None)
+        if number is not None:
+            self.dead.add(number)
+            if self._cached_columns and number < len(self._cached_columns["alive"]):
+                self._cached_columns["alive"][number] = False
+
+    def reconcile(self, rows: List[Dict[str, Any]]):
+        """
+        Bring the index in line with a rewritten transactions.csv.
+
+        Unchanged rows keep their documents; changed rows are indexed again
+        and rows no longer in the file are tombstoned.
+        """
+        seen = set()
+        for row in rows:
+            number = self.ids.get(row.get("id"))
+            if number is not None and self.docs[number] == _compact(row):
+                seen.add(row["id"])
+                continue
+            self.add(row)
+            seen.add(row.get("id"))
+
+        for transaction_id in [i for i in self.ids if i not in seen]:
+            self.remove(transaction_id)
+
+    def needs_compaction(self) -> bool:
+        """Whether tombstones make up more than MAX_DEAD_RATIO of the documents."""
+        return len(self.dead) > MAX_DEAD_RATIO * max(len(self.docs), 1)
+
+    def compacted(self) -> "SearchIndex":
+        """Build a new index of the live documents only."""
+        index = SearchIndex()
+        for number, doc in enumerate(self.docs):
+            if number not in self.dead:
+                index.add(dict(zip(DOC_FIELDS, doc)))
+        return index
+
+    def _add_term(self, token: str):
+        """Add a new token to the vocabulary and trigram index."""
+        insort(self.vocabulary, token)
+        for trigram in trigrams(token):
+            self.trigrams[trigram].add(token)
+
+    def expand(self, term: str, prefix: bool, fuzzy: bool) -> Dict[str, float]:
+        """
+        Get the vocabulary tokens a query term matches, with their weights.
+
+        Args:
+            term: Query token
+            prefix: Match tokens starting with the term
+            fuzzy: Match tokens with similar trigrams
+
+        Returns:
+            Dictionary mapping token to match weight
+        """
+        matches: Dict[str, float] = {}
+        if term in self.postings:
+            matches[term] = EXACT_WEIGHT
+
+        if prefix:
+            position = bisect_left(self.vocabulary, term)
+            expanded = 0
+            while (
+                position < len(self.vocabulary)
+                and self.vocabulary[position].startswith(term)
+                and expanded < MAX_EXPANSIONS
+            ):
+                matches.setdefault(self.vocabulary[position], PREFIX_WEIGHT)
+                position += 1
+                expanded += 1
+
+        if fuzzy:
+            term_trigrams = trigrams(term)
+            shared: Dict[str, int] = defaultdict(int)
+            for trigram in term_trigrams:
+                for token in self.trigrams.get(trigram, ()):
+                    shared[token] += 1
+
+            similar = []
+            for token, count in shared.items():
+                union = len(term_trigrams) + len(trigrams(token)) - count
+                similarity = count / union
+                if similarity >= FUZZY_THRESHOLD and token not in matches:
+                    similar.append((similarity, token))
+
+            for similarity, token in heapq.nlargest(MAX_EXPANSIONS, similar):
+                matches[token] = FUZZY_WEIGHT * similarity
+
+        return matches
+
+    def search(
+        self,
+        query: str,
+        prefix: bool = True,
+        fuzzy: bool = True,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[List[Tuple[float, Dict[str, Any]]], int]:
+        """
+        Find the transactions matching every term of a query.
+
+        Each document scores the sum, over query terms, of the best weight
+        times inverse document frequency among the tokens the term matches.
+
+        Args:
+            query: Free text query
+            prefix: Match terms as prefixes
+            fuzzy: Match terms fuzzily
+            filters: Constraints (start_date, end_date, min_amount,
+                max_amount on the absolute amount, category_id, account_id,
+                type)
+            limit: Maximum number of results
+            offset: Number of results to skip
+
+        Returns:
+            Tuple of (page of (score, document) pairs, best first then
+            newest first, total number of matches)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+
+        # Best score per document of each term, documents ascending
+        total_docs = max(self.size, 1)
+        term_matches = []
+        for term in terms:
+            expansions = self.expand(term, prefix, fuzzy)
+            if not expansions:
+                return [], 0
+
+            numbers = np.concatenate(
+                [np.array(self.postings[token], dtype=np.int64) for token in expansions]
+            )
+            scores = np.concatenate(
+                [
+                    np.full(
+                        len(self.postings[token]),
+                        weight * math.log(1 + total_docs / len(self.postings[token])),
+                    )
+                    for token, weight in expansions.items()
+                ]
+            )
+            order = np.lexsort((-scores, numbers))
+            numbers = numbers[order]
+            first = np.concatenate(([True], numbers[1:] != numbers[:-1]))
+            term_matches.append((numbers[first], scores[order][first]))
+
+        # Documents matching every term, starting from the rarest term
+        term_matches.sort(key=lambda match: len(match[0]))
+        numbers, scores = term_matches[0]
+        for other_numbers, other_scores in term_matches[1:]:
+            numbers, mine, theirs = np.intersect1d(
+                numbers, other_numbers, assume_unique=True, return_indices=True
+            )
+            scores = scores[mine] + other_scores[theirs]
+
+        columns = self._columns()
+        selected = self._constrain(columns, numbers, filters or {})
+        numbers = numbers[selected]
+        scores = scores[selected]
+
+        order = np.lexsort((columns["date"][numbers], scores))[::-1]
+        page = [
+            (float(scores[i]), dict(zip(DOC_FIELDS, self.docs[numbers[i]])))
+            for i in order[offset : offset + limit]
+        ]
+        return page, len(numbers)
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        """
+        Get document columns for vectorized constraints.
+
+        Columns are extended with the documents added since the last call,
+        and tombstones clear the alive flag in place.
+        """
+        size = len(self._cached_columns["alive"]) if self._cached_columns else 0
+        if size == len(self.docs) and self._cached_columns:
+            return self._cached_columns
+
+        tail = self.docs[size:]
+        columns = {
+            "alive": np.array(
+                [size + i not in self.dead for i in range(len(tail))], dtype=bool
+            ),
+            "date": np.array([doc[1][:10] for doc in tail], dtype="U10"),
+            "amount": np.abs(np.array([doc[2] for doc in tail], dtype=np.float64)),
+        }
+        for field in CONSTRAINT_FIELDS:
+            position = DOC_FIELDS.index(field)
+            columns[field] = np.array([doc[position] for doc in tail], dtype=str)
+
+        if self._cached_columns:
+            columns = {
+                name: np.concatenate((self._cached_columns[name], column))
+                for name, column in columns.items()
+            }
+        self._cached_columns = columns
+        return columns
+
+    def _constrain(
+        self,
+        columns: Dict[str, np.ndarray],
+        numbers: np.ndarray,
+        filters: Dict[str, Any],
+    ) -> np.ndarray:
+        """Get a mask of the documents that are alive and meet the constraints."""
+        mask = columns["alive"][numbers]
+        if filters.get("start_date"):
+            mask &= columns["date"][numbers] >= str(filters["start_date"])
+        if filters.get("end_date"):
+            mask &= columns["date"][numbers] <= str(filters["end_date"])
+        if filters.get("min_amount") is not None:
+            mask &= columns["amount"][numbers] >= filters["min_amount"]
+        if filters.get("max_amount") is not None:
+            mask &= columns["amount"][numbers] <= filters["max_amount"]
+        for field in CONSTRAINT_FIELDS:
+            if filters.get(field):
+                mask &= columns[field][numbers] == filters[field]
+        return mask
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the index (the trigram index is derived on load)."""
+        return {
+            "docs": self.docs,
+            "dead": sorted(self.dead),
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchIndex":
+        """Restore a serialized index."""
+        index = cls()
+        index.docs = data["docs"]
+        index.dead = set(data["dead"])
+        index.ids = {
+            doc[0]: number
+            for number, doc in enumerate(index.docs)
+            if number not in index.dead
+        }
+        index.postings = defaultdict(list, data["postings"])
+        index.vocabulary = sorted(index.postings)
+        for token in index.vocabulary:
+            for trigram in trigrams(token):
+                index.trigrams[trigram].add(token)
+        return index
+
+
+class SearchIndexService:
+    """
+    Keeps the search index in step with transactions.csv.
+
+    The index follows the row change log: a search first applies the
+    transaction inserts, updates and deletes recorded since the last one,
+    so only changed rows are tokenized and a rewrite costs O(changed rows).
+    The file is only read in full when there is no usable snapshot, the
+    index fell behind the log's retention, or the file version changed
+    without any logged change (a writer that bypassed the log). The index is persisted beside
+    transactions.csv by the scheduler (see ``save``), never on the request
+    path, so a restart resumes from the snapshot instead of reindexing.
+    """
+
+    def __init__(self):
+        """Initialize search index service."""
+        self._lock = threading.Lock()
+        self._index: Optional[SearchIndex] = None
+        self._seq = 0
+        self._version: Optional[str] = None
+        self._dirty = False
+
+    def search(
+        self,
+        query: str,
+        prefix: bool = True,
+        fuzzy: bool = True,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[List[Tuple[float, Dict[str, Any]]], int]:
+        """
+        Search transactions (see SearchIndex.search).
+
+        Returns:
+            Tuple of (page of (score, document) pairs, total number of matches)
+        """
+        with self._lock:
+            self._sync()
+            return self._index.search(query, prefix, fuzzy, filters, limit, offset)
+
+    def save(self) -> bool:
+        """
+        Persist the index if it changed since the last snapshot.
+
+        Returns:
+            True if a snapshot was written
+        """
+        with self._lock:
+            if self._index is None or not self._dirty:
+                return False
+            self._save_snapshot()
+            return True
+
+    def _sync(self):
+        """Apply the transaction changes since the last sync (caller holds the lock)."""
+        if self._index is None:
+            self._load_snapshot()
+
+        version = csv_manager.get_file_version("transactions.csv")
+        applied = False
+        while True:
+            data = change_log.changes_since(
+                self._seq, SYNC_BATCH, tables=["transactions"]
+            )
+            if data["reset"]:
+                self._rebuild(version)
+                return
+
+            for change in data["changes"]:
+                if change["op"] == DELETE:
+                    self._index.remove(change["key"])
+                else:
+                    self._index.add(change["row"])
+                applied = True
+            self._dirty = self._dirty or data["seq"] != self._seq
+            self._seq = data["seq"]
+            if not data["has_more"]:
+                break
+
+        if version != self._version:
+            if not applied:
+                self._rebuild(version)
+                return
+            self._version = version
+            self._dirty = True
+
+        if self._index.needs_compaction():
+            self._index = self._index.compacted()
+
+    def _rebuild(self, version: str):
+        """
+        Reconcile the index with the whole file (caller holds the lock).
+
+        Args:
+            version: Version of transactions.csv taken before the sync
+        """
+        # Changes recorded after this point are applied by the next sync
+        seq = change_log.current_seq()
+        rows = csv_manager.read_csv("transactions.csv")
+
+        self._index.reconcile(rows)
+        if self._index.needs_compaction():
+            self._index = self._index.compacted()
+        self._seq = seq
+        self._version = version
+        self._dirty = True
+
+    def _load_snapshot(self):
+        """Load the persisted snapshot, if any."""
+        self._index = SearchIndex()
+        self._seq = 0
+        self._version = None
+
+        try:
+            snapshot = csv_manager.read_json(SEARCH_INDEX_FILE)
+            if snapshot.get("seq"):
+                self._index = SearchIndex.from_dict(snapshot["index"])
+                self._seq = snapshot["seq"]
+                self._version = snapshot.get("version")
+        except Exception:
+            self._index = SearchIndex()
+            self._seq = 0
+            self._version = None
+
+    def _save_snapshot(self):
+        """Persist the index with its change sequence number and file version."""
+        csv_manager.write_json(
+            SEARCH_INDEX_FILE,
+            {
+                "seq": self._seq,
+                "version": self._version,
+                "index": self._index.to_dict(),
+            },
+        )
+        self._dirty = False
+
+
+# Singleton instance
+search_index_service = SearchIndexService()
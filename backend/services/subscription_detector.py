@@ -0,0 +1,235 @@
+"""Detection of recurring charges (subscriptions) in the transaction history."""
+
+import re
+from datetime import date as date_type
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.recurring_transaction import RecurringSuggestion, RecurringTransactionCreate
+from services.analytics_frame import TransactionFrame, analytics_frame_service
+from services.recurring_service import FREQUENCY_DAYS, recurring_service
+
+# Intervals within this fraction of a frequency's length match it
+PERIOD_TOLERANCE = 0.15
+
+# Share of intervals that must match the frequency
+MIN_REGULARITY = 0.75
+
+# Occurrences at which a regular charge gets full confidence
+CONFIDENT_OCCURRENCES = 6
+
+# Digits, punctuation and other non-letters in descriptions
+NON_LETTERS = re.compile(r"[^a-z]+")
+
+# Transaction types a recurring rule can have
+RULE_TYPES = ("income", "expense")
+
+
+def normalize_merchant(description: str) -> str:
+    """
+    Normalize a description into a merchant key.
+
+    Lower-cases the description and drops digits and punctuation, so
+    reference numbers and dates do not split one merchant into many.
+    """
+    return " ".join(NON_LETTERS.sub(" ", (description or "").lower()).split())
+
+
+def match_frequency(interval: float) -> Optional[str]:
+    """Get the frequency whose length is closest to an interval, if within tolerance."""
+    frequency = min(FREQUENCY_DAYS, key=lambda f: abs(FREQUENCY_DAYS[f] - interval))
+    days = FREQUENCY_DAYS[frequency]
+    return frequency if abs(interval - days) <= days * PERIOD_TOLERANCE else None
+
+
+class SubscriptionDetector:
+    """
+    Finds candidate recurring transactions to suggest as rules.
+
+    Transactions are grouped by (merchant key, type, currency, amount
+    rounded to whole units) with one sort over the frame, so a group's
+    transactions are contiguous and in date order. Intervals between
+    charges come from a single diff over the sorted dates; a group is
+    recurring when its median interval matches a recurrence frequency and
+    most intervals are within tolerance of it.
+    """
+
+    def detect(
+        self,
+        min_occurrences: int = 3,
+        include_inactive: bool = False,
+        today: Optional[date_type] = None,
+    ) -> Iterator[RecurringSuggestion]:
+        """
+        Detect recurring charges, one suggestion at a time.
+
+        Charges already covered by a recurring transaction (same merchant
+        key, type and rounded amount) are not suggested. Repeated charges
+        on the same day count as one occurrence.
+
+        Args:
+            min_occurrences: Minimum number of charges in a group
+            include_inactive: Include charges that stopped more than two
+                periods ago
+            today: Reference date for activity (default: today)
+
+        Yields:
+            Suggestions, in order of each merchant's first transaction
+        """
+        today = today or date_type.today()
+        frame = analytics_frame_service.get_frame()
+        existing = self._existing_rules()
+
+        merchant_keys, merchant_codes = self._merchant_codes(frame)
+        rounded = np.round(np.abs(frame.amounts)).astype(np.int64)
+
+        rows = np.flatnonzero(frame.ordinals >= 0)
+        rows = rows[
+            np.lexsort(
+                (
+                    frame.ordinals[rows],
+                    rounded[rows],
+                    frame.currencies[rows],
+                    frame.types[rows],
+                    merchant_codes[rows],
+                )
+            )
+        ]
+
+        # Same-day duplicates of a charge count once
+        keys = np.stack(
+            (
+                merchant_codes[rows],
+                frame.types[rows],
+                frame.currencies[rows],
+                rounded[rows],
+            )
+        )
+        repeated = np.all(np.diff(keys, axis=1) == 0, axis=0) & (
+            np.diff(frame.ordinals[rows]) == 0
+        )
+        unique = np.ones(len(rows), dtype=bool)
+        unique[1:] = ~repeated
+        rows, keys = rows[unique], keys[:, unique]
+
+        # Group boundaries and the intervals between consecutive charges
+        changes = np.flatnonzero(np.any(np.diff(keys, axis=1) != 0, axis=0)) + 1
+        starts = np.concatenate(([0], changes))
+        ends = np.concatenate((changes, [len(rows)]))
+        intervals = np.diff(frame.ordinals[rows])
+
+        for start, end in zip(starts, ends):
+            if end - start < max(min_occurrences, 2):
+                continue
+
+            group = rows[start:end]
+            merchant = merchant_keys[merchant_codes[group[0]]]
+            txn_type = frame.type_names[frame.types[group[0]]]
+            if not merchant or txn_type not in RULE_TYPES:
+                continue
+            if (merchant, txn_type, int(rounded[group[0]])) in existing:
+                continue
+
+            suggestion = self._suggest(
+                frame, merchant, group, intervals[start : end - 1], today
+            )
+            if suggestion and (include_inactive or suggestion.is_active):
+                yield suggestion
+
+    def _suggest(
+        self,
+        frame: TransactionFrame,
+        merchant: str,
+        group: np.ndarray,
+        intervals: np.ndarray,
+        today: date_type,
+    ) -> Optional[RecurringSuggestion]:
+        """Build a suggestion for a group of charges if they recur regularly."""
+        frequency = match_frequency(float(np.median(intervals)))
+        if frequency is None:
+            return None
+
+        days = FREQUENCY_DAYS[frequency]
+        regularity = float(np.mean(np.abs(intervals - days) <= days * PERIOD_TOLERANCE))
+        if regularity < MIN_REGULARITY:
+            return None
+
+        latest = group[-1]
+        first_date = date_type.fromordinal(int(frame.ordinals[group[0]]))
+        last_date = date_type.fromordinal(int(frame.ordinals[latest]))
+        day_of_week = (
+            last_date.weekday() if frequency in ("weekly", "biweekly") else None
+        )
+        day_of_month = (
+            last_date.day if frequency in ("monthly", "quarterly", "yearly") else None
+        )
+        next_due = recurring_service._calculate_next_due(
+            last_date.isoformat(),
+            frequency,
+            day_of_month,
+            day_of_week,
+            last_generated=last_date.isoformat(),
+        )
+
+        description = frame.merchant_names[frame.merchants[latest]]
+        txn_type = frame.type_names[frame.types[latest]]
+        amount = float(frame.amounts[latest])
+
+        return RecurringSuggestion(
+            merchant=merchant,
+            description=description,
+            amount=amount,
+            currency=frame.currency_codes[frame.currencies[latest]],
+            type=txn_type,
+            frequency=frequency,
+            occurrences=len(group),
+            first_date=first_date.isoformat(),
+            last_date=last_date.isoformat(),
+            average_interval_days=round(float(np.mean(intervals)), 2),
+            regularity=round(regularity, 2),
+            confidence=round(
+                regularity * min(1.0, len(group) / CONFIDENT_OCCURRENCES), 2
+            ),
+            is_active=(today - last_date).days <= 2 * days * (1 + PERIOD_TOLERANCE),
+            next_due=next_due,
+            rule=RecurringTransactionCreate(
+                name=merchant.title(),
+                amount=amount,
+                category_id=frame.category_ids[frame.categories[latest]],
+                account_id=frame.account_ids[frame.accounts[latest]],
+                type=txn_type,
+                frequency=frequency,
+                start_date=next_due,
+                day_of_month=day_of_month,
+                day_of_week=day_of_week,
+                notes=f"Detected from {len(group)} transactions",
+            ),
+        )
+
+    def _merchant_codes(self, frame: TransactionFrame) -> Tuple[List[str], np.ndarray]:
+        """Get the merchant keys and each row's merchant key code."""
+        vocabulary: Dict[str, int] = {}
+        codes = np.array(
+            [
+                vocabulary.setdefault(normalize_merchant(name), len(vocabulary))
+                for name in frame.merchant_names
+            ],
+            dtype=np.int64,
+        )
+        return list(vocabulary), codes[frame.merchants]
+
+    def _existing_rules(self) -> Set[Tuple[str, str, int]]:
+        """Get (merchant key, type, rounded amount) of existing recurring rules."""
+        return {
+            (
+                normalize_merchant(recurring.name),
+                recurring.type,
+                int(round(abs(recurring.amount))),
+            )
+            for recurring in recurring_service.get_all()
+        }
+
+
+# Singleton instance
+subscription_detector = SubscriptionDetector()
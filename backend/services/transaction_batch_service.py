@@ -0,0 +1,204 @@
+"""Batch creates, updates and deletes of transactions."""
+
+from typing import Dict, Any, List, Set
+
+from models.transaction import (
+    TransactionBatch,
+    TransactionBatchItemResult,
+    TransactionBatchPatch,
+    TransactionBatchResult,
+    TransactionBatchUpdate,
+    TransactionCreate,
+    TransactionUpdate,
+    TRANSACTION_FIELDNAMES,
+)
+from services.anomaly_service import anomaly_service
+from services.csv_manager import csv_manager
+from services.transaction_query_service import row_matches
+from utils.dates import now_iso
+from utils.ids import generate_transaction_id
+
+
+def _update_data(update: TransactionUpdate) -> Dict[str, Any]:
+    """Get the CSV fields set by an update."""
+    update_data = update.model_dump(exclude_unset=True)
+    if "date" in update_data:
+        update_data["date"] = str(update_data["date"])
+    return update_data
+
+
+class TransactionBatchService:
+    """
+    Applies many transaction writes with a single rewrite of transactions.csv.
+
+    The file is read once under an exclusive lock, updates and deletes are
+    applied by ID through an in-memory lookup, creates are appended, and
+    the result is written back with one atomic rename, so a batch of n
+    edits costs O(file) instead of n rewrites. Items fail individually
+    (e.g. unknown IDs) without failing the batch.
+    """
+
+    def apply(self, batch: TransactionBatch) -> TransactionBatchResult:
+        """
+        Apply a batch: updates, then patches, then deletes, then creates.
+
+        Args:
+            batch: Transactions to create, update, patch and delete
+
+        Returns:
+            Counts and per-item results
+        """
+        results: List[TransactionBatchItemResult] = []
+        if not (batch.creates or batch.updates or batch.patches or batch.deletes):
+            return TransactionBatchResult(created=0, updated=0, deleted=0, results=[])
+
+        updated = set()
+        deleted = set()
+        timestamp = now_iso()
+
+        with csv_manager.edit_csv("transactions.csv", TRANSACTION_FIELDNAMES) as rows:
+            positions = {row.get("id"): i for i, row in enumerate(rows)}
+            results += self._apply_updates(
+                rows, positions, batch.updates, timestamp, updated
+            )
+            results += self._apply_patches(rows, batch.patches, timestamp, updated)
+            results += self._apply_deletes(rows, positions, batch.deletes, deleted)
+            results += self._apply_creates(rows, batch.creates, timestamp)
+
+        anomaly_service.observe()
+
+        return TransactionBatchResult(
+            created=len(batch.creates),
+            updated=len(updated - deleted),
+            deleted=len(deleted),
+            results=results,
+        )
+
+    def _apply_updates(
+        self,
+        rows: List[Dict[str, Any]],
+        positions: Dict[str, int],
+        updates: List[TransactionBatchUpdate],
+        timestamp: str,
+        updated: Set[str],
+    ) -> List[TransactionBatchItemResult]:
+        """Apply updates by ID, adding the updated IDs to updated."""
+        results = []
+        for index, update in enumerate(updates):
+            position = positions.get(update.id)
+            if position is None:
+                results.append(self._not_found("update", index, update.id))
+                continue
+
+            update_data = _update_data(update)
+            update_data.pop("id")
+            rows[position].update(update_data)
+            rows[position]["updated_at"] = timestamp
+            updated.add(update.id)
+            results.append(
+                TransactionBatchItemResult(
+                    operation="update", index=index, status=200, ids=[update.id]
+                )
+            )
+        return results
+
+    def _apply_patches(
+        self,
+        rows: List[Dict[str, Any]],
+        patches: List[TransactionBatchPatch],
+        timestamp: str,
+        updated: Set[str],
+    ) -> List[TransactionBatchItemResult]:
+        """Apply patches to matching rows, adding the patched IDs to updated."""
+        results = []
+        for index, patch in enumerate(patches):
+            if not patch.filter.model_dump(exclude_none=True):
+                results.append(
+                    TransactionBatchItemResult(
+                        operation="patch",
+                        index=index,
+                        status=400,
+                        detail="Patch filter must set at least one criterion",
+                    )
+                )
+                continue
+
+            update_data = _update_data(patch.patch)
+            ids = []
+            for row in rows:
+                if row_matches(row, patch.filter):
+                    row.update(update_data)
+                    row["updated_at"] = timestamp
+                    ids.append(row["id"])
+            updated.update(ids)
+            results.append(
+                TransactionBatchItemResult(
+                    operation="patch", index=index, status=200, ids=ids
+                )
+            )
+        return results
+
+    def _apply_deletes(
+        self,
+        rows: List[Dict[str, Any]],
+        positions: Dict[str, int],
+        deletes: List[str],
+        deleted: Set[str],
+    ) -> List[TransactionBatchItemResult]:
+        """Remove rows by ID, adding the deleted IDs to deleted."""
+        results = []
+        for index, transaction_id in enumerate(deletes):
+            if transaction_id not in positions or transaction_id in deleted:
+                results.append(self._not_found("delete", index, transaction_id))
+                continue
+
+            deleted.add(transaction_id)
+            results.append(
+                TransactionBatchItemResult(
+                    operation="delete",
+                    index=index,
+                    status=204,
+                    ids=[transaction_id],
+                )
+            )
+        if deleted:
+            rows[:] = [row for row in rows if row.get("id") not in deleted]
+        return results
+
+    def _apply_creates(
+        self,
+        rows: List[Dict[str, Any]],
+        creates: List[TransactionCreate],
+        timestamp: str,
+    ) -> List[TransactionBatchItemResult]:
+        """Append new transactions with generated IDs."""
+        results = []
+        for index, transaction in enumerate(creates):
+            tx_data = transaction.model_dump()
+            tx_data["id"] = generate_transaction_id()
+            tx_data["date"] = str(tx_data["date"])
+            tx_data["created_at"] = timestamp
+            tx_data["updated_at"] = timestamp
+            rows.append(tx_data)
+            results.append(
+                TransactionBatchItemResult(
+                    operation="create", index=index, status=201, ids=[tx_data["id"]]
+                )
+            )
+        return results
+
+    def _not_found(
+        self, operation: str, index: int, transaction_id: str
+    ) -> TransactionBatchItemResult:
+        """Get the result of an item whose transaction does not exist."""
+        return TransactionBatchItemResult(
+            operation=operation,
+            index=index,
+            status=404,
+            ids=[transaction_id],
+            detail="Transaction not found",
+        )
+
+
+# Singleton instance
+transaction_batch_service = TransactionBatchService()
@@ -0,0 +1,296 @@
+"""Indexed, filtered queries over transactions."""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from typing import Dict, Any, Iterator, List, Optional
+
+from models.transaction import TransactionFilter
+from services.csv_manager import csv_manager
+from utils.tags import split_tags
+
+# Fields with posting lists and the filter attribute that selects on them
+POSTING_FIELDS = {
+    "account_id": "account_id",
+    "category_id": "category_id",
+    "type": "transaction_type",
+    "tags": "tag",
+}
+
+
+def _keys(row: Dict[str, Any], field: str) -> List[str]:
+    """Get the posting list keys of a row for a field."""
+    if field == "tags":
+        return split_tags(row.get("tags"))
+    return [row.get(field) or ""]
+
+
+def row_matches(row: Dict[str, Any], filters: TransactionFilter) -> bool:
+    """Check whether a transactions.csv row matches a filter."""
+    date = row.get("date", "")
+    if filters.start_date and date < str(filters.start_date):
+        return False
+    if filters.end_date and date > str(filters.end_date):
+        return False
+
+    return all(
+        getattr(filters, attribute) in _keys(row, field)
+        for field, attribute in POSTING_FIELDS.items()
+        if getattr(filters, attribute)
+    )
+
+
+class TransactionIndex:
+    """
+    Transactions sorted by date with posting lists.
+
+    Rows are stored oldest first and read newest first, keeping file order
+    among equal dates. Posting lists map an account, category, type or tag
+    to the ascending positions of its rows, so a filter only visits rows
+    of its most selective posting list within the date range. The tag
+    posting lists double as the tag dictionary.
+
+    Appended rows are inserted in place of a rebuild, which only shifts
+    the positions of rows dated on or after them.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        """Build the index from transactions.csv rows."""
+        self.rows = sorted(rows, key=lambda row: row.get("date", ""), reverse=True)
+        self.rows.reverse()
+        self.dates = [row.get("date", "") for row in self.rows]
+
+        self.postings: Dict[str, Dict[str, List[int]]] = {
+            field: defaultdict(list) for field in POSTING_FIELDS
+        }
+        for position, row in enumerate(self.rows):
+            for field, posting in self.postings.items():
+                for key in _keys(row, field):
+                    posting[key].append(position)
+
+    def insertion_cost(self, rows: List[Dict[str, Any]]) -> int:
+        """Get the number of positions shifted by inserting appended rows."""
+        return sum(
+            len(self.dates) - bisect_left(self.dates, row.get("date", ""))
+            for row in rows
+        )
+
+    def extended(self, rows: List[Dict[str, Any]]) -> "TransactionIndex":
+        """
+        Get a copy of the index with appended rows (in file order) inserted.
+
+        Posting lists are copied only when they change, and the index itself
+        is left untouched, so queries iterating over it while transactions
+        are written stay consistent.
+        """
+        index = TransactionIndex.__new__(TransactionIndex)
+        index.rows = list(self.rows)
+        index.dates = list(self.dates)
+        index.postings = {
+            field: defaultdict(list, postings)
+            for field, postings in self.postings.items()
+        }
+        copied = set()
+
+        for row in rows:
+            # Later rows come first among equal dates in storage order
+            date = row.get("date", "")
+            position = bisect_left(index.dates, date)
+            index.rows.insert(position, row)
+            index.dates.insert(position, date)
+
+            for field, postings in index.postings.items():
+                keys = _keys(row, field)
+                for key, posting in postings.items():
+                    shift = bisect_left(posting, position)
+                    if shift == len(posting) and key not in keys:
+                        continue
+                    if (field, key) not in copied:
+                        posting = postings[key] = list(posting)
+                        copied.add((field, key))
+                    for i in range(shift, len(posting)):
+                        posting[i] += 1
+                for key in keys:
+                    if (field, key) not in copied:
+                        postings[key] = list(postings[key])
+                        copied.add((field, key))
+                    insort(postings[key], position)
+
+        return index
+
+    def tag_counts(self) -> Dict[str, int]:
+        """Get the number of transactions per tag."""
+        return {
+            tag: len(posting)
+            for tag, posting in self.postings["tags"].items()
+            if posting
+        }
+
+    def date_range(self, filters: TransactionFilter) -> range:
+        """Get the positions of rows within the filter's date range."""
+        low = (
+            bisect_left(self.dates, str(filters.start_date))
+            if filters.start_date
+            else 0
+        )
+        high = (
+            bisect_right(self.dates, str(filters.end_date))
+            if filters.end_date
+            else len(self.dates)
+        )
+
+        return range(low, high) if high > low else range(0)
+
+    def positions(self, filters: TransactionFilter) -> Iterator[int]:
+        """Get the positions of rows matching a filter, newest first."""
+        dates = self.date_range(filters)
+        criteria = {
+            field: getattr(filters, attribute)
+            for field, attribute in POSTING_FIELDS.items()
+            if getattr(filters, attribute)
+        }
+
+        if not criteria:
+            yield from reversed(dates)
+            return
+
+        # Walk the shortest posting list within the date range
+        field = min(criteria, key=lambda f: len(self.postings[f].get(criteria[f], ())))
+        posting = self.postings[field].get(criteria[field], [])
+        start = bisect_left(posting, dates.start)
+        stop = bisect_left(posting, dates.stop)
+
+        for position in reversed(posting[start:stop]):
+            row = self.rows[position]
+            if all(value in _keys(row, f) for f, value in criteria.items()):
+                yield position
+
+
+class TransactionQueryService:
+    """
+    Query layer for filtered transactions.
+
+    The transactions index and the account/category name lookups are
+    rebuilt only when their files change (by file version), so repeated
+    queries (list endpoint, CSV/Excel/PDF exports) skip parsing, filtering
+    and sorting the whole file. Appended transactions are read from a
+    cursor and inserted into the index, unless shifting the rows dated
+    after them would cost more than a rebuild.
+    """
+
+    def __init__(self):
+        """Initialize transaction query service."""
+        self._lock = threading.Lock()
+        self._index: Optional[TransactionIndex] = None
+        self._index_version: Optional[str] = None
+        self._index_cursor: Optional[Dict[str, Any]] = None
+        self._names: Dict[str, Dict[str, str]] = {}
+        self._names_versions: Dict[str, str] = {}
+
+    def get_index(self) -> TransactionIndex:
+        """Get the transactions index, updating it if transactions.csv changed."""
+        with self._lock:
+            version = csv_manager.get_file_version("transactions.csv")
+            if self._index is None or version != self._index_version:
+                rows, cursor, continuation = csv_manager.read_csv_since(
+                    "transactions.csv", self._index_cursor
+                )
+                # Rebuild when inserting would shift more rows than a rebuild reads
+                rebuild_cost = len(self._index.rows) + len(rows) if continuation else 0
+                if continuation and self._index.insertion_cost(rows) > rebuild_cost:
+                    rows, cursor, continuation = csv_manager.read_csv_since(
+                        "transactions.csv"
+                    )
+
+                if continuation:
+                    self._index = self._index.extended(rows)
+                else:
+                    self._index = TransactionIndex(rows)
+                self._index_version = version
+                self._index_cursor = cursor
+
+            return self._index
+
+    def get_names(self, filename: str) -> Dict[str, str]:
+        """Get an ID to name lookup for accounts.csv or categories.csv."""
+        with self._lock:
+            version = csv_manager.get_file_version(filename)
+            if filename not in self._names or version != self._names_versions[filename]:
+                self._names[filename] = {
+                    row["id"]: row.get("name", "")
+                    for row in csv_manager.read_csv(filename)
+                }
+                self._names_versions[filename] = version
+
+            return self._names[filename]
+
+    def query(
+        self, filters: TransactionFilter, join: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over matching transactions, newest first.
+
+        Args:
+            filters: Filter spec
+            join: Add ``account_name`` and ``category_name`` ("Unknown" if missing)
+
+        Yields:
+            Transaction rows (copies, safe to modify)
+        """
+        index = self.get_index()
+        account_names = self.get_names("accounts.csv") if join else {}
+        category_names = self.get_names("categories.csv") if join else {}
+
+        for position in index.positions(filters):
+            row = dict(index.rows[position])
+            if join:
+                row["account_name"] = account_names.get(
+                    row.get("account_id", ""), "Unknown"
+                )
+                row["category_name"] = category_names.get(
+                    row.get("category_id", ""), "Unknown"
+                )
+            yield row
+
+    def get_tag_counts(self) -> Dict[str, int]:
+        """
+        Get the tag dictionary.
+
+        Returns:
+            Dictionary mapping each tag to its number of transactions
+        """
+        return self.get_index().tag_counts()
+
+    def get_totals(self, filters: TransactionFilter) -> Dict[str, float]:
+        """
+        Sum income and expenses of matching transactions.
+
+        Args:
+            filters: Filter spec
+
+        Returns:
+            Dictionary with income, expenses (positive), net and count
+        """
+        index = self.get_index()
+        income = 0.0
+        expenses = 0.0
+        count = 0
+
+        for position in index.positions(filters):
+            row = index.rows[position]
+            count += 1
+            if row.get("type") == "income":
+                income += float(row.get("amount", 0))
+            elif row.get("type") == "expense":
+                expenses += abs(float(row.get("amount", 0)))
+
+        return {
+            "income": income,
+            "expenses": expenses,
+            "net": income - expenses,
+            "count": count,
+        }
+
+
+# Singleton instance
+transaction_query_service = TransactionQueryService()
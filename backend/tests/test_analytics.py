@@ -1,9 +1,19 @@
 """Tests for analytics functionality (trends, predictions, health scores)."""
 
-import requests
+import csv
+import json
+import subprocess
+import sys
+import tempfile
 from datetime import date, timedelta
+from pathlib import Path
+
+import requests
 
 BASE_URL = "http://127.0.0.1:8777/api"
+BACKTEST_SCRIPT = (
+    Path(__file__).resolve().parent.parent / "scripts" / "backtest_forecasts.py"
+)
 
 
 def test_income_trend_analysis():
@@ -64,6 +74,46 @@ def test_quarterly_trend():
     return result
 
 
+def test_trend_periods_consistent():
+    """Test that monthly, quarterly and yearly trends agree with each other."""
+    print("\n=== Test: Trend Period Consistency ===")
+
+    trends = {}
+    for period_type in ("monthly", "quarterly", "yearly"):
+        response = requests.get(
+            f"{BASE_URL}/analytics/trends/expenses",
+            params={"period_type": period_type},
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        trends[period_type] = response.json()
+
+    yearly = {dp["period"]: dp for dp in trends["yearly"]["data_points"]}
+    for period_type in ("monthly", "quarterly"):
+        points = trends[period_type]["data_points"]
+        assert [dp["period"] for dp in points] == sorted(dp["period"] for dp in points)
+        for year, year_point in yearly.items():
+            in_year = [dp for dp in points if dp["period"].startswith(year)]
+            assert sum(dp["count"] for dp in in_year) == year_point["count"]
+            assert abs(sum(dp["value"] for dp in in_year) - year_point["value"]) < 0.01
+
+    quarters = [dp["period"] for dp in trends["quarterly"]["data_points"]]
+    assert all(period[4:6] == "-Q" for period in quarters), quarters
+
+    # YoY expenses match the yearly trend
+    if yearly:
+        year = max(yearly)
+        response = requests.get(
+            f"{BASE_URL}/analytics/yoy-comparison", params={"current_year": year}
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        expenses = response.json()["expense_comparison"]["current_value"]
+        assert abs(expenses - yearly[year]["value"]) < 0.01
+
+    print(f"✓ {len(yearly)} years consistent across period types")
+
+    return trends
+
+
 def test_yoy_comparison():
     """Test year-over-year comparison."""
     print("\n=== Test: Year-over-Year Comparison ===")
@@ -95,6 +145,190 @@ def test_yoy_comparison():
     return result
 
 
+def test_custom_report():
+    """Test custom date range reports and their optional sections."""
+    print("\n=== Test: Custom Report ===")
+
+    end_date = date.today()
+    start_date = end_date - timedelta(days=180)
+    body = {
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "group_by": "week",
+        "include_comparisons": True,
+    }
+
+    response = requests.post(f"{BASE_URL}/analytics/custom-report", json=body)
+    assert response.status_code == 200, f"Failed: {response.text}"
+    report = response.json()
+
+    trends = {trend["metric"]: trend for trend in report["trends"]}
+    assert set(trends) == {"income", "expenses", "net"}
+    assert all("-W" in dp["period"] for dp in trends["expenses"]["data_points"])
+    assert abs(trends["income"]["total"] - report["total_income"]) < 0.01
+    assert abs(trends["expenses"]["total"] - report["total_expenses"]) < 0.01
+    assert abs(trends["net"]["total"] - report["net_income"]) < 0.01
+    assert (
+        abs(
+            sum(c["total_spent"] for c in report["category_breakdown"])
+            - report["total_expenses"]
+        )
+        < 0.01
+    )
+    assert report["comparison"] is not None
+    assert report["comparison"]["previous_end_date"] == str(
+        start_date - timedelta(days=1)
+    )
+
+    print(f"✓ Custom report: income {report['total_income']:.2f}")
+    print(f"  Expenses: {report['total_expenses']:.2f}")
+    print(f"  Categories: {len(report['category_breakdown'])}")
+
+    # Sections that were not requested are left out
+    body.update(
+        include_income=False,
+        include_categories=False,
+        include_trends=False,
+        include_comparisons=False,
+    )
+    response = requests.post(f"{BASE_URL}/analytics/custom-report", json=body)
+    assert response.status_code == 200, f"Failed: {response.text}"
+    report = response.json()
+    assert report["trends"] == []
+    assert report["category_breakdown"] == []
+    assert report["top_income_sources"] == []
+    assert report["comparison"] is None
+
+    # Invalid grouping and range
+    for invalid in (
+        {"group_by": "fortnight"},
+        {"start_date": str(end_date), "end_date": str(start_date)},
+    ):
+        response = requests.post(
+            f"{BASE_URL}/analytics/custom-report", json={**body, **invalid}
+        )
+        assert response.status_code == 400, f"{invalid}: {response.status_code}"
+
+    return report
+
+
+def test_drill_down():
+    """Test hierarchical drill-down from groups to categories to merchants."""
+    print("\n=== Test: Drill-Down ===")
+
+    response = requests.post(
+        f"{BASE_URL}/analytics/drill-down", json={"dimension": "group"}
+    )
+    assert response.status_code == 200, f"Failed: {response.text}"
+    groups = response.json()
+    assert groups["item_count"] == len(groups["items"])
+    values = [item["value"] for item in groups["items"]]
+    assert values == sorted(values, reverse=True), "Items not sorted by value"
+    assert abs(sum(values) - groups["total_value"]) < 0.01
+
+    if groups["top_item"] and groups["top_item"]["value"] > 0:
+        group = groups["top_item"]
+        assert group["child_dimension"] == "category"
+
+        # Categories of the group add up to the group
+        response = requests.post(
+            f"{BASE_URL}/analytics/drill-down",
+            json={"dimension": "category", "parent_id": group["id"]},
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        categories = response.json()
+        assert abs(categories["total_value"] - group["value"]) < 0.01
+        assert (
+            sum(item["transaction_count"] for item in categories["items"])
+            == group["transaction_count"]
+        )
+
+        # Merchants of the top category add up to the category
+        category = categories["top_item"]
+        response = requests.post(
+            f"{BASE_URL}/analytics/drill-down",
+            json={"dimension": "merchant", "parent_id": category["id"]},
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        merchants = response.json()
+        assert abs(merchants["total_value"] - category["value"]) < 0.01
+
+        print(
+            f"✓ {group['name']} > {category['name']}: {merchants['item_count']} merchants"
+        )
+
+    # Date slice narrows the totals
+    response = requests.post(
+        f"{BASE_URL}/analytics/drill-down",
+        json={"dimension": "account", "start_date": str(date.today())},
+    )
+    assert response.status_code == 200, f"Failed: {response.text}"
+    assert response.json()["total_value"] <= groups["total_value"] + 0.01
+
+    # Invalid requests
+    for body in (
+        {"dimension": "planet"},
+        {"dimension": "account", "parent_id": "acc_main"},
+    ):
+        response = requests.post(f"{BASE_URL}/analytics/drill-down", json=body)
+        assert response.status_code == 400, f"{body}: {response.status_code}"
+
+    return groups
+
+
+def test_drill_down_without_rate():
+    """Test that a transaction without an exchange rate is left out, not fatal."""
+    print("\n=== Test: Drill-Down Without Rate ===")
+
+    day = "1999-06-15"
+    created = requests.post(
+        f"{BASE_URL}/transactions",
+        json={
+            "date": day,
+            "description": "Unrated Foreign Expense",
+            "amount": -123.45,
+            "currency": "USD",
+            "account_id": "acc_main",
+            "category_id": "cat_wants_entertainment",
+            "type": "expense",
+            "source": "manual",
+        },
+    ).json()
+
+    try:
+        response = requests.post(
+            f"{BASE_URL}/analytics/drill-down", json={"dimension": "merchant"}
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        merchants = response.json()
+        assert merchants["unconverted_count"] >= 1
+        assert "Unrated Foreign Expense" not in [
+            item["name"] for item in merchants["items"]
+        ]
+
+        # Only date slices containing the transaction report it
+        response = requests.post(
+            f"{BASE_URL}/analytics/drill-down",
+            json={"dimension": "group", "start_date": day, "end_date": day},
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        assert response.json()["unconverted_count"] >= 1
+        response = requests.post(
+            f"{BASE_URL}/analytics/drill-down",
+            json={
+                "dimension": "group",
+                "start_date": "1999-06-16",
+                "end_date": "1999-06-30",
+            },
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        assert response.json()["unconverted_count"] == 0
+    finally:
+        requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+
+    print("✓ Unconvertible transaction left out and reported")
+
+
 def test_spending_patterns():
     """Test spending pattern detection."""
     print("\n=== Test: Spending Pattern Detection ===")
@@ -116,6 +350,142 @@ def test_spending_patterns():
     return patterns
 
 
+def test_spending_patterns_follow_writes():
+    """Test that running category statistics track new and deleted expenses."""
+    print("\n=== Test: Spending Patterns Follow Writes ===")
+
+    def patterns(**params):
+        response = requests.get(
+            f"{BASE_URL}/analytics/spending-patterns", params=params
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        return {p["category"]: p for p in response.json()}
+
+    def assert_same(running, summarized):
+        assert running.keys() == summarized.keys(), "Categories differ"
+        for name, pattern in running.items():
+            assert pattern["pattern_type"] == summarized[name]["pattern_type"]
+            assert pattern["frequency"] == summarized[name]["frequency"]
+            assert (
+                abs(pattern["average_amount"] - summarized[name]["average_amount"])
+                < 0.01
+            )
+
+    all_time = {"start_date": "1900-01-01", "end_date": "2100-12-31"}
+    before = patterns()
+    assert_same(before, patterns(**all_time))
+
+    created = requests.post(
+        f"{BASE_URL}/transactions",
+        json={
+            "date": str(date.today()),
+            "description": "Pattern Test Expense",
+            "amount": -98765.43,
+            "account_id": "acc_main",
+            "category_id": "cat_wants_entertainment",
+            "type": "expense",
+            "source": "manual",
+        },
+    ).json()
+    after = patterns()
+    assert_same(after, patterns(**all_time))
+
+    requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+    restored = patterns()
+    assert_same(restored, before)
+
+    print(f"✓ {len(after)} category patterns match the transaction history")
+
+    return after
+
+
+def test_anomalies():
+    """Test that an unusually large expense is flagged when it is written."""
+    print("\n=== Test: Anomaly Detection ===")
+
+    response = requests.post(
+        f"{BASE_URL}/analytics/drill-down", json={"dimension": "category"}
+    )
+    assert response.status_code == 200, f"Failed: {response.text}"
+    category = response.json()["top_item"]
+    assert category and category["transaction_count"] >= 5, "Not enough history"
+
+    created = requests.post(
+        f"{BASE_URL}/transactions",
+        json={
+            "date": str(date.today()),
+            "description": "Anomaly Test Expense",
+            "amount": -(category["value"] + 1000),
+            "account_id": "acc_main",
+            "category_id": category["id"],
+            "type": "expense",
+            "source": "manual",
+        },
+    ).json()
+
+    response = requests.get(
+        f"{BASE_URL}/analytics/anomalies", params={"category_id": category["id"]}
+    )
+    assert response.status_code == 200, f"Failed: {response.text}"
+    flagged = {a["transaction_id"]: a for a in response.json()}
+    assert created["id"] in flagged, "Large expense not flagged"
+    anomaly = flagged[created["id"]]
+    assert "category" in anomaly["reasons"]
+    assert anomaly["category_z_score"] >= 3
+    assert anomaly["amount"] > anomaly["expected_amount"]
+
+    # Deleted transactions are no longer reported
+    requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+    response = requests.get(f"{BASE_URL}/analytics/anomalies", params={"limit": 1000})
+    assert created["id"] not in [a["transaction_id"] for a in response.json()]
+
+    print(f"✓ Flagged {anomaly['description']} (score {anomaly['score']:.1f})")
+
+    return anomaly
+
+
+def test_anomalies_without_rate():
+    """Test that an expense without an exchange rate does not stop scoring."""
+    print("\n=== Test: Anomaly Detection Without Rate ===")
+
+    response = requests.post(
+        f"{BASE_URL}/analytics/drill-down", json={"dimension": "category"}
+    )
+    category = response.json()["top_item"]
+
+    def expense(description, amount, currency="ZAR", day=str(date.today())):
+        return requests.post(
+            f"{BASE_URL}/transactions",
+            json={
+                "date": day,
+                "description": description,
+                "amount": amount,
+                "currency": currency,
+                "account_id": "acc_main",
+                "category_id": category["id"],
+                "type": "expense",
+                "source": "manual",
+            },
+        ).json()
+
+    unrated = expense("Unrated Anomaly Expense", -10.0, "USD", "1999-06-15")
+    created = expense("Anomaly After Unrated", -(category["value"] + 1000))
+
+    try:
+        response = requests.get(
+            f"{BASE_URL}/analytics/anomalies", params={"category_id": category["id"]}
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        flagged = [a["transaction_id"] for a in response.json()]
+        assert created["id"] in flagged, "Scoring stopped at the unrated expense"
+        assert unrated["id"] not in flagged
+    finally:
+        requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+        requests.delete(f"{BASE_URL}/transactions/{unrated['id']}")
+
+    print("✓ Expense after an unrated one still flagged")
+
+
 def test_category_insights():
     """Test category insights."""
     print("\n=== Test: Category Insights ===")
@@ -218,6 +588,68 @@ def test_seasonal_predictions():
     return result
 
 
+def test_backtest_forecasts():
+    """Test the forecast backtesting script on a small linear data set."""
+    print("\n=== Test: Backtest Forecasts ===")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(Path(data_dir) / "transactions.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["id", "date", "description", "amount", "category_id"]
+                + ["account_id", "type", "currency"]
+            )
+            for month in range(1, 13):
+                day = f"2025-{month:02d}-15"
+                writer.writerow(
+                    [f"txn_bt_in_{month}", day, "Salary", 1000 + 10 * month]
+                    + ["cat_salary", "acc_bt", "income", "ZAR"]
+                )
+                writer.writerow(
+                    [f"txn_bt_out_{month}", day, "Groceries", -(500 + 5 * month)]
+                    + ["cat_groceries", "acc_bt", "expense", "ZAR"]
+                )
+
+        completed = subprocess.run(
+            [sys.executable, str(BACKTEST_SCRIPT), "--data-dir", data_dir]
+            + ["--json", "--workers", "2"],
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+    assert completed.returncode == 0, f"Backtest failed: {completed.stderr}"
+
+    result = json.loads(completed.stdout)
+    series = {item["series"]: item for item in result["series"]}
+    assert set(series) == {
+        "income",
+        "expenses",
+        "net",
+        "category:cat_salary",
+        "category:cat_groceries",
+    }, f"Wrong series: {sorted(series)}"
+    assert result["skipped_series"] == [], "No series is too short"
+
+    methods = {item["method"]: item for item in result["methods"]}
+    assert set(methods) == {"moving_average", "linear_regression", "seasonal"}
+    for summary in methods.values():
+        # 6 folds per series (origins 6..11 of 12 months)
+        assert summary["series"] == 5, f"Wrong series count: {summary}"
+        assert summary["folds"] == 30, f"Wrong fold count: {summary}"
+
+    # Every series is linear, so linear regression forecasts it exactly
+    assert methods["linear_regression"]["mean_mae"] == 0, "Linear fit not exact"
+    assert all(
+        item["recommended_method"] == "linear_regression" for item in series.values()
+    ), "Linear regression should win every series"
+    assert len(result["endpoint_timings"]) == 9, "Missing endpoint timings"
+
+    print(f"✓ Backtested {len(series)} series with {len(methods)} methods")
+    print(f"  Wall clock: {result['wall_clock_seconds']}s")
+
+    return result
+
+
 def test_financial_health_score():
     """Test financial health score calculation."""
     print("\n=== Test: Financial Health Score ===")
@@ -319,6 +751,32 @@ def test_expense_analysis():
     return result
 
 
+def test_expense_analysis_matches_parts():
+    """Test that the expense analysis matches the individual endpoints."""
+    print("\n=== Test: Expense Analysis Consistency ===")
+
+    params = {"start_date": str(date.today() - timedelta(days=120))}
+    result = requests.get(
+        f"{BASE_URL}/analytics/expense-analysis", params=params
+    ).json()
+
+    trend = requests.get(f"{BASE_URL}/analytics/trends/expenses", params=params).json()
+    patterns = requests.get(
+        f"{BASE_URL}/analytics/spending-patterns", params=params
+    ).json()
+    predictions = requests.get(
+        f"{BASE_URL}/analytics/predictions/expenses", params={"method": "seasonal"}
+    ).json()
+
+    assert result["trend"] == trend, "Trend differs from /trends/expenses"
+    assert result["patterns"] == patterns, "Patterns differ from /spending-patterns"
+    assert result["predictions"] == predictions, "Predictions differ"
+
+    print("✓ Expense analysis matches trend, patterns and predictions")
+
+    return result
+
+
 def test_date_range_filtering():
     """Test analytics with date range filtering."""
     print("\n=== Test: Date Range Filtering ===")
@@ -352,18 +810,26 @@ def run_all_tests():
         test_income_trend_analysis()
         test_expense_trend_analysis()
         test_quarterly_trend()
+        test_trend_periods_consistent()
 
         # Year-over-year
         test_yoy_comparison()
 
         # Patterns and insights
+        test_custom_report()
+        test_drill_down()
+        test_drill_down_without_rate()
         test_spending_patterns()
+        test_spending_patterns_follow_writes()
+        test_anomalies()
+        test_anomalies_without_rate()
         test_category_insights()
 
         # Predictions
         test_income_predictions()
         test_expense_predictions()
         test_seasonal_predictions()
+        test_backtest_forecasts()
 
         # Financial health
         test_financial_health_score()
@@ -372,6 +838,7 @@ def run_all_tests():
         # Comprehensive analysis
         test_income_analysis()
         test_expense_analysis()
+        test_expense_analysis_matches_parts()
 
         # Filtering
         test_date_range_filtering()
@@ -5,8 +5,45 @@ Run this after starting the backend server.
 
 import requests
 import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 BASE_URL = "http://localhost:8777/api"
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Writes one row through csv_manager and one straight to the file
+UNLOGGED_WRITE_SCRIPT = """
+import csv, json
+from config import config
+from models.transaction import TRANSACTION_FIELDNAMES
+from services.csv_manager import csv_manager
+from services.search_index import SearchIndexService, search_index_service
+
+def row(txn_id, description):
+    return {"id": txn_id, "date": "2025-10-06", "description": description,
+            "amount": "-5", "type": "expense", "currency": "ZAR"}
+
+def ids(service, query):
+    return [doc["id"] for _, doc in service.search(query, fuzzy=False)[0]]
+
+csv_manager.append_csv(
+    "transactions.csv", row("txn_logged", "Quokka Coffee"), TRANSACTION_FIELDNAMES
+)
+result = {"logged": ids(search_index_service, "quokka")}
+
+with open(config.get_data_path("transactions.csv"), "a", newline="") as f:
+    csv.DictWriter(f, TRANSACTION_FIELDNAMES).writerow(row("txn_direct", "Wombat Bakery"))
+result["direct"] = ids(search_index_service, "wombat")
+
+search_index_service.save()
+restored = SearchIndexService()
+result["restored"] = ids(restored, "quokka") + ids(restored, "wombat")
+print(json.dumps(result))
+"""
 
 
 def test_health():
@@ -47,6 +84,297 @@ def test_transactions():
     return response.status_code == 200
 
 
+def test_transactions_filtered():
+    """Test filtered transaction listing and index refresh after writes."""
+    print("Testing filtered transactions...")
+    all_transactions = requests.get(f"{BASE_URL}/transactions").json()
+    if not all_transactions:
+        print("Skipping filtered test (no transactions)\n")
+        return True
+
+    dates = [t["date"] for t in all_transactions]
+    if dates != sorted(dates, reverse=True):
+        print("Transactions are not sorted by date descending\n")
+        return False
+
+    sample = all_transactions[len(all_transactions) // 2]
+    params = {"from": sample["date"], "account_id": sample["account_id"]}
+    response = requests.get(f"{BASE_URL}/transactions", params=params)
+    expected = [
+        t["id"]
+        for t in all_transactions
+        if t["date"] >= sample["date"] and t["account_id"] == sample["account_id"]
+    ]
+    if response.status_code != 200 or [t["id"] for t in response.json()] != expected:
+        print("Filtered transactions do not match\n")
+        return False
+
+    # A new transaction shows up in the next query
+    created = requests.post(
+        f"{BASE_URL}/transactions",
+        json={
+            "date": sample["date"],
+            "description": "Filter index check",
+            "amount": -1.0,
+            "account_id": sample["account_id"],
+            "type": "expense",
+        },
+    ).json()
+    filtered = requests.get(f"{BASE_URL}/transactions", params=params).json()
+    requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+
+    found = created["id"] in [t["id"] for t in filtered]
+    print(f"Filtered transactions: {len(expected)}, new transaction found: {found}\n")
+    return found
+
+
+def test_search_transactions():
+    """Test full-text, prefix, fuzzy and constrained transaction search."""
+    print("Testing transaction search...")
+    created = requests.post(
+        f"{BASE_URL}/transactions",
+        json={
+            "date": "2025-10-06",
+            "description": "Quokka Coffee Roasters",
+            "amount": -42.5,
+            "account_id": "acc_main",
+            "type": "expense",
+            "tags": "coffee;treat",
+        },
+    ).json()
+
+    def search(**params):
+        response = requests.get(f"{BASE_URL}/transactions/search", params=params)
+        assert response.status_code == 200, response.text
+        return [hit["id"] for hit in response.json()["results"]]
+
+    assert created["id"] in search(q="quokka roasters")
+    assert created["id"] in search(q="quok")
+    assert created["id"] in search(q="quoka")
+    assert created["id"] not in search(q="quoka", fuzzy=False, prefix=False)
+    assert created["id"] in search(q="treat")
+    assert created["id"] in search(q="quokka", min_amount=40, max_amount=50)
+    assert created["id"] not in search(q="quokka", min_amount=50)
+    assert created["id"] not in search(q="quokka", **{"from": "2025-10-07"})
+
+    # Updates and deletes are reflected in the index
+    requests.put(
+        f"{BASE_URL}/transactions/{created['id']}",
+        json={"description": "Wombat Bakery"},
+    )
+    assert created["id"] not in search(q="quokka", fuzzy=False)
+    assert created["id"] in search(q="wombat")
+    requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+    assert created["id"] not in search(q="wombat")
+
+    response = requests.get(f"{BASE_URL}/transactions/search", params={"q": ""})
+    assert response.status_code == 422
+
+    print("Search found new, updated and deleted transactions correctly\n")
+    return True
+
+
+def test_search_unlogged_writes():
+    """Test that search picks up transactions written without the change log."""
+    print("Testing search after writes that bypass the change log...")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        completed = subprocess.run(
+            [sys.executable, "-c", UNLOGGED_WRITE_SCRIPT],
+            cwd=BACKEND_DIR,
+            env={**os.environ, "DATA_DIR": data_dir},
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout)
+
+    assert result["logged"] == ["txn_logged"], result
+    assert result["direct"] == ["txn_direct"], result
+    assert sorted(result["restored"]) == ["txn_direct", "txn_logged"], result
+
+    print("Search found transactions written around the change log\n")
+    return True
+
+
+def test_tag_filter():
+    """Test the tag filter and tag dictionary."""
+    print("Testing tag filter...")
+    created = [
+        requests.post(
+            f"{BASE_URL}/transactions",
+            json={
+                "date": date,
+                "description": "Tag filter test",
+                "amount": -10.0,
+                "account_id": "acc_main",
+                "type": "expense",
+                "tags": tags,
+            },
+        ).json()["id"]
+        for date, tags in (
+            ("2025-10-02", "tagtest-a; tagtest-b"),
+            ("2025-10-04", "tagtest-b"),
+            ("2025-09-30", "tagtest-a"),
+        )
+    ]
+
+    def tagged(tag, **params):
+        response = requests.get(
+            f"{BASE_URL}/transactions", params={"tag": tag, **params}
+        )
+        assert response.status_code == 200, response.text
+        return [txn["id"] for txn in response.json()]
+
+    assert tagged("tagtest-a") == [created[0], created[2]]
+    assert tagged("tagtest-b") == [created[1], created[0]]
+    assert tagged("tagtest-a", **{"from": "2025-10-01"}) == [created[0]]
+    assert tagged("tagtest-missing") == []
+
+    counts = {
+        summary["tag"]: summary["count"]
+        for summary in requests.get(f"{BASE_URL}/transactions/tags").json()
+    }
+    assert counts["tagtest-a"] == 2 and counts["tagtest-b"] == 2
+
+    # Deleted transactions leave the tag postings
+    for transaction_id in created:
+        requests.delete(f"{BASE_URL}/transactions/{transaction_id}")
+    assert tagged("tagtest-a") == []
+    counts = {
+        summary["tag"]: summary["count"]
+        for summary in requests.get(f"{BASE_URL}/transactions/tags").json()
+    }
+    assert "tagtest-a" not in counts
+
+    print("Tag filter and dictionary follow writes correctly\n")
+    return True
+
+
+def test_batch_transactions():
+    """Test batch creates, updates, patches and deletes."""
+    print("Testing batch transactions...")
+
+    def expense(description, tags=""):
+        return {
+            "date": "2025-10-08",
+            "description": description,
+            "amount": -15.0,
+            "account_id": "acc_main",
+            "type": "expense",
+            "tags": tags,
+        }
+
+    response = requests.post(
+        f"{BASE_URL}/transactions/batch",
+        json={
+            "creates": [
+                expense("Batch one", "batchtest"),
+                expense("Batch two", "batchtest"),
+                expense("Batch three"),
+            ]
+        },
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["created"] == 3
+    ids = [result["ids"][0] for result in data["results"]]
+    assert [result["status"] for result in data["results"]] == [201, 201, 201]
+
+    response = requests.post(
+        f"{BASE_URL}/transactions/batch",
+        json={
+            "updates": [
+                {"id": ids[2], "description": "Batch three renamed"},
+                {"id": "tx_missing", "description": "Nope"},
+            ],
+            "patches": [
+                {
+                    "filter": {"tag": "batchtest"},
+                    "patch": {"category_id": "cat_batch_test"},
+                },
+                {"filter": {}, "patch": {"category_id": "cat_everything"}},
+            ],
+            "deletes": [ids[0], "tx_missing"],
+        },
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    statuses = [(r["operation"], r["status"]) for r in data["results"]]
+    assert statuses == [
+        ("update", 200),
+        ("update", 404),
+        ("patch", 200),
+        ("patch", 400),
+        ("delete", 204),
+        ("delete", 404),
+    ]
+    assert sorted(data["results"][2]["ids"]) == sorted(ids[:2])
+    assert data["updated"] == 2 and data["deleted"] == 1
+
+    assert requests.get(f"{BASE_URL}/transactions/{ids[0]}").status_code == 404
+    second = requests.get(f"{BASE_URL}/transactions/{ids[1]}").json()
+    assert second["category_id"] == "cat_batch_test"
+    third = requests.get(f"{BASE_URL}/transactions/{ids[2]}").json()
+    assert third["description"] == "Batch three renamed"
+
+    requests.post(f"{BASE_URL}/transactions/batch", json={"deletes": ids[1:]})
+    assert requests.get(f"{BASE_URL}/transactions/{ids[2]}").status_code == 404
+
+    print("Batch applied creates, updates, patches and deletes correctly\n")
+    return True
+
+
+def test_concurrent_updates():
+    """Test that concurrent single-transaction updates and deletes are not lost."""
+    print("Testing concurrent transaction updates...")
+
+    creates = [
+        {
+            "date": "2025-10-08",
+            "description": f"Concurrent {i}",
+            "amount": -5.0,
+            "account_id": "acc_main",
+            "type": "expense",
+        }
+        for i in range(12)
+    ]
+    response = requests.post(
+        f"{BASE_URL}/transactions/batch", json={"creates": creates}
+    )
+    assert response.status_code == 200, response.text
+    ids = [result["ids"][0] for result in response.json()["results"]]
+    updated, deleted = ids[:8], ids[8:]
+
+    def update(transaction_id):
+        return requests.put(
+            f"{BASE_URL}/transactions/{transaction_id}",
+            json={"description": f"Renamed {transaction_id}"},
+        ).status_code
+
+    def delete(transaction_id):
+        return requests.delete(f"{BASE_URL}/transactions/{transaction_id}").status_code
+
+    jobs = [(update, i) for i in updated] + [(delete, i) for i in deleted]
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = [pool.submit(job, transaction_id) for job, transaction_id in jobs]
+        statuses = [future.result() for future in futures]
+    assert statuses == [200] * len(updated) + [204] * len(deleted), statuses
+
+    for transaction_id in updated:
+        response = requests.get(f"{BASE_URL}/transactions/{transaction_id}")
+        assert response.json()["description"] == f"Renamed {transaction_id}"
+    for transaction_id in deleted:
+        response = requests.get(f"{BASE_URL}/transactions/{transaction_id}")
+        assert response.status_code == 404
+
+    requests.post(f"{BASE_URL}/transactions/batch", json={"deletes": updated})
+
+    print("Concurrent updates and deletes all applied\n")
+    return True
+
+
 def test_categories():
     """Test categories endpoint."""
     print("Testing categories endpoint...")
@@ -126,6 +454,12 @@ def main():
         ("Health Check", test_health),
         ("Summary", test_summary),
         ("Transactions List", test_transactions),
+        ("Transactions Filtered", test_transactions_filtered),
+        ("Transactions Search", test_search_transactions),
+        ("Transactions Search Unlogged Writes", test_search_unlogged_writes),
+        ("Transactions Tag Filter", test_tag_filter),
+        ("Transactions Batch", test_batch_transactions),
+        ("Transactions Concurrent Updates", test_concurrent_updates),
         ("Categories List", test_categories),
         ("Accounts List", test_accounts),
     ]
@@ -1,7 +1,11 @@
 """Tests for export functionality (PDF, Excel, CSV)."""
 
 import requests
+import io
 import os
+import time
+import openpyxl
+import pypdfium2 as pdfium
 from datetime import date, timedelta
 
 BASE_URL = "http://127.0.0.1:8777/api"
@@ -29,6 +33,30 @@ def _check_file_exists(file_path):
     return False
 
 
+def _read_export_lines(file_path):
+    """Read the lines of an export file, trying the same locations as _check_file_exists."""
+    for path in [
+        file_path,
+        os.path.join("backend", file_path),
+        os.path.join("exports", os.path.basename(file_path)),
+    ]:
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read().splitlines()
+
+    raise AssertionError(f"File not found: {file_path}")
+
+
+def _load_export_workbook(filename):
+    """Download an Excel export and open its only worksheet."""
+    response = requests.get(f"{BASE_URL}/export/download/{filename}")
+    assert response.status_code == 200, f"Failed: {response.text}"
+
+    wb = openpyxl.load_workbook(io.BytesIO(response.content))
+    assert len(wb.worksheets) == 1, f"Unexpected sheets: {wb.sheetnames}"
+    return wb.worksheets[0]
+
+
 def test_export_transactions_pdf():
     """Test exporting transactions to PDF."""
     print("\n=== Test: Export Transactions to PDF ===")
@@ -77,6 +105,75 @@ def test_export_transactions_pdf_with_filters():
     return result
 
 
+def test_export_transactions_pdf_parallel():
+    """Test that a report long enough to render in parallel sections is complete."""
+    print("\n=== Test: Export Transactions to PDF (Parallel Sections) ===")
+
+    count = 5100  # At least PARALLEL_MIN_ROWS
+    response = requests.post(
+        f"{BASE_URL}/transactions/batch",
+        json={
+            "creates": [
+                {
+                    "date": "2025-10-08",
+                    "description": f"Parallel row {i:04d}",
+                    "amount": -1.0,
+                    "account_id": "acc_main",
+                    "category_id": "cat_pdf_parallel_test",
+                    "type": "expense",
+                }
+                for i in range(count)
+            ]
+        },
+    )
+    assert response.status_code == 200, f"Failed: {response.text}"
+    ids = [result["ids"][0] for result in response.json()["results"]]
+
+    try:
+        # Run as a job and follow its progress through the sections
+        response = requests.post(
+            f"{BASE_URL}/export/jobs",
+            json={
+                "export_type": "transactions",
+                "format": "pdf",
+                "category_id": "cat_pdf_parallel_test",
+            },
+        )
+        assert response.status_code == 202, f"Failed: {response.text}"
+        job = response.json()
+
+        progress = [job["progress"]]
+        for _ in range(1200):
+            job = requests.get(f"{BASE_URL}/export/jobs/{job['job_id']}").json()
+            progress.append(job["progress"])
+            if job["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.05)
+
+        assert job["status"] == "completed", f"Job did not complete: {job}"
+        assert progress == sorted(progress), f"Progress went backwards: {progress}"
+        assert progress[-1] == 1.0, "Completed job should report full progress"
+        assert any(0 < p < 1 for p in progress), f"No partial progress: {progress}"
+        result = job["result"]
+
+        response = requests.get(f"{BASE_URL}/export/download/{result['filename']}")
+        assert response.status_code == 200, f"Failed: {response.text}"
+        pdf = pdfium.PdfDocument(response.content)
+        text = "".join(page.get_textpage().get_text_range() for page in pdf)
+        pages = len(pdf)
+        pdf.close()
+
+        assert "Transactions" in text, "Missing report header"
+        missing = [i for i in range(count) if f"Parallel row {i:04d}" not in text]
+        assert not missing, f"{len(missing)} rows missing, e.g. {missing[:5]}"
+    finally:
+        requests.post(f"{BASE_URL}/transactions/batch", json={"deletes": ids})
+
+    print(f"✓ Exported {count} transactions on {pages} pages in parallel sections")
+
+    return result
+
+
 def test_export_transactions_excel():
     """Test exporting transactions to Excel."""
     print("\n=== Test: Export Transactions to Excel ===")
@@ -89,9 +186,40 @@ def test_export_transactions_excel():
     assert result["filename"].endswith(".xlsx"), "Wrong file extension"
     assert _check_file_exists(result["file_path"]), "File not created"
 
+    # Title, summary block, header row, then one row per transaction
+    ws = _load_export_workbook(result["filename"])
+    rows = list(ws.iter_rows(values_only=True))
+    assert ws.title == "Transactions", "Wrong sheet title"
+    assert rows[0][0] == "Transaction Report", "Missing title"
+    assert "A1:F1" in ws.merged_cells, "Title not merged"
+    assert [row[0] for row in rows[3:6]] == [
+        "Total Income:",
+        "Total Expenses:",
+        "Net:",
+    ], "Missing summary block"
+    assert rows[7] == (
+        "Date",
+        "Description",
+        "Category",
+        "Account",
+        "Type",
+        "Amount",
+        "Currency",
+        "Notes",
+    ), f"Wrong header row: {rows[7]}"
+    assert ws["A8"].font.b, "Header row not styled"
+
+    transactions = requests.get(f"{BASE_URL}/transactions").json()
+    data = rows[8:]
+    assert len(data) == len(transactions), f"{len(data)} != {len(transactions)} rows"
+    assert [(row[0], row[1], row[5]) for row in data] == [
+        (t["date"], t["description"], abs(t["amount"])) for t in transactions
+    ], "Data rows differ from transactions"
+
     print(
         f"✓ Exported transactions to Excel: {result['filename']} ({result['file_size']} bytes)"
     )
+    print(f"  Workbook opens with {len(data)} transaction rows")
 
     return result
 
@@ -115,6 +243,44 @@ def test_export_transactions_csv():
     return result
 
 
+def test_export_transactions_stream():
+    """Test streaming transaction exports straight into the response."""
+    print("\n=== Test: Stream Transaction Exports ===")
+
+    response = requests.post(
+        f"{BASE_URL}/export/transactions/csv", params={"stream": True}
+    )
+    assert response.status_code == 200, f"Failed: {response.text}"
+    assert response.headers["content-type"].startswith("text/csv"), "Wrong type"
+    assert "attachment" in response.headers["content-disposition"]
+    assert ".csv" in response.headers["content-disposition"], "Wrong filename"
+
+    lines = response.content.decode("utf-8").splitlines()
+    assert lines[0].startswith("Date,Description,Category"), "Missing header row"
+
+    saved = requests.post(f"{BASE_URL}/export/transactions/csv").json()
+    assert len(lines) == len(_read_export_lines(saved["file_path"])), "Row mismatch"
+
+    print(f"✓ Streamed CSV with {len(lines) - 1} transactions")
+
+    response = requests.post(
+        f"{BASE_URL}/export/transactions/excel", params={"stream": True}
+    )
+    assert response.status_code == 200, f"Failed: {response.text}"
+    assert "spreadsheetml" in response.headers["content-type"], "Wrong type"
+    assert ".xlsx" in response.headers["content-disposition"], "Wrong filename"
+    assert response.content[:2] == b"PK", "Not an xlsx (zip) file"
+
+    streamed = openpyxl.load_workbook(io.BytesIO(response.content)).worksheets[0]
+    saved = requests.post(f"{BASE_URL}/export/transactions/excel").json()
+    ws = _load_export_workbook(saved["filename"])
+    assert [[c.value for c in row] for row in streamed.iter_rows(min_row=8)] == [
+        [c.value for c in row] for row in ws.iter_rows(min_row=8)
+    ], "Streamed rows differ from the saved export"
+
+    print(f"✓ Streamed Excel workbook ({len(response.content)} bytes)")
+
+
 def test_export_financial_summary_pdf():
     """Test exporting financial summary to PDF."""
     print("\n=== Test: Export Financial Summary to PDF ===")
@@ -166,9 +332,29 @@ def test_export_investment_portfolio_excel():
     assert result["filename"].endswith(".xlsx"), "Wrong file extension"
     assert _check_file_exists(result["file_path"]), "File not created"
 
+    ws = _load_export_workbook(result["filename"])
+    rows = list(ws.iter_rows(values_only=True))
+    assert ws.title == "Portfolio", "Wrong sheet title"
+    assert rows[0][0] == "Investment Portfolio", "Missing title"
+    assert [row[0] for row in rows[2:7]] == [
+        "Total Investments:",
+        "Total Value:",
+        "Total Cost:",
+        "Profit/Loss:",
+        "Return:",
+    ], "Missing summary block"
+    assert rows[8][:4] == ("Symbol", "Name", "Type", "Quantity"), "Wrong header row"
+
+    investments = requests.get(f"{BASE_URL}/investments").json()
+    assert rows[2][1] == len(investments), "Wrong investment count"
+    assert sorted(row[0] for row in rows[9:]) == sorted(
+        inv["symbol"] for inv in investments
+    ), "Data rows differ from investments"
+
     print(
         f"✓ Exported investment portfolio to Excel: {result['filename']} ({result['file_size']} bytes)"
     )
+    print(f"  Workbook opens with {len(rows) - 9} investment rows")
 
     return result
 
@@ -192,6 +378,63 @@ def test_export_debt_report_pdf():
     return result
 
 
+def test_export_jobs_and_cache():
+    """Test background export jobs and the export result cache."""
+    print("\n=== Test: Export Jobs and Cache ===")
+
+    payload = {
+        "export_type": "transactions",
+        "format": "csv",
+        "transaction_type": "expense",
+    }
+    response = requests.post(f"{BASE_URL}/export/jobs", json=payload)
+    assert response.status_code == 202, f"Failed: {response.text}"
+    job = response.json()
+    assert job["params"]["transaction_type"] == "expense", "Filters not recorded"
+
+    for _ in range(100):
+        job = requests.get(f"{BASE_URL}/export/jobs/{job['job_id']}").json()
+        if job["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.1)
+
+    assert job["status"] == "completed", f"Job did not complete: {job}"
+    assert job["progress"] == 1.0, "Completed job should report full progress"
+    assert _check_file_exists(job["result"]["file_path"]), "File not created"
+
+    print(f"✓ Export job completed: {job['result']['filename']}")
+
+    # Identical export over unchanged data is served from the cache
+    repeat = requests.post(f"{BASE_URL}/export/jobs", json=payload).json()
+    assert repeat["status"] == "completed", "Repeated export should be cached"
+    assert repeat["cached"] is True, "Repeated export should be cached"
+    assert repeat["result"]["filename"] == job["result"]["filename"]
+
+    sync = requests.post(
+        f"{BASE_URL}/export/transactions/csv", params={"transaction_type": "expense"}
+    ).json()
+    assert sync["filename"] == job["result"]["filename"], "Sync export not cached"
+
+    print("✓ Repeated export served from cache")
+
+    response = requests.post(
+        f"{BASE_URL}/export/jobs",
+        json={"export_type": "budget_report", "format": "pdf"},
+    )
+    assert response.status_code == 400, "Unsupported export should be rejected"
+
+    response = requests.get(f"{BASE_URL}/export/jobs/exp_missing")
+    assert response.status_code == 404, "Missing job should return 404"
+
+    response = requests.post(
+        f"{BASE_URL}/export/cleanup", params={"retention_days": 365}
+    )
+    assert response.status_code == 200, f"Failed: {response.text}"
+    assert "deleted" in response.json(), "Missing cleanup result"
+
+    print("✓ Export job errors and cleanup handled")
+
+
 def test_list_exports():
     """Test listing all export files."""
     print("\n=== Test: List Exports ===")
@@ -212,6 +455,50 @@ def test_list_exports():
     return exports
 
 
+def test_list_exports_paged():
+    """Test paging and filtering the export list."""
+    print("\n=== Test: List Exports (Paged and Filtered) ===")
+
+    created = requests.post(f"{BASE_URL}/export/debt-report/pdf").json()
+
+    response = requests.get(
+        f"{BASE_URL}/export/list", params={"export_type": "debt_report", "limit": 1}
+    )
+    assert response.status_code == 200, f"Failed: {response.text}"
+    page = response.json()
+    total = int(response.headers["X-Total-Count"])
+    assert len(page) == 1, "Page size not applied"
+    assert total >= 1, "Missing total count"
+
+    reports = requests.get(
+        f"{BASE_URL}/export/list", params={"export_type": "debt_report"}
+    ).json()
+    assert len(reports) == min(total, 100), "Default page size not applied"
+    assert created["filename"] in [e["filename"] for e in reports], "Export missing"
+    created_at = [e["created_at"] for e in reports]
+    assert created_at == sorted(created_at, reverse=True), "Not newest first"
+    assert page[0] == reports[0], "First page does not start with newest export"
+
+    response = requests.get(
+        f"{BASE_URL}/export/list",
+        params={"export_type": "debt_report", "limit": 1, "offset": total},
+    )
+    assert response.json() == [], "Offset past the end should return no exports"
+
+    response = requests.get(f"{BASE_URL}/export/list", params={"format": "csv"})
+    assert all(e["format"] == "csv" for e in response.json()), "Format filter failed"
+
+    response = requests.get(
+        f"{BASE_URL}/export/list", params={"created_to": "2000-01-01"}
+    )
+    assert response.json() == [], "Date filter failed"
+
+    response = requests.get(f"{BASE_URL}/export/list", params={"limit": 100000})
+    assert response.status_code == 422, "Page size should be bounded"
+
+    print(f"✓ Paged export list ({total} debt reports)")
+
+
 def test_download_export(filename):
     """Test downloading an export file."""
     print(f"\n=== Test: Download Export ({filename}) ===")
@@ -293,8 +580,10 @@ def run_all_tests():
         # Transaction exports
         pdf_result = test_export_transactions_pdf()
         test_export_transactions_pdf_with_filters()
+        test_export_transactions_pdf_parallel()
         excel_result = test_export_transactions_excel()
         csv_result = test_export_transactions_csv()
+        test_export_transactions_stream()
 
         # Financial summary export
         test_export_financial_summary_pdf()
@@ -306,8 +595,12 @@ def run_all_tests():
         # Debt report export
         test_export_debt_report_pdf()
 
+        # Background jobs
+        test_export_jobs_and_cache()
+
         # List and download
         exports = test_list_exports()
+        test_list_exports_paged()
 
         # Download test (use first PDF file)
         if pdf_result:
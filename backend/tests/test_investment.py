@@ -263,6 +263,146 @@ def test_get_investment_performance(investment_id):
     return performance
 
 
+def test_position_fifo_lots():
+    """Test that positions are derived from trades with FIFO lots."""
+    print("\n=== Test: Position FIFO Lots ===")
+
+    investment_data = {
+        "symbol": "FIFO",
+        "name": "FIFO Test Corp",
+        "type": "stock",
+        "currency": "USD",
+        "quantity": 0,
+        "average_cost": 0,
+        "current_price": 20.00,
+        "last_updated": str(date.today()),
+    }
+    response = requests.post(f"{BASE_URL}/investments", json=investment_data)
+    assert response.status_code == 201, f"Failed: {response.text}"
+    investment_id = response.json()["id"]
+
+    trades = [
+        ("buy", 10, 10.00, 100.00),
+        ("buy", 10, 12.00, 120.00),
+        ("sell", 15, 15.00, 225.00),
+    ]
+    trade_ids = []
+    for trade_type, quantity, price, total in trades:
+        response = requests.post(
+            f"{BASE_URL}/investments/transactions",
+            json={
+                "investment_id": investment_id,
+                "date": str(date.today()),
+                "type": trade_type,
+                "quantity": quantity,
+                "price": price,
+                "total_amount": total,
+            },
+        )
+        assert response.status_code == 201, f"Failed: {response.text}"
+        trade_ids.append(response.json()["id"])
+
+    # Sell consumes the first lot and half of the second
+    response = requests.get(f"{BASE_URL}/investments/{investment_id}/position")
+    assert response.status_code == 200, f"Failed: {response.text}"
+    position = response.json()
+    assert position["quantity"] == 5
+    assert abs(position["average_cost"] - 12.00) < 0.001
+    assert abs(position["realized_profit_loss"] - (225 - 100 - 60)) < 0.001
+    assert abs(position["unrealized_profit_loss"] - (100 - 60)) < 0.001
+    assert len(position["lots"]) == 1
+
+    # Deleting the sell restores the position
+    response = requests.delete(f"{BASE_URL}/investments/transactions/{trade_ids[2]}")
+    assert response.status_code == 200, f"Failed: {response.text}"
+    investment = requests.get(f"{BASE_URL}/investments/{investment_id}").json()
+    assert investment["quantity"] == 20
+    assert abs(investment["average_cost"] - 11.00) < 0.001
+
+    # Full rebuild yields the same position
+    response = requests.post(f"{BASE_URL}/investments/positions/rebuild")
+    assert response.status_code == 200, f"Failed: {response.text}"
+    rebuilt = requests.get(f"{BASE_URL}/investments/{investment_id}/position").json()
+    assert rebuilt["quantity"] == 20
+    assert rebuilt["realized_profit_loss"] == 0
+
+    requests.delete(f"{BASE_URL}/investments/{investment_id}")
+    print(f"✓ Position derived from trades: {rebuilt['quantity']} units in lots")
+
+
+def test_update_after_trades():
+    """Test that saving derived holdings back does not count trades twice."""
+    print("\n=== Test: Update After Trades ===")
+
+    response = requests.post(
+        f"{BASE_URL}/investments",
+        json={
+            "symbol": "EDIT",
+            "name": "Edit Test Corp",
+            "type": "stock",
+            "currency": "USD",
+            "quantity": 10,
+            "average_cost": 100.00,
+            "current_price": 110.00,
+            "last_updated": str(date.today()),
+        },
+    )
+    assert response.status_code == 201, f"Failed: {response.text}"
+    investment_id = response.json()["id"]
+
+    try:
+        # A back-dated buy on top of the opening holding
+        response = requests.post(
+            f"{BASE_URL}/investments/transactions",
+            json={
+                "investment_id": investment_id,
+                "date": "2020-01-15",
+                "type": "buy",
+                "quantity": 5,
+                "price": 110.00,
+                "total_amount": 550.00,
+            },
+        )
+        assert response.status_code == 201, f"Failed: {response.text}"
+
+        # The edit form sends back the derived values it was shown
+        investment = requests.get(f"{BASE_URL}/investments/{investment_id}").json()
+        assert investment["quantity"] == 15
+        response = requests.put(
+            f"{BASE_URL}/investments/{investment_id}",
+            json={
+                "name": "Edit Test Corporation",
+                "quantity": investment["quantity"],
+                "average_cost": investment["average_cost"],
+            },
+        )
+        assert response.status_code == 200, f"Failed: {response.text}"
+        updated = response.json()
+        assert updated["name"] == "Edit Test Corporation"
+        assert updated["quantity"] == 15
+        assert abs(updated["average_cost"] - 1550 / 15) < 0.001
+
+        # Changing a derived holding is rejected
+        response = requests.put(
+            f"{BASE_URL}/investments/{investment_id}", json={"quantity": 20}
+        )
+        assert response.status_code == 400, f"Failed: {response.text}"
+
+        # The opening lot stays first in FIFO order, dated before the buy
+        position = requests.get(
+            f"{BASE_URL}/investments/{investment_id}/position"
+        ).json()
+        assert [lot["transaction_id"] is None for lot in position["lots"]] == [
+            True,
+            False,
+        ]
+        assert position["lots"][0]["date"] <= position["lots"][1]["date"]
+    finally:
+        requests.delete(f"{BASE_URL}/investments/{investment_id}")
+
+    print("✓ Derived holdings saved back unchanged; changes rejected")
+
+
 def test_create_crypto_investment():
     """Test creating a cryptocurrency investment."""
     print("\n=== Test: Create Crypto Investment ===")
@@ -370,6 +510,93 @@ def test_get_portfolio_value():
     return result
 
 
+def test_portfolio_endpoints_consistent():
+    """Test that portfolio summary, value and profit/loss agree."""
+    print("\n=== Test: Portfolio Endpoints Consistent ===")
+
+    for base_currency in ["USD", "ZAR"]:
+        params = {"base_currency": base_currency}
+        summary = requests.get(
+            f"{BASE_URL}/investments/portfolio/summary", params=params
+        ).json()
+        value = requests.get(
+            f"{BASE_URL}/investments/portfolio/value", params=params
+        ).json()
+        profit_loss = requests.get(
+            f"{BASE_URL}/investments/portfolio/profit-loss", params=params
+        ).json()
+
+        assert summary["currency"] == base_currency
+        assert abs(value["total_value"] - summary["total_value"]) < 0.01
+        assert abs(profit_loss["profit_loss"] - summary["total_profit_loss"]) < 0.01
+        by_type_total = sum(t["total_value"] for t in summary["by_type"].values())
+        assert abs(by_type_total - summary["total_value"]) < 0.01
+        print(f"✓ {base_currency}: {summary['total_value']:.2f}")
+
+
+def test_portfolio_without_rate():
+    """Test that holdings without an exchange rate are left out of the totals."""
+    print("\n=== Test: Portfolio Without Rate ===")
+
+    def summary():
+        return requests.get(
+            f"{BASE_URL}/investments/portfolio/summary",
+            params={"base_currency": "USD"},
+        ).json()
+
+    before = summary()
+    response = requests.post(
+        f"{BASE_URL}/investments",
+        json={
+            "symbol": "UNRT",
+            "name": "Unrated Holding",
+            "type": "stock",
+            "currency": "XTS",
+            "quantity": 3,
+            "average_cost": 1000.00,
+            "current_price": 1000.00,
+            "last_updated": str(date.today()),
+        },
+    )
+    assert response.status_code == 201, f"Failed: {response.text}"
+    investment_id = response.json()["id"]
+
+    try:
+        after = summary()
+        assert "UNRT" in after["unconverted_investments"]
+        assert after["total_investments"] == before["total_investments"] + 1
+        unrated = after["unconverted_totals"]["XTS"]
+        assert unrated["count"] == 1
+        assert abs(unrated["total_value"] - 3000.00) < 0.01
+        assert abs(after["total_value"] - before["total_value"]) < 0.01
+        assert abs(after["total_cost"] - before["total_cost"]) < 0.01
+        assert "UNRT" not in [p["symbol"] for p in after["top_performers"]]
+    finally:
+        requests.delete(f"{BASE_URL}/investments/{investment_id}")
+
+    print("✓ Holding without a rate listed, not summed")
+
+
+def test_portfolio_default_currency():
+    """Test that the portfolio reports in the settings base currency by default."""
+    print("\n=== Test: Portfolio Default Currency ===")
+
+    base_currency = requests.get(f"{BASE_URL}/summary").json()["base_currency"]
+    default = requests.get(f"{BASE_URL}/investments/portfolio/summary").json()
+    explicit = requests.get(
+        f"{BASE_URL}/investments/portfolio/summary",
+        params={"base_currency": base_currency},
+    ).json()
+    value = requests.get(f"{BASE_URL}/investments/portfolio/value").json()
+
+    assert default["currency"] == base_currency
+    assert default == explicit
+    assert value["currency"] == base_currency
+    assert abs(value["total_value"] - default["total_value"]) < 0.01
+
+    print(f"✓ Default summary reported in {base_currency}")
+
+
 def test_summary_includes_portfolio():
     """Test that summary endpoint includes portfolio data."""
     print("\n=== Test: Summary Includes Portfolio ===")
@@ -412,6 +639,10 @@ def run_all_tests():
         # Performance tests
         test_get_investment_performance(investment["id"])
 
+        # Position ledger
+        test_position_fifo_lots()
+        test_update_after_trades()
+
         # Multiple investment types
         test_create_crypto_investment()
         test_create_etf_investment()
@@ -420,6 +651,9 @@ def run_all_tests():
         test_get_portfolio_summary()
         test_get_asset_allocation()
         test_get_portfolio_value()
+        test_portfolio_endpoints_consistent()
+        test_portfolio_without_rate()
+        test_portfolio_default_currency()
 
         # Integration test
         test_summary_includes_portfolio()
@@ -171,9 +171,79 @@ def test_recurring_transactions():
     print("=" * 60)
 
 
+def test_recurring_suggestions():
+    """Test detecting a subscription from monthly charges and accepting it."""
+
+    print("\n🧪 Testing Recurring Transaction Suggestions")
+    print("=" * 60)
+
+    # 1. Record four monthly charges of the same subscription, the latest
+    #    one charged twice on the same day
+    created = []
+    recurring_id = None
+    try:
+        for months_ago in (0, 0, 1, 2, 3):
+            response = requests.post(
+                f"{BASE_URL}/transactions",
+                json={
+                    "date": str(date.today() - timedelta(days=30 * months_ago)),
+                    "description": f"STREAMLY PREMIUM #{1000 + months_ago}",
+                    "amount": -99.99,
+                    "account_id": "acc_main",
+                    "category_id": "cat_wants_entertainment",
+                    "type": "expense",
+                    "source": "manual",
+                },
+            )
+            assert response.status_code == 201, response.text
+            created.append(response.json()["id"])
+
+        # 2. The charges are suggested as a monthly recurring transaction
+        response = requests.get(f"{BASE_URL}/recurring/suggestions")
+        print_response("GET /recurring/suggestions", response)
+        assert response.status_code == 200
+        listed = response.json()
+        suggestions = {s["merchant"]: s for s in listed}
+        assert "streamly premium" in suggestions, "Subscription not detected"
+        suggestion = suggestions["streamly premium"]
+        assert suggestion["frequency"] == "monthly"
+        assert suggestion["occurrences"] == 4
+        assert suggestion["rule"]["amount"] == -99.99
+        assert suggestion["rule"]["name"] == "Streamly Premium"
+        assert suggestion["next_due"] > str(date.today())
+
+        # 3. Streaming returns the same suggestions as NDJSON
+        response = requests.get(
+            f"{BASE_URL}/recurring/suggestions", params={"stream": True}
+        )
+        assert response.status_code == 200
+        streamed = [json.loads(line) for line in response.text.splitlines()]
+        # A merchant charged different amounts has one suggestion per amount
+        assert sorted(streamed, key=json.dumps) == sorted(listed, key=json.dumps)
+
+        # 4. Once the rule exists it is no longer suggested
+        response = requests.post(f"{BASE_URL}/recurring", json=suggestion["rule"])
+        print_response("POST /recurring (suggested rule)", response)
+        assert response.status_code == 201
+        recurring_id = response.json()["id"]
+        assert recurring_id.startswith("rec_streamly-premium_")
+
+        response = requests.get(f"{BASE_URL}/recurring/suggestions")
+        assert "streamly premium" not in [s["merchant"] for s in response.json()]
+    finally:
+        if recurring_id:
+            response = requests.delete(f"{BASE_URL}/recurring/{recurring_id}")
+            assert response.status_code == 204, response.text
+        for transaction_id in created:
+            requests.delete(f"{BASE_URL}/transactions/{transaction_id}")
+
+    print("\n✅ Recurring Suggestions Test Complete!")
+
+
 if __name__ == "__main__":
     try:
         test_recurring_transactions()
+        test_recurring_suggestions()
     except requests.exceptions.ConnectionError:
         print("\n❌ Error: Could not connect to backend API")
         print("   Make sure the backend is running on http://localhost:8777")
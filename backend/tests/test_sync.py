@@ -0,0 +1,193 @@
+"""Test script for delta sync functionality."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import requests
+
+BASE_URL = "http://localhost:8777/api"
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Each ChangeLog instance keeps its own state, like a separate process
+SHARED_LOG_SCRIPT = """
+import json
+from concurrent.futures import ThreadPoolExecutor
+from services.change_log import ChangeLog, INSERT
+
+server, script = ChangeLog(), ChangeLog()
+server.record("transactions", [(INSERT, "a", {})])
+script.record("transactions", [(INSERT, "b", {})])
+server.record("transactions", [(INSERT, "c", {})])
+interleaved = server.changes_since(1, 10)
+
+def write(worker):
+    log = ChangeLog()
+    return [log.record("budgets", [(INSERT, f"{worker}-{i}", {})]) for i in range(50)]
+
+with ThreadPoolExecutor(max_workers=4) as executor:
+    concurrent = [seq for seqs in executor.map(write, range(4)) for seq in seqs]
+
+print(json.dumps({"interleaved": interleaved, "concurrent": concurrent}))
+"""
+
+
+def get_changes(since, **params):
+    """Get changes since a sequence number."""
+    response = requests.get(
+        f"{BASE_URL}/sync/changes", params={"since": since, **params}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_sync_changes():
+    """Test that writes show up as changes since a sequence number."""
+    print("\n🧪 Testing Delta Sync")
+    print("=" * 60)
+
+    # 1. A client without data is told to reload, and where to continue
+    start = get_changes(0)
+    assert start["reset"] is True
+    seq = start["seq"]
+    assert get_changes(seq) == {
+        "since": seq,
+        "seq": seq,
+        "has_more": False,
+        "reset": False,
+        "changes": [],
+    }
+
+    # 2. Create, update and delete show up as row changes
+    created = requests.post(
+        f"{BASE_URL}/transactions",
+        json={
+            "date": "2025-10-09",
+            "description": "Sync test",
+            "amount": -12.0,
+            "account_id": "acc_main",
+            "type": "expense",
+        },
+    ).json()
+    deleted = requests.post(
+        f"{BASE_URL}/transactions",
+        json={
+            "date": "2025-10-09",
+            "description": "Sync test deleted",
+            "amount": -8.0,
+            "account_id": "acc_main",
+            "type": "expense",
+        },
+    ).json()
+
+    data = get_changes(seq, table="transactions")
+    assert [(c["op"], c["key"]) for c in data["changes"]] == [
+        ("insert", created["id"]),
+        ("insert", deleted["id"]),
+    ]
+    assert data["changes"][0]["row"]["description"] == "Sync test"
+    after_creates = data["seq"]
+
+    requests.put(
+        f"{BASE_URL}/transactions/{created['id']}",
+        json={"description": "Sync test renamed"},
+    )
+    requests.delete(f"{BASE_URL}/transactions/{deleted['id']}")
+
+    # Only the rewritten rows changed, latest change per row
+    data = get_changes(after_creates, table="transactions")
+    assert [(c["op"], c["key"]) for c in data["changes"]] == [
+        ("update", created["id"]),
+        ("delete", deleted["id"]),
+    ]
+    assert data["changes"][0]["row"]["description"] == "Sync test renamed"
+    assert data["changes"][1]["row"] is None
+
+    data = get_changes(seq, table="transactions")
+    assert [(c["op"], c["key"]) for c in data["changes"]] == [
+        ("update", created["id"]),
+        ("delete", deleted["id"]),
+    ]
+
+    # 3. Paging with limit
+    first = get_changes(seq, table="transactions", limit=1)
+    assert len(first["changes"]) == 1 and first["has_more"] is True
+    rest = get_changes(first["seq"], table="transactions")
+    assert rest["has_more"] is False
+    assert rest["changes"][-1]["key"] == deleted["id"]
+
+    # 4. Updates and deletes by ID record their row only
+    budget = requests.post(
+        f"{BASE_URL}/budgets",
+        json={
+            "year": 2099,
+            "month": 12,
+            "needs_planned": 100,
+            "wants_planned": 50,
+            "savings_planned": 25,
+        },
+    ).json()
+    after_create = get_changes(seq, table="budgets")["seq"]
+
+    requests.put(f"{BASE_URL}/budgets/{budget['id']}", json={"notes": "Sync test"})
+    data = get_changes(after_create, table="budgets")
+    assert [(c["op"], c["key"]) for c in data["changes"]] == [("update", budget["id"])]
+    assert data["changes"][0]["row"]["notes"] == "Sync test"
+
+    requests.delete(f"{BASE_URL}/budgets/{budget['id']}")
+    data = get_changes(data["seq"], table="budgets")
+    assert [(c["op"], c["key"]) for c in data["changes"]] == [("delete", budget["id"])]
+
+    # 5. Clients ahead of the log are told to reload
+    assert get_changes(rest["seq"] + 1000)["reset"] is True
+
+    requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+
+    print("\n✅ Delta Sync Test Complete!")
+
+
+def test_changes_across_processes():
+    """Test that writers with their own log state number changes uniquely."""
+    print("\n🧪 Testing Change Log Shared Between Processes")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        completed = subprocess.run(
+            [sys.executable, "-c", SHARED_LOG_SCRIPT],
+            cwd=BACKEND_DIR,
+            env={**os.environ, "DATA_DIR": data_dir},
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout)
+
+    # A writer sees the changes another one appended after its last look
+    interleaved = result["interleaved"]
+    assert [(c["seq"], c["key"]) for c in interleaved["changes"]] == [
+        (2, "a"),
+        (3, "b"),
+        (4, "c"),
+    ], interleaved
+    assert interleaved["seq"] == 4
+
+    # Concurrent writers never reuse a number
+    concurrent = result["concurrent"]
+    assert sorted(concurrent) == list(range(5, 205)), "Duplicate sequence numbers"
+
+    print("✅ Sequence numbers unique across writers")
+
+
+if __name__ == "__main__":
+    try:
+        test_sync_changes()
+        test_changes_across_processes()
+    except requests.exceptions.ConnectionError:
+        print("\n❌ Error: Could not connect to backend API")
+        print("   Make sure the backend is running on http://localhost:8777")
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
@@ -142,6 +142,208 @@ def test_debt_endpoints():
     return True
 
 
+def test_debt_payoff_sweep():
+    """Test extra-payment sensitivity sweep endpoint."""
+    print_section("Testing Debt Payoff Sweep")
+
+    print("POST /api/debts/payoff-sweep")
+    sweep_data = {"min_extra": 0, "max_extra": 2000, "step": 500}
+    response = requests.post(f"{BASE_URL}/debts/payoff-sweep", json=sweep_data)
+    print(f"Status: {response.status_code}")
+    assert response.status_code == 200, f"Failed: {response.text}"
+
+    sweep = response.json()
+    assert [p["extra_payment"] for p in sweep["points"]] == [0, 500, 1000, 1500, 2000]
+
+    # Savings relative to the baseline must never shrink as extra payment grows
+    for method in ["avalanche", "snowball"]:
+        saved = [p[method]["interest_saved"] for p in sweep["points"]]
+        assert saved[0] == 0
+        assert saved == sorted(saved), f"{method} savings not monotonic: {saved}"
+        print(f"{method}: interest saved {saved}")
+
+    # Must match the single-scenario payoff plan
+    plan_data = {"extra_payment": 2000, "strategy": "avalanche"}
+    plan = requests.post(f"{BASE_URL}/debts/payoff-plan", json=plan_data).json()
+    assert sweep["points"][-1]["avalanche"]["total_months"] == plan["total_months"]
+    assert sweep["points"][-1]["avalanche"]["total_interest"] == plan["total_interest"]
+
+    # Too many points is rejected
+    response = requests.post(
+        f"{BASE_URL}/debts/payoff-sweep",
+        json={"max_extra": 100000, "step": 1},
+    )
+    assert response.status_code == 400
+
+    print()
+    return True
+
+
+def _monthly_payoff_loop(debts, extra_payment):
+    """
+    Reference payoff simulation: the original month-by-month loop.
+
+    Args:
+        debts: Active debts in priority order (id, name, balance,
+            interest_rate, minimum_payment)
+        extra_payment: Extra monthly payment
+
+    Returns:
+        Plan totals, payoff month per debt ID and the first 12 months
+    """
+    working_debts = [d.copy() for d in debts]
+    total_interest = 0
+    total_paid = 0
+    month = 0
+    monthly_schedule = []
+    debt_payoff_months = {}
+
+    while any(d["balance"] > 0 for d in working_debts):
+        month += 1
+        if month > 600:
+            break
+
+        month_payment = 0
+        month_interest = 0
+
+        for debt in working_debts:
+            if debt["balance"] > 0:
+                interest = debt["balance"] * (debt["interest_rate"] / 100 / 12)
+                month_interest += interest
+                total_interest += interest
+                debt["balance"] += interest
+
+        available_payment = (
+            sum(d["minimum_payment"] for d in working_debts if d["balance"] > 0)
+            + extra_payment
+        )
+
+        for i, debt in enumerate(working_debts):
+            if debt["balance"] > 0:
+                if i == 0:
+                    payment = min(debt["balance"], available_payment)
+                else:
+                    payment = min(debt["balance"], debt["minimum_payment"])
+                    available_payment -= payment
+
+                debt["balance"] -= payment
+                month_payment += payment
+                total_paid += payment
+
+                if debt["balance"] <= 0:
+                    debt["balance"] = 0
+                    debt_payoff_months.setdefault(debt["id"], month)
+                    available_payment += debt["minimum_payment"]
+
+        monthly_schedule.append(
+            {
+                "month": month,
+                "payment": round(month_payment, 2),
+                "interest": round(month_interest, 2),
+                "remaining_balance": round(sum(d["balance"] for d in working_debts), 2),
+                "debts": [
+                    {
+                        "id": d["id"],
+                        "name": d["name"],
+                        "balance": round(d["balance"], 2),
+                    }
+                    for d in working_debts
+                ],
+            }
+        )
+        working_debts = [d for d in working_debts if d["balance"] > 0]
+
+    return {
+        "total_months": month,
+        "total_interest": round(total_interest, 2),
+        "total_paid": round(total_paid, 2),
+        "payoff_months": {d["id"]: debt_payoff_months.get(d["id"], 0) for d in debts},
+        "monthly_schedule": monthly_schedule[:12],
+    }
+
+
+def test_payoff_plan_matches_monthly_loop():
+    """Test that payoff plans match the original month-by-month loop."""
+    print_section("Testing Payoff Plans Against Monthly Loop")
+
+    # Same rate as another debt (stable order) and a minimum below interest
+    extra_debts = [
+        {"name": "Store Card", "balance": 3200, "rate": 21.0, "minimum": 150},
+        {"name": "Overdraft", "balance": 900.55, "rate": 21.0, "minimum": 60},
+        {"name": "Student Loan", "balance": 48000, "rate": 7.25, "minimum": 250},
+    ]
+    created_ids = []
+
+    try:
+        for debt in extra_debts:
+            response = requests.post(
+                f"{BASE_URL}/debts",
+                json={
+                    "name": debt["name"],
+                    "debt_type": "other",
+                    "original_balance": debt["balance"],
+                    "current_balance": debt["balance"],
+                    "interest_rate": debt["rate"],
+                    "minimum_payment": debt["minimum"],
+                    "due_day": 1,
+                },
+            )
+            assert response.status_code == 201, f"Failed: {response.text}"
+            created_ids.append(response.json()["id"])
+
+        debts = [
+            {
+                "id": d["id"],
+                "name": d["name"],
+                "balance": float(d["current_balance"]),
+                "interest_rate": float(d["interest_rate"]),
+                "minimum_payment": float(d["minimum_payment"]),
+            }
+            for d in requests.get(f"{BASE_URL}/debts").json()
+            if float(d["current_balance"]) > 0
+        ]
+        orders = {
+            "avalanche": sorted(debts, key=lambda d: d["interest_rate"], reverse=True),
+            "snowball": sorted(debts, key=lambda d: d["balance"]),
+        }
+
+        for extra_payment in [0, 750, 5000]:
+            response = requests.post(
+                f"{BASE_URL}/debts/payoff-plan",
+                json={"extra_payment": extra_payment, "strategy": "both"},
+            )
+            assert response.status_code == 200, f"Failed: {response.text}"
+            comparison = response.json()
+
+            for method, ordered in orders.items():
+                plan = comparison[method]
+                expected = _monthly_payoff_loop(ordered, extra_payment)
+
+                for field in ["total_months", "total_interest", "total_paid"]:
+                    assert (
+                        plan[field] == expected[field]
+                    ), f"{method} +{extra_payment}: {field} {plan[field]} != {expected[field]}"
+                assert [d["id"] for d in plan["debts"]] == [d["id"] for d in ordered]
+                assert {d["id"]: d["payoff_month"] for d in plan["debts"]} == expected[
+                    "payoff_months"
+                ], f"{method}: payoff months differ"
+                assert (
+                    plan["monthly_schedule"] == expected["monthly_schedule"]
+                ), f"{method} +{extra_payment}: monthly schedule differs"
+
+                print(
+                    f"{method} +R{extra_payment}: {plan['total_months']} months, "
+                    f"R{plan['total_interest']:.2f} interest (matches)"
+                )
+
+    finally:
+        for debt_id in created_ids:
+            requests.delete(f"{BASE_URL}/debts/{debt_id}")
+
+    print()
+    return True
+
+
 def test_report_endpoints():
     """Test report endpoints."""
     print_section("Testing Report Endpoints")
@@ -152,6 +354,10 @@ def test_report_endpoints():
     print(f"Status: {response.status_code}")
     months = response.json()
     print(f"Available months: {len(months)}")
+    assert all(m["transaction_count"] > 0 for m in months)
+    assert [m["period"] for m in months] == sorted(
+        (m["period"] for m in months), reverse=True
+    )
     if months:
         print(f"Latest: {months[0]['label']}\n")
     else:
@@ -194,6 +400,110 @@ def test_report_endpoints():
     return True
 
 
+def test_batch_reports():
+    """Test batch report generation for a month range."""
+    print_section("Testing Batch Reports")
+
+    year = datetime.now().year
+    print("1. GET /api/reports/batch?year={year}")
+    response = requests.get(f"{BASE_URL}/reports/batch", params={"year": year})
+    print(f"Status: {response.status_code}")
+    assert response.status_code == 200, f"Failed: {response.text}"
+    batch = response.json()
+    assert [r["month"] for r in batch["monthly_reports"]] == list(range(1, 13))
+    assert len(batch["ytd_summaries"]) == 1
+
+    # Same reports as the single-month and YTD endpoints
+    for month in (1, datetime.now().month):
+        single = requests.get(f"{BASE_URL}/reports/monthly/{year}/{month}").json()
+        assert batch["monthly_reports"][month - 1] == single
+    ytd = requests.get(f"{BASE_URL}/reports/summary", params={"year": year}).json()
+    assert batch["ytd_summaries"][0] == ytd
+
+    print("2. GET /api/reports/batch?start=...&end=...&stream=true")
+    response = requests.get(
+        f"{BASE_URL}/reports/batch",
+        params={"start": f"{year - 1}-11", "end": f"{year}-02", "stream": "true"},
+        stream=True,
+    )
+    assert response.status_code == 200
+    chunks = [json.loads(line) for line in response.iter_lines() if line]
+    print(f"Chunks: {[c['type'] for c in chunks]}")
+    assert [(c["type"], c["year"]) for c in chunks] == [
+        ("monthly", year - 1),
+        ("monthly", year - 1),
+        ("ytd", year - 1),
+        ("monthly", year),
+        ("monthly", year),
+        ("ytd", year),
+    ]
+
+    print("3. Invalid ranges")
+    for params in (
+        {"start": f"{year}-03", "end": f"{year}-01"},
+        {"start": "2020-13"},
+        {"year": year, "start": f"{year}-01"},
+        {},
+    ):
+        response = requests.get(f"{BASE_URL}/reports/batch", params=params)
+        assert response.status_code == 400, f"{params}: {response.status_code}"
+
+    print()
+    return True
+
+
+def test_report_tracks_new_transactions():
+    """Test that reports reflect transactions added after they were computed."""
+    print_section("Testing Report Freshness")
+
+    url = f"{BASE_URL}/reports/monthly/2025/10"
+    before = requests.get(url).json()["summary"]
+
+    def october_count():
+        months = requests.get(f"{BASE_URL}/reports/available-months").json()
+        return next(
+            (m["transaction_count"] for m in months if m["period"] == "2025-10"), 0
+        )
+
+    count_before = october_count()
+
+    response = requests.post(
+        f"{BASE_URL}/transactions",
+        json={
+            "date": "2025-10-15",
+            "description": "Report freshness check",
+            "amount": -42.5,
+            "account_id": "acc_main",
+            "category_id": "cat_wants_entertainment",
+            "type": "expense",
+            "source": "manual",
+        },
+    )
+    assert response.status_code == 201, f"Failed: {response.text}"
+    transaction_id = response.json()["id"]
+
+    try:
+        after = requests.get(url).json()["summary"]
+        print(f"Expenses: R{before['expenses']:.2f} -> R{after['expenses']:.2f}")
+        assert after["expense_count"] == before["expense_count"] + 1
+        assert after["transaction_count"] == before["transaction_count"] + 1
+        assert abs(after["expenses"] - before["expenses"] - 42.5) < 0.01
+        assert october_count() == count_before + 1
+
+        ytd = requests.get(f"{BASE_URL}/reports/summary?year=2025").json()
+        october = next(m for m in ytd["monthly_breakdown"] if m["month"] == 10)
+        assert october["expenses"] == after["expenses"]
+    finally:
+        requests.delete(f"{BASE_URL}/transactions/{transaction_id}")
+
+    after_delete = requests.get(url).json()["summary"]
+    assert after_delete == before, "Report did not drop the deleted transaction"
+    assert october_count() == count_before
+
+    print()
+    return True
+
+
 def test_summary_with_debts():
     """Test that summary includes debt information."""
     print_section("Testing Summary with Debt Info")
@@ -226,10 +536,26 @@ def main():
         if test_debt_endpoints():
             print("✅ Debt endpoints: PASSED")
 
+        # Test debt payoff sweep
+        if test_debt_payoff_sweep():
+            print("✅ Debt payoff sweep: PASSED")
+
+        # Test payoff plans against the original monthly loop
+        if test_payoff_plan_matches_monthly_loop():
+            print("✅ Payoff plan equivalence: PASSED")
+
         # Test report endpoints
         if test_report_endpoints():
             print("✅ Report endpoints: PASSED")
 
+        # Test batch reports
+        if test_batch_reports():
+            print("✅ Batch reports: PASSED")
+
+        # Test report freshness
+        if test_report_tracks_new_transactions():
+            print("✅ Report freshness: PASSED")
+
         # Test summary with debts
         if test_summary_with_debts():
             print("✅ Summary with debts: PASSED")
@@ -1,6 +1,6 @@
 """Date utilities."""
 
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from typing import Optional
 
 
@@ -9,6 +9,15 @@ def now_iso() -> str:
     return datetime.now().isoformat() + "Z"
 
 
+def utc_iso(timestamp: Optional[float] = None) -> str:
+    """Get a POSIX timestamp (default: now) as a UTC ISO 8601 string."""
+    if timestamp is None:
+        moment = datetime.now(timezone.utc)
+    else:
+        moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.replace(tzinfo=None).isoformat() + "Z"
+
+
 def parse_date(date_str: str) -> date:
     """Parse date string in YYYY-MM-DD format."""
     return datetime.strptime(date_str, "%Y-%m-%d").date()
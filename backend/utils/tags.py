@@ -0,0 +1,10 @@
+"""Tag utilities."""
+
+from typing import List
+
+
+def split_tags(tags: str) -> List[str]:
+    """Split a semicolon-separated tags string into distinct, stripped tags."""
+    return list(
+        dict.fromkeys(tag.strip() for tag in (tags or "").split(";") if tag.strip())
+    )